@@ -1,38 +1,44 @@
 import requests
+from itertools import islice
+from nasa_download import BulkDownloader
+from nasa_model import parse_response
+from nasa_search import get_search_client
 
 class FetchNasaImages:
     def __init__(self):
-        self.base_url = "https://images-api.nasa.gov/search"
+        # wspólny klient wyszukiwania z cache wyników
+        self.client = get_search_client()
     
-    def fetch_images(self, query):
-        # pobiera dane z API NASA
-        params = {'q': query}
-        response = requests.get(self.base_url, params=params)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f'Nie udało się pobrać danych, kod ststusu: {response.ststus_code}')
+    def fetch_images(self, query, local=False):
+        # z local=True szuka w lokalnym indeksie pobranych wcześniej wyników (bez sieci, z API tylko przy braku trafień)
+        if local:
+            return self.client.search_local(query, remote_fallback=True)
+        # pobiera dane z API NASA (lub z cache, jeśli zapytanie już było)
+        try:
+            return self.client.search(query)
+        except requests.exceptions.HTTPError as e:
+            raise Exception(f'Nie udało się pobrać danych, kod statusu: {e.response.status_code}')
+
+    def iter_images(self, query, max_pages=None):
+        # generator po wszystkich wynikach zapytania, strona po stronie (linki "next")
+        return self.client.iter_items(query, max_pages=max_pages)
+
+    def download_images(self, query, directory, max_pages=None, workers=4, size=None):
+        # pobiera obrazy z wyników zapytania do katalogu (równolegle, ze wznawianiem przerwanych plików)
+        downloader = BulkDownloader(directory, workers=workers, size=size)
+        return downloader.run(self.iter_images(query, max_pages=max_pages))
         
     def display_results(self, data, limit=5):
-        # wyświetla wynik w formacie tekstowym
-        items = data.get("collection", {}).get("items", [])
+        # wyświetla wynik w formacie tekstowym (parsuje tylko pierwsze `limit` elementów)
+        items = list(islice(parse_response(data, lazy=True).items, limit))
 
         if not items:
             print("Brak wyników dla tego zapytania")
             return
         
-        for item in items[:limit]:
-            item_data = item.get("data", [])
-            if item_data:
-                title = item_data[0].get("title", "Brak tytułu")
-                print(f"Tytuł: {title}")
-
-            link = item.get("links", [])
-            if link:
-                href = link[0].get("href", "Brak linku")
-                print(f"Link: {href}")
-
+        for item in items:
+            print(f"Tytuł: {item.title or 'Brak tytułu'}")
+            print(f"Link: {item.href or 'Brak linku'}")
             print("-" * 40)
     
     def run(self):
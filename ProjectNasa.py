@@ -1,47 +1,44 @@
 import requests
 import json
+import sys
+from itertools import islice
+from nasa_model import parse_response
+from nasa_search import get_search_client
 
 def fetch_nasa_images(query):
-    url = "https://images-api.nasa.gov/search"
-
-    params_query = {
-        'q' : query
-    }
-
     # example: https://images-api.nasa.gov/search?q=sun
-    response = requests.get(url, params=params_query)
-    # print(response)
+    # wspólny klient wyszukiwania zwraca powtarzające się zapytania z cache
+    try:
+        return get_search_client().search(query)
+    except requests.exceptions.HTTPError as e:
+        raise Exception(f'Nie udało się pobrać danych, kod statusu: {e.response.status_code}')
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception(f'Nie udało się pobrać danych, kod statusu: {response.status_code}')
+def iter_nasa_images(query, max_pages=None):
+    # zwraca po kolei wszystkie wyniki (wszystkie strony), a nie tylko pierwszą stronę
+    # kolejna strona jest pobierana w tle, więc zużycie pamięci nie rośnie z liczbą wyników
+    return get_search_client().iter_items(query, max_pages=max_pages)
 
 def main():
+    # z argumentami (np. plik z zapytaniami) działa w trybie wsadowym, bez input()
+    if len(sys.argv) > 1:
+        from nasa_batch import main as batch_main
+        sys.exit(batch_main(sys.argv[1:]))
+
     query = input("Podaj zapytanie: ") # To nam wywołuje terminal z treścią zadania do wykonania
     try:
         data = fetch_nasa_images(query)
-        items = data.get("collection", {}).get("items", [])
-        # items = [{}, {}, {}] lub [{}] items[0]
-        if not items:
-            print("Brak wyników dla podanego zapytania")
-            return
-
-        for item in items[:5]:
-            item_data = item.get("data", [])
-
-            if item_data:
-                title = item_data[0].get("title", "Brak tytułu")
-                print(f"Tytuł: {title}")
-
-            link = item.get("links", [])
-
-            if link:
-                href = link[0].get("href", "Brak linku")
-                print(f"Link: {href}")
-
+        # lazy=True - parsowane są tylko wyświetlane elementy, reszta strony jest pomijana
+        page = parse_response(data, lazy=True)
+        shown = 0
+        for item in islice(page.items, 5):
+            shown += 1
+            print(f"Tytuł: {item.title or 'Brak tytułu'}")
+            print(f"Link: {item.href or 'Brak linku'}")
             print("-" * 40)
 
+        if not shown:
+            print("Brak wyników dla podanego zapytania")
+
 
     except Exception as e:
         print(f"Wystąpił błąd: {e}")
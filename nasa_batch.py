@@ -0,0 +1,172 @@
+# Importuje moduł argparse do obsługi argumentów wiersza poleceń.
+import argparse
+# Importuje moduł json do zapisu wyników w formacie JSON Lines.
+import json
+# Importuje moduł math do wyznaczania rangi percentyla.
+import math
+# Importuje moduł sys do obsługi stdin, stdout i stderr.
+import sys
+# Importuje moduł threading do blokady chroniącej zapis wyników z wielu wątków i semafora ograniczającego kolejkę zapytań.
+import threading
+# Importuje moduł time do pomiaru czasu zapytań.
+import time
+# Importuje pulę wątków do równoległego wykonywania zapytań.
+from concurrent.futures import ThreadPoolExecutor
+# Importuje model elementu wyników (odczyt pól bez przechodzenia po drzewie JSON).
+from nasa_model import NasaItem
+# Importuje funkcję zwracającą wspólnego klienta wyszukiwania.
+from nasa_search import get_search_client
+
+
+# Zamienia element wyników API na słownik z polami zapisywanymi do pliku.
+def item_record(item, query):
+    # Parsuje element (pierwsze dane i pierwszy link).
+    parsed = NasaItem.from_api(item)
+    # Zwraca rekord wynikowy.
+    return {
+        "nasa_id": parsed.nasa_id,
+        "title": parsed.title,
+        "href": parsed.href,
+        "query": query,
+    }
+
+
+# Zwraca percentyl (metodą najbliższej rangi) z posortowanej listy wartości.
+def percentile(sorted_values, fraction):
+    # Zwraca None dla pustej listy.
+    if not sorted_values:
+        return None
+    # Wyznacza indeks najbliższej rangi: najmniejsza wartość, od której nie więcej niż fraction wartości jest mniejszych.
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+# Wczytuje zapytania z pliku (lub stdin), pomijając puste linie i komentarze.
+def read_queries(stream):
+    for line in stream:
+        query = line.strip()
+        if query and not query.startswith("#"):
+            yield query
+
+
+# Definiuje klasę BatchSearch, która wykonuje wiele zapytań równolegle i strumieniuje wyniki.
+class BatchSearch:
+    # Inicjalizuje wyszukiwanie wsadowe ze strumieniem wyjściowym, liczbą wątków i limitem stron.
+    def __init__(self, output, workers = 8, max_pages = 1, media_type = "image", client = None):
+        # Przypisuje strumień, do którego zapisywane są linie JSON.
+        self.output = output
+        # Przypisuje maksymalną liczbę równoległych zapytań.
+        self.workers = workers
+        # Przypisuje maksymalną liczbę stron wyników na zapytanie (None - wszystkie).
+        self.max_pages = max_pages
+        # Przypisuje typ mediów przekazywany do API.
+        self.media_type = media_type
+        # Przypisuje klienta wyszukiwania (domyślnie współdzielony).
+        self.client = client if client is not None else get_search_client()
+        # Tworzy blokadę, aby linie z różnych wątków się nie przeplatały.
+        self.lock = threading.Lock()
+
+    # Wykonuje jedno zapytanie, zapisuje jego wyniki i zwraca (liczba wyników, czas w sekundach).
+    def run_query(self, query):
+        # Zapamiętuje czas rozpoczęcia.
+        start = time.perf_counter()
+        count = 0
+        # Iteruje po wynikach i zapisuje każdy od razu po otrzymaniu.
+        for item in self.client.iter_items(query, max_pages = self.max_pages, media_type = self.media_type):
+            line = json.dumps(item_record(item, query), ensure_ascii = False)
+            with self.lock:
+                self.output.write(line + "\n")
+                self.output.flush()
+            count += 1
+        # Zwraca liczbę wyników i czas zapytania.
+        return count, time.perf_counter() - start
+
+    # Wykonuje wszystkie zapytania i zwraca słownik z podsumowaniem.
+    # Zapytania są odczytywane leniwie: kolejne trafiają do puli, gdy zwalnia się miejsce w kolejce (jak w BulkDownloader.run).
+    def run(self, queries):
+        # Zapamiętuje czas rozpoczęcia całego wsadu.
+        start = time.perf_counter()
+        self.latencies = []
+        self.counts = {"queries": 0, "errors": 0, "items": 0}
+        # Ogranicza liczbę zleconych zapytań, aby nie trzymać w pamięci całego wejścia.
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        # Uruchamia zapytania w ograniczonej puli wątków.
+        with ThreadPoolExecutor(max_workers = self.workers, thread_name_prefix = "nasa-batch") as executor:
+            for query in queries:
+                slots.acquire()
+                future = executor.submit(self.run_query, query)
+                future.add_done_callback(lambda f, query = query: self._on_query_done(f, query, slots))
+        # Oblicza czas całego wsadu i sortuje czasy zapytań.
+        elapsed = time.perf_counter() - start
+        latencies = sorted(self.latencies)
+        queries, errors, items = self.counts["queries"], self.counts["errors"], self.counts["items"]
+        # Zwraca podsumowanie z przepustowością i percentylami czasu zapytań.
+        return {
+            "queries": queries,
+            "errors": errors,
+            "items": items,
+            "elapsed_s": round(elapsed, 3),
+            "queries_per_s": round(queries / elapsed, 2) if elapsed else None,
+            "items_per_s": round(items / elapsed, 2) if elapsed else None,
+            "latency_s": {
+                name: round(value, 3) if value is not None else None
+                for name, value in (
+                    ("p50", percentile(latencies, 0.50)),
+                    ("p90", percentile(latencies, 0.90)),
+                    ("p99", percentile(latencies, 0.99)),
+                    ("max", latencies[-1] if latencies else None),
+                )
+            },
+        }
+
+    # Zwalnia miejsce w kolejce i zapisuje wynik zakończonego zapytania (wywoływane w wątku roboczym).
+    def _on_query_done(self, future, query, slots):
+        slots.release()
+        try:
+            count, latency = future.result()
+        except Exception as e:
+            # Błąd jednego zapytania nie przerywa całego wsadu.
+            with self.lock:
+                self.counts["queries"] += 1
+                self.counts["errors"] += 1
+            print(f"Błąd zapytania '{query}': {e}", file = sys.stderr)
+            return
+        with self.lock:
+            self.counts["queries"] += 1
+            self.counts["items"] += count
+            self.latencies.append(latency)
+
+
+# Definiuje główną funkcję trybu wsadowego.
+def main(argv = None):
+    # Tworzy parser argumentów wiersza poleceń.
+    parser = argparse.ArgumentParser(description = "Wsadowe wyszukiwanie w API NASA Images (wynik w formacie JSON Lines).")
+    parser.add_argument("queries", nargs = "?", default = "-", help = "plik z zapytaniami, jedno w linii ('-' oznacza stdin)")
+    parser.add_argument("-o", "--output", default = "-", help = "plik wynikowy JSONL ('-' oznacza stdout)")
+    parser.add_argument("-w", "--workers", type = int, default = 8, help = "liczba równoległych zapytań")
+    parser.add_argument("-p", "--max-pages", type = int, default = 1, help = "maksymalna liczba stron na zapytanie (0 - wszystkie)")
+    parser.add_argument("--media-type", default = "image", help = "typ mediów przekazywany do API")
+    args = parser.parse_args(argv)
+
+    # Otwiera źródło zapytań i strumień wynikowy.
+    source = sys.stdin if args.queries == "-" else open(args.queries, encoding = "utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding = "utf-8")
+    try:
+        # Wykonuje wyszukiwanie wsadowe.
+        batch = BatchSearch(output, args.workers, args.max_pages or None, args.media_type)
+        summary = batch.run(read_queries(source))
+    finally:
+        # Zamyka pliki otwarte przez program (bez stdin i stdout).
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    # Wypisuje podsumowanie na stderr, aby nie mieszało się z wynikami JSONL.
+    print(json.dumps(summary, ensure_ascii = False), file = sys.stderr)
+    # Zwraca kod wyjścia różny od zera, jeśli wystąpiły błędy.
+    return 1 if summary["errors"] else 0
+
+
+# Sprawdza, czy skrypt jest uruchamiany bezpośrednio.
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+# Importuje moduł argparse do obsługi argumentów wiersza poleceń.
+import argparse
+# Importuje moduł json do zapisu wyników i odczytu wyników bazowych.
+import json
+# Importuje moduł os do ustawienia zmiennych środowiskowych przed importem modułów aplikacji.
+import os
+# Importuje moduł subprocess do pomiaru uruchamiania aplikacji w nowym interpreterze.
+import subprocess
+# Importuje moduł sys do zwracania kodu wyjścia.
+import sys
+# Importuje moduł tempfile do tworzenia tymczasowego katalogu cache.
+import tempfile
+# Importuje moduł time do pomiaru czasu.
+import time
+# Importuje tracemalloc do pomiaru szczytowego zużycia pamięci przez obiekty Pythona.
+import tracemalloc
+# Importuje lokalny zamiennik API NASA.
+from nasa_fake_server import FakeNasaConfig, FakeNasaServer
+
+# Importuje moduł resource (tylko Linux/Unix) do odczytu maksymalnego RSS procesu.
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# Zwraca maksymalny RSS procesu w MB (lub None, jeśli niedostępny).
+def max_rss_mb():
+    if resource is None:
+        return None
+    # Na Linuksie ru_maxrss jest podawany w kilobajtach.
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+# Mierzy czas i pamięć funkcji wykonującej `operations` operacji i zwraca słownik z wynikiem.
+def measure(name, func, operations):
+    # Uruchamia śledzenie alokacji.
+    tracemalloc.start()
+    start = time.perf_counter()
+    # Wykonuje badaną funkcję; może zwrócić listę czasów pojedynczych operacji.
+    samples = func()
+    elapsed = time.perf_counter() - start
+    # Odczytuje szczytowe zużycie pamięci i kończy śledzenie.
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        "name": name,
+        "operations": operations,
+        "total_s": round(elapsed, 4),
+        "ops_per_s": round(operations / elapsed, 2) if elapsed else None,
+        "peak_py_mb": round(peak / (1024 * 1024), 2),
+        "max_rss_mb": max_rss_mb(),
+    }
+    # Dodaje percentyle, jeśli funkcja zwróciła czasy pojedynczych operacji.
+    if samples:
+        samples = sorted(samples)
+        result["p50_ms"] = round(samples[len(samples) // 2] * 1000, 2)
+        result["max_ms"] = round(samples[-1] * 1000, 2)
+    return result
+
+
+# Wykonuje funkcję dla każdego argumentu i zwraca listę czasów wywołań.
+def timed_calls(func, arguments):
+    samples = []
+    for argument in arguments:
+        start = time.perf_counter()
+        func(argument)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+# Uruchamia kod w nowym interpreterze Pythona (pomiar zimnego startu bez modułów zaimportowanych przez benchmark).
+def run_python(code):
+    subprocess.run([sys.executable, "-c", code], check = True, cwd = os.path.dirname(os.path.abspath(__file__)))
+
+
+# Uruchamia wszystkie benchmarki na działającym serwerze i zwraca listę wyników.
+def run_benchmarks(server_url, searches, images, workers, startup_runs = 5):
+    # Ustawia adres API i tymczasowy cache przed importem modułów aplikacji (czytają je przy imporcie).
+    os.environ["NASA_API_URL"] = server_url
+    os.environ["NASA_CACHE_DIR"] = tempfile.mkdtemp(prefix = "nasa-bench-")
+
+    results = []
+    # Czas uruchamiania aplikacji Tk (bez wyświetlania okna): import modułu poprzedzający pokazanie okna
+    # oraz import i doładowanie modułów PIL/requests/NumPy, po którym wyszukiwanie jest gotowe.
+    results.append(measure("startup_window", lambda: timed_calls(
+        run_python, ["import tkinker_zadanie"] * startup_runs), startup_runs))
+    results.append(measure("startup_ready", lambda: timed_calls(
+        run_python, ["import tkinker_zadanie; tkinker_zadanie.load_modules()"] * startup_runs), startup_runs))
+
+    from nasa_search import NasaSearchClient, SearchCache
+    from nasa_loader import ImageLoader, load_scaled_image
+    from ProjectNasa import fetch_nasa_images
+    from Obiekt_Projekt_Nasa import FetchNasaImages
+
+    # Klient bez cache mierzy czysty czas zapytania do API.
+    uncached = NasaSearchClient(server_url + "/search", cache = SearchCache(directory = None))
+    queries = [f"bench query {index}" for index in range(searches)]
+
+    # Czas wyszukiwania bez cache.
+    results.append(measure("search_uncached", lambda: timed_calls(
+        lambda query: uncached.fetch({"q": query, "media_type": "image"}), queries), searches))
+    # Czas wyszukiwania przez ProjectNasa.fetch_nasa_images (pierwsze zapytania - bez trafień w cache).
+    results.append(measure("search_project_nasa", lambda: timed_calls(
+        fetch_nasa_images, [f"pn {query}" for query in queries]), searches))
+    # Czas wyszukiwania przez FetchNasaImages.fetch_images.
+    fetcher = FetchNasaImages()
+    results.append(measure("search_obiekt", lambda: timed_calls(
+        fetcher.fetch_images, [f"obj {query}" for query in queries]), searches))
+    # Czas powtórzonego wyszukiwania (trafienia w cache).
+    results.append(measure("search_cached", lambda: timed_calls(
+        fetcher.fetch_images, [f"obj {queries[0]}"] * searches), searches))
+
+    # Adresy miniatur i oryginałów z pierwszej strony wyników.
+    items = uncached.fetch({"q": "bench images", "media_type": "image"})["collection"]["items"][:images]
+    thumb_urls = [item["links"][0]["href"] for item in items]
+    orig_urls = [url.replace("~thumb.jpg", "~orig.jpg") for url in thumb_urls]
+
+    # Przepustowość miniatur ładowanych po kolei (jak przed wprowadzeniem puli wątków).
+    results.append(measure("thumbnails_sequential", lambda: timed_calls(
+        lambda url: load_scaled_image(url, (200, 200)), thumb_urls), len(thumb_urls)))
+    # Przepustowość miniatur ładowanych równolegle przez ImageLoader (bez Tk - tylko pula wątków).
+    loader = ImageLoader(None, max_workers = workers)
+
+    # Ładuje wszystkie miniatury przez pulę loadera i czeka na ostatnią.
+    def load_in_pool():
+        list(loader.executor.map(lambda url: loader.fetch_and_decode(url, (200, 200)), thumb_urls))
+
+    results.append(measure("thumbnails_pool", load_in_pool, len(thumb_urls)))
+    loader.shutdown()
+    # Czas otwarcia pełnego obrazu (pobranie i skalowanie do 1000x800, jak w _open_image_window).
+    results.append(measure("preview_open", lambda: timed_calls(
+        lambda url: load_scaled_image(url, (1000, 800)), orig_urls), len(orig_urls)))
+    return results
+
+
+# Porównuje wyniki z bazowymi i zwraca listę opisów regresji.
+def find_regressions(results, baseline, tolerance):
+    previous = {entry["name"]: entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        before = previous.get(entry["name"])
+        # Porównuje łączny czas; regresja to wzrost o więcej niż tolerancja.
+        if before and before["total_s"] and entry["total_s"] > before["total_s"] * (1 + tolerance):
+            regressions.append(f"{entry['name']}: {before['total_s']}s -> {entry['total_s']}s")
+    return regressions
+
+
+# Definiuje główną funkcję benchmarku.
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark ścieżek pobierania na lokalnym zamienniku API NASA.")
+    parser.add_argument("--latency", type = float, default = 0.05, help = "opóźnienie serwera w sekundach")
+    parser.add_argument("--bandwidth", type = float, default = None, help = "przepustowość serwera w bajtach na sekundę")
+    parser.add_argument("--error-rate", type = float, default = 0.0, help = "odsetek odpowiedzi 503 (0-1)")
+    parser.add_argument("--searches", type = int, default = 20, help = "liczba wyszukiwań na benchmark")
+    parser.add_argument("--images", type = int, default = 9, help = "liczba obrazów na benchmark")
+    parser.add_argument("--workers", type = int, default = 4, help = "liczba wątków loadera miniatur")
+    parser.add_argument("--startup-runs", type = int, default = 5, help = "liczba pomiarów uruchamiania aplikacji")
+    parser.add_argument("--json", default = None, help = "plik, do którego zostaną zapisane wyniki")
+    parser.add_argument("--baseline", default = None, help = "plik z wynikami bazowymi do wykrywania regresji")
+    parser.add_argument("--tolerance", type = float, default = 0.25, help = "dopuszczalny wzrost czasu względem bazowego")
+    args = parser.parse_args(argv)
+
+    # Uruchamia lokalny serwer z zadanymi parametrami sieci.
+    config = FakeNasaConfig(latency = args.latency, bandwidth = args.bandwidth, error_rate = args.error_rate)
+    server = FakeNasaServer(config = config).start()
+    try:
+        results = run_benchmarks(server.url, args.searches, args.images, args.workers, args.startup_runs)
+    finally:
+        server.stop()
+
+    # Wypisuje wyniki w formie tabeli.
+    for entry in results:
+        print(f"{entry['name']:<24} {entry['total_s']:>8.3f}s {entry['ops_per_s'] or 0:>9.2f} op/s "
+              f"p50 {entry.get('p50_ms', '-'):>8} ms  peak {entry['peak_py_mb']:>7.2f} MB  rss {entry['max_rss_mb']} MB")
+    # Zapisuje wyniki do pliku JSON.
+    if args.json:
+        with open(args.json, "w", encoding = "utf-8") as file:
+            json.dump(results, file, indent = 2)
+    # Porównuje z wynikami bazowymi i zwraca kod błędu przy regresji.
+    if args.baseline:
+        with open(args.baseline, encoding = "utf-8") as file:
+            regressions = find_regressions(results, json.load(file), args.tolerance)
+        for line in regressions:
+            print(f"REGRESJA {line}", file = sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+# Sprawdza, czy skrypt jest uruchamiany bezpośrednio.
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# Importuje hashlib do wyznaczania kluczy plików na podstawie adresu URL.
+import hashlib
+# Importuje moduł os do operacji na plikach i katalogach cache.
+import os
+# Importuje moduł tempfile do bezpiecznego (atomowego) zapisu plików.
+import tempfile
+# Importuje moduł threading, aby chronić indeks cache przed równoczesnym dostępem.
+import threading
+# Importuje OrderedDict, który przechowuje kolejność użycia wpisów (LRU).
+from collections import OrderedDict
+# Importuje BytesIO do kodowania obrazów w pamięci.
+from io import BytesIO
+
+# Domyślny katalog cache, który można nadpisać zmienną środowiskową NASA_CACHE_DIR.
+DEFAULT_CACHE_DIR = os.environ.get(
+    "NASA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "nasa_images")
+)
+
+
+# Koduje obraz PIL do bajtów (JPEG dla obrazów RGB/L, PNG dla pozostałych trybów).
+def encode_image(image):
+    # Tworzy bufor w pamięci.
+    buffer = BytesIO()
+    # Konwertuje tryby nieobsługiwane przez PNG (np. CMYK) do RGB.
+    if image.mode not in ("RGB", "L", "RGBA", "LA", "P"):
+        image = image.convert("RGB")
+    # Wybiera JPEG dla trybów, które go obsługują, w przeciwnym razie bezstratny PNG.
+    if image.mode in ("RGB", "L"):
+        image.save(buffer, format = "JPEG", quality = 90)
+    else:
+        image.save(buffer, format = "PNG")
+    # Zwraca zakodowane bajty.
+    return buffer.getvalue()
+
+
+# Definiuje klasę ImageDiskCache - trwały cache obrazów na dysku z limitem rozmiaru i usuwaniem LRU.
+class ImageDiskCache:
+    # Inicjalizuje cache w podanym katalogu z budżetem max_bytes.
+    def __init__(self, directory, max_bytes = 200 * 1024 * 1024):
+        # Przypisuje katalog cache.
+        self.directory = directory
+        # Przypisuje maksymalny łączny rozmiar plików w bajtach.
+        self.max_bytes = max_bytes
+        # Tworzy blokadę chroniącą indeks przed równoczesnym dostępem z wielu wątków.
+        self.lock = threading.Lock()
+        # Indeks: klucz -> rozmiar pliku, w kolejności od najdawniej do najświeżej użytego.
+        self.index = OrderedDict()
+        # Łączny rozmiar plików w cache.
+        self.total_bytes = 0
+        # Tworzy katalog, jeśli jeszcze nie istnieje.
+        os.makedirs(self.directory, exist_ok = True)
+        # Odtwarza indeks z plików zapisanych w poprzednich sesjach.
+        self._load_index()
+
+    # Wyznacza klucz (adres treści) na podstawie URL.
+    @staticmethod
+    def key_for(url):
+        # Zwraca skrót SHA-256 adresu URL.
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    # Zwraca ścieżkę pliku dla danego klucza.
+    def _path(self, key):
+        # Łączy katalog cache z kluczem.
+        return os.path.join(self.directory, key)
+
+    # Odczytuje istniejące pliki i układa je w kolejności ostatniego użycia (czas modyfikacji).
+    def _load_index(self):
+        # Zbiera wpisy (czas modyfikacji, klucz, rozmiar) dla wszystkich plików w katalogu.
+        entries = []
+        for entry in os.scandir(self.directory):
+            # Pomija pliki tymczasowe i inne niż zwykłe pliki.
+            if not entry.is_file() or entry.name.startswith("."):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, entry.name, stat.st_size))
+        # Sortuje od najdawniej użytego i buduje indeks.
+        for _, key, size in sorted(entries):
+            self.index[key] = size
+            self.total_bytes += size
+        # Usuwa nadmiarowe pliki, jeśli budżet został zmniejszony.
+        with self.lock:
+            self._evict()
+
+    # Zwraca bajty zapisane dla URL lub None, jeśli brak wpisu.
+    def get(self, url):
+        # Wyznacza klucz dla URL.
+        key = self.key_for(url)
+        with self.lock:
+            # Sprawdza, czy wpis istnieje w indeksie.
+            if key not in self.index:
+                return None
+            # Oznacza wpis jako ostatnio użyty.
+            self.index.move_to_end(key)
+        # Odczytuje plik poza blokadą.
+        try:
+            with open(self._path(key), "rb") as file:
+                data = file.read()
+            # Aktualizuje czas modyfikacji, aby kolejność LRU przetrwała restart.
+            os.utime(self._path(key))
+            return data
+        except OSError:
+            # Usuwa wpis z indeksu, jeśli plik zniknął (np. usunięty przez inny proces).
+            with self.lock:
+                size = self.index.pop(key, None)
+                if size is not None:
+                    self.total_bytes -= size
+            return None
+
+    # Zapisuje bajty dla URL i usuwa najdawniej używane wpisy ponad budżet.
+    def put(self, url, data):
+        # Wyznacza klucz dla URL.
+        key = self.key_for(url)
+        # Zapisuje dane do pliku tymczasowego w tym samym katalogu.
+        fd, tmp_path = tempfile.mkstemp(dir = self.directory, prefix = ".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            # Atomowo podmienia plik docelowy (czytelnicy widzą stary albo nowy plik, nigdy częściowy).
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # Sprząta plik tymczasowy po nieudanym zapisie.
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self.lock:
+            # Odejmuje rozmiar poprzedniej wersji wpisu, jeśli istniała.
+            self.total_bytes -= self.index.pop(key, 0)
+            # Dodaje wpis na koniec kolejki LRU.
+            self.index[key] = len(data)
+            self.total_bytes += len(data)
+            # Usuwa nadmiarowe wpisy.
+            self._evict()
+
+    # Usuwa najdawniej używane wpisy, dopóki rozmiar przekracza budżet (wywoływane pod blokadą).
+    def _evict(self):
+        # Usuwa wpisy od najstarszego, pozostawiając co najmniej jeden.
+        while self.total_bytes > self.max_bytes and len(self.index) > 1:
+            key, size = self.index.popitem(last = False)
+            self.total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                # Ignoruje pliki usunięte już przez inny proces.
+                pass
+
+    # Usuwa wszystkie wpisy z cache.
+    def clear(self):
+        with self.lock:
+            # Usuwa kolejno wszystkie pliki z indeksu.
+            for key in list(self.index):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            # Czyści indeks i licznik rozmiaru.
+            self.index.clear()
+            self.total_bytes = 0
+
+
+# Przechowuje współdzielone instancje cache dla każdej wersji obrazu.
+_caches = {}
+# Blokada chroniąca tworzenie współdzielonych instancji.
+_caches_lock = threading.Lock()
+
+
+# Zwraca współdzieloną instancję cache dla danej wersji obrazu ("thumbs" lub "previews").
+def get_image_cache(rendition, max_bytes = 200 * 1024 * 1024, root = DEFAULT_CACHE_DIR):
+    with _caches_lock:
+        # Tworzy cache przy pierwszym użyciu danej wersji.
+        if rendition not in _caches:
+            _caches[rendition] = ImageDiskCache(os.path.join(root, rendition), max_bytes)
+        # Zwraca istniejącą instancję.
+        return _caches[rendition]
@@ -0,0 +1,197 @@
+# Importuje moduł os do budowy ścieżki bazy skrótów.
+import os
+# Importuje moduł sqlite3 do trwałego zapisu skrótów percepcyjnych.
+import sqlite3
+# Importuje moduł threading do blokad cache skrótów.
+import threading
+# Importuje NumPy do obliczania skrótów i odległości Hamminga dla całych partii naraz.
+import numpy as np
+# Importuje Image z PIL do zmniejszania miniatur przed obliczeniem skrótu.
+from PIL import Image
+# Importuje domyślny katalog cache.
+from nasa_cache import DEFAULT_CACHE_DIR
+# Importuje funkcję zwracającą współdzielony licznik czasu etapów.
+from nasa_timing import get_stage_timer
+
+# Bok siatki skrótu (skrót ma HASH_SIZE * HASH_SIZE bitów, czyli 8 bajtów).
+HASH_SIZE = 8
+# Maksymalna odległość Hamminga (w bitach), przy której dwa obrazy uznawane są za to samo zdjęcie.
+DUPLICATE_DISTANCE = 8
+
+
+# Oblicza skróty różnicowe (dHash) listy obrazów: jeden wiersz 8 bajtów (spakowane bity) na obraz.
+def dhash(images):
+    # Zmniejsza obrazy do (HASH_SIZE + 1) x HASH_SIZE w skali szarości i układa je w jedną tablicę (n, 8, 9).
+    pixels = np.stack([
+        np.asarray(image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR), dtype = np.int16)
+        for image in images
+    ])
+    # Porównuje sąsiednie piksele w wierszach i pakuje 64 bity każdego obrazu do 8 bajtów.
+    bits = (pixels[:, :, 1:] > pixels[:, :, :-1]).reshape(len(images), -1)
+    return np.packbits(bits, axis = 1)
+
+
+# Zwraca macierz odległości Hamminga (n, m) między skrótami a (n, 8) i b (m, 8).
+def hamming(a, b):
+    return np.bitwise_count(a[:, None, :] ^ b[None, :, :]).sum(axis = 2, dtype = np.int32)
+
+
+# Definiuje klasę HashCache - cache skrótów percepcyjnych (pamięć i SQLite) według adresu miniatury.
+class HashCache:
+    # Inicjalizuje cache w pliku bazy SQLite (":memory:" - tylko w pamięci).
+    def __init__(self, path = os.path.join(DEFAULT_CACHE_DIR, "hashes.sqlite3")):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok = True)
+        # Skróty w pamięci: adres -> 8 bajtów.
+        self.memory = {}
+        self.connection = sqlite3.connect(path, check_same_thread = False)
+        self.lock = threading.Lock()
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS hashes (url TEXT PRIMARY KEY, hash BLOB NOT NULL)")
+
+    # Zwraca słownik adres -> skrót dla adresów obecnych w cache.
+    def get_many(self, urls):
+        with self.lock:
+            found = {url: self.memory[url] for url in urls if url in self.memory}
+            missing = [url for url in urls if url not in found]
+            # Odczytuje brakujące skróty z bazy partiami (limit parametrów zapytania SQLite).
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                rows = self.connection.execute(
+                    f"SELECT url, hash FROM hashes WHERE url IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for url, value in rows:
+                    found[url] = self.memory[url] = bytes(value)
+        return found
+
+    # Zapisuje skróty (słownik adres -> skrót) w pamięci i w bazie.
+    def put_many(self, hashes):
+        if not hashes:
+            return
+        with self.lock, self.connection:
+            self.memory.update(hashes)
+            self.connection.executemany("INSERT OR REPLACE INTO hashes (url, hash) VALUES (?, ?)", hashes.items())
+
+
+# Przechowuje jedyną instancję cache skrótów (Singleton).
+_hash_cache = None
+# Blokada chroniąca tworzenie instancji.
+_hash_cache_lock = threading.Lock()
+
+
+# Zwraca współdzieloną instancję HashCache.
+def get_hash_cache():
+    global _hash_cache
+    with _hash_cache_lock:
+        if _hash_cache is None:
+            _hash_cache = HashCache()
+        return _hash_cache
+
+
+# Definiuje klasę DuplicateFilter - filtr powtórzonych zdjęć w wynikach jednego wyszukiwania.
+# Odrzuca elementy o powtórzonym nasa_id lub adresie oraz zdjęcia, których skrót percepcyjny różni się od skrótu już przyjętego
+# elementu o najwyżej max_distance bitów. Filtr nie pobiera miniatur: przy dołączaniu strony porównuje tylko skróty znane z cache,
+# a skróty pozostałych elementów dostaje (add) po wczytaniu ich miniatur przez siatkę. Stan obejmuje wszystkie strony wyszukiwania
+# i jest chroniony blokadą (strony są filtrowane w tle, a skróty miniatur dodawane w wątku Tkinter).
+class DuplicateFilter:
+    # Inicjalizuje filtr z cache skrótów i progiem odległości.
+    def __init__(self, hash_cache = None, max_distance = DUPLICATE_DISTANCE):
+        self.hash_cache = hash_cache if hash_cache is not None else get_hash_cache()
+        self.max_distance = max_distance
+        self.lock = threading.Lock()
+        # Identyfikatory i adresy już przetworzonych elementów.
+        self.seen_ids = set()
+        self.seen_hrefs = set()
+        # Adresy przyjętych elementów, których skrót nie jest jeszcze znany.
+        self.unhashed = set()
+        # Pozycje przyjętych elementów w wynikach wyszukiwania: adres -> numer (mniejszy - wyżej w wynikach).
+        self.ranks = {}
+        # Skróty przyjętych elementów jako macierz (m, 8) i elementy odpowiadające jej wierszom.
+        self.accepted = np.empty((0, HASH_SIZE * HASH_SIZE // 8), dtype = np.uint8)
+        self.accepted_items = []
+        # Liczba odrzuconych elementów (powtórzone identyfikatory i zdjęcia).
+        self.removed = 0
+        # Przypisuje współdzielony licznik czasu etapów.
+        self.timer = get_stage_timer()
+
+    # Oblicza skrót miniatury i zapisuje go w cache pod adresem elementu (wywoływane w wątku roboczym, razem z wczytaniem miniatury).
+    def hash_image(self, href, image):
+        with self.timer.stage("dedup.hash"):
+            value = dhash([image])[0].tobytes()
+        self.hash_cache.put_many({href: value})
+        return value
+
+    # Filtruje nowe elementy NasaItem bez pobierania miniatur i zwraca przyjęte elementy.
+    # Elementy o nieznanym skrócie są przyjmowane warunkowo - zostaną sprawdzone w add po wczytaniu miniatury.
+    def filter(self, items):
+        batch = []
+        with self.lock:
+            for item in items:
+                # Elementy bez identyfikatora lub adresu nie są porównywane po tym polu.
+                if (item.nasa_id is not None and item.nasa_id in self.seen_ids) or (item.href and item.href in self.seen_hrefs):
+                    self.removed += 1
+                    continue
+                self.seen_ids.add(item.nasa_id)
+                self.seen_hrefs.add(item.href)
+                self.ranks[item.href] = len(self.ranks)
+                batch.append(item)
+        # Odczytuje skróty znane z poprzednich wyszukiwań (pamięć i SQLite, bez sieci) poza blokadą filtra.
+        cached = self.hash_cache.get_many([item.href for item in batch if item.href])
+        hashes = [cached.get(item.href) for item in batch]
+        with self.lock:
+            self.unhashed.update(item.href for item, value in zip(batch, hashes) if value is None and item.href)
+            duplicates = self._similar(batch, hashes)
+            self.removed += len(duplicates)
+            return [item for index, item in enumerate(batch) if index not in duplicates]
+
+    # Dodaje skrót wczytanej miniatury przyjętego warunkowo elementu i zwraca listę elementów do usunięcia z wyników.
+    # Z każdej pary powtórzeń zostaje element wyżej w wynikach, niezależnie od kolejności wczytania miniatur: element jest
+    # usuwany, jeśli powtarza zdjęcie wyżej w wynikach, a w przeciwnym razie usuwane są przyjęte niżej jego powtórzenia.
+    def add(self, item, value):
+        with self.lock:
+            # Pomija elementy sprawdzone już przy filtrowaniu strony (lub wcześniej wczytane).
+            if item.href not in self.unhashed:
+                return []
+            self.unhashed.discard(item.href)
+            row = np.frombuffer(value, dtype = np.uint8).reshape(1, -1)
+            with self.timer.stage("dedup.compare"):
+                close = np.flatnonzero(hamming(row, self.accepted)[0] <= self.max_distance)
+            matches = [self.accepted_items[index] for index in close]
+            rank = self.ranks[item.href]
+            # Odrzuca element, który powtarza zdjęcie wyżej w wynikach.
+            if any(self.ranks[match.href] < rank for match in matches):
+                self.removed += 1
+                return [item]
+            # Przyjmuje element w miejsce jego powtórzeń niżej w wynikach.
+            keep = np.ones(len(self.accepted_items), dtype = bool)
+            keep[close] = False
+            self.accepted = np.concatenate([self.accepted[keep], row])
+            self.accepted_items = [accepted for accepted, kept in zip(self.accepted_items, keep) if kept] + [item]
+            self.removed += len(matches)
+            return matches
+
+    # Porównuje skróty elementów (None - nieznany) z przyjętymi i ze sobą nawzajem (elementy są w kolejności wyników,
+    # niżej niż wszystkie przyjęte); przyjmuje różne i zwraca zbiór indeksów powtórzeń.
+    def _similar(self, items, hashes):
+        known = [index for index, value in enumerate(hashes) if value is not None]
+        if not known:
+            return set()
+        with self.timer.stage("dedup.compare"):
+            rows = np.frombuffer(b"".join(hashes[index] for index in known), dtype = np.uint8).reshape(len(known), -1)
+            # Odległości każdego skrótu do przyjętych skrótów i do wszystkich nowych skrótów (jedna macierz).
+            distances = hamming(rows, np.concatenate([self.accepted, rows]))
+            close = distances <= self.max_distance
+            previous = len(self.accepted)
+            # Kolumny skrótów przyjętych dotąd (na początku - wszystkie przyjęte wcześniej).
+            keep = np.zeros(previous + len(known), dtype = bool)
+            keep[:previous] = True
+            duplicates = set()
+            for row, index in enumerate(known):
+                if close[row, keep].any():
+                    duplicates.add(index)
+                else:
+                    keep[previous + row] = True
+            self.accepted = np.concatenate([self.accepted, rows[keep[previous:]]])
+            self.accepted_items.extend(items[index] for row, index in enumerate(known) if keep[previous + row])
+        return duplicates
@@ -0,0 +1,245 @@
+# Importuje moduł argparse do obsługi argumentów wiersza poleceń.
+import argparse
+# Importuje moduł json do wypisania podsumowania.
+import json
+# Importuje moduł os do operacji na plikach docelowych i częściowych.
+import os
+# Importuje moduł re do parsowania nagłówka Content-Range.
+import re
+# Importuje moduł sys do wypisywania błędów na stderr.
+import sys
+# Importuje moduł threading do blokady statystyk i semafora ograniczającego kolejkę zadań.
+import threading
+# Importuje moduł time do pomiaru czasu pobierania.
+import time
+# Importuje pulę wątków do równoległych transferów.
+from concurrent.futures import ThreadPoolExecutor
+# Importuje funkcje do odczytu nazwy pliku z adresu URL.
+from urllib.parse import unquote, urlsplit
+# Importuje bibliotekę requests, aby rozpoznawać zerwane połączenia.
+import requests
+# Importuje wyjątek anulowania i funkcję zwracającą współdzielonego klienta HTTP.
+from nasa_http import RequestCancelled, get_http_client
+# Importuje model elementu wyników.
+from nasa_model import NasaItem
+# Importuje listę wersji obrazów, wybór adresu zapasowego i współdzielony resolver wersji.
+from nasa_renditions import RENDITIONS, derive_rendition_url, get_rendition_resolver
+# Importuje funkcję zwracającą współdzielony licznik czasu etapów.
+from nasa_timing import get_stage_timer
+
+# Rozszerzenie plików pobieranych częściowo (usuwane po weryfikacji rozmiaru).
+PART_SUFFIX = ".part"
+
+
+# Definiuje wyjątek zgłaszany, gdy pobrany plik ma inny rozmiar niż zapowiedział serwer.
+class IncompleteDownload(Exception):
+    pass
+
+
+# Odczytuje z nagłówka Content-Range początek zakresu i rozmiar całego pliku (None, jeśli nieznany).
+def parse_content_range(value):
+    match = re.fullmatch(r"bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)", (value or "").strip())
+    if match is None:
+        return None, None
+    start = int(match.group(1)) if match.group(1) is not None else None
+    total = int(match.group(2)) if match.group(2) != "*" else None
+    return start, total
+
+
+# Definiuje klasę BulkDownloader, która pobiera obrazy z wyników zapytania do katalogu.
+# Każdy plik jest strumieniowany na dysk w kawałkach do pliku .part, a po zerwaniu połączenia transfer
+# jest wznawiany żądaniem Range od miejsca przerwania. Plik docelowy powstaje dopiero po zgodności rozmiaru.
+class BulkDownloader:
+    # Inicjalizuje pobieranie z katalogiem docelowym, liczbą równoległych transferów i wersją obrazu.
+    # Rozmiar size to obszar (szerokość, wysokość), który ma pokryć wybrana wersja (None - oryginał).
+    def __init__(self, directory, workers = 4, size = None, resolver = None, http = None,
+                 chunk_size = 64 * 1024, attempts = 3):
+        # Przypisuje katalog, liczbę wątków i rozmiar.
+        self.directory = directory
+        self.workers = workers
+        self.size = size
+        # Przypisuje resolver wersji i klienta HTTP (domyślnie współdzielone).
+        self.resolver = resolver if resolver is not None else get_rendition_resolver()
+        self.http = http if http is not None else get_http_client()
+        # Przypisuje rozmiar kawałka zapisu i liczbę kolejnych prób bez postępu dla jednego pliku.
+        self.chunk_size = chunk_size
+        self.attempts = attempts
+        # Tworzy blokadę chroniącą statystyki zapisywane z wielu wątków.
+        self.lock = threading.Lock()
+        self.stats = {}
+        # Przypisuje współdzielony licznik czasu etapów.
+        self.timer = get_stage_timer()
+        # Tworzy katalog docelowy, jeśli jeszcze nie istnieje.
+        os.makedirs(self.directory, exist_ok = True)
+
+    # Zwiększa licznik statystyk o podaną wartość.
+    def _count(self, name, value = 1):
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + value
+
+    # Zwraca ścieżkę pliku docelowego dla adresu obrazu (nazwa pliku z adresu, zapasowo nasa_id).
+    def target_path(self, url, nasa_id = None):
+        filename = os.path.basename(unquote(urlsplit(url).path))
+        if not filename or filename.startswith("."):
+            filename = f"{nasa_id or 'image'}.jpg"
+        return os.path.join(self.directory, filename)
+
+    # Wyznacza adres pobieranej wersji dla elementu wyników API (lub None, jeśli element nie ma obrazu).
+    def resolve_item(self, item):
+        parsed = NasaItem.from_api(item)
+        if not parsed.href:
+            return None, None
+        # Wybiera wersję z manifestu elementu; bez manifestu wyprowadza adres z adresu miniatury.
+        url = self.resolver.resolve(
+            parsed.nasa_id, parsed.manifest_url, derive_rendition_url(parsed.href, self.size), self.size
+        )
+        return parsed.nasa_id, url
+
+    # Pobiera plik pod adresem do ścieżki docelowej, wznawiając przerwane transfery; zwraca rozmiar pliku.
+    # Limit prób dotyczy kolejnych transferów bez postępu (wznowienie, które dopisało dane, zeruje licznik).
+    def download_file(self, url, path, cancel_event = None):
+        part = path + PART_SUFFIX
+        failures = 0
+        while True:
+            before = os.path.getsize(part) if os.path.exists(part) else 0
+            try:
+                self._transfer(url, part, cancel_event)
+            except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError, IncompleteDownload):
+                # Zerwane połączenie lub niepełny plik - kolejna próba wznowi transfer od końca pliku .part.
+                failures = 0 if os.path.exists(part) and os.path.getsize(part) > before else failures + 1
+                if failures >= self.attempts:
+                    raise
+                self._count("resumed")
+                continue
+            # Zastępuje plik docelowy zweryfikowanym plikiem.
+            os.replace(part, path)
+            return os.path.getsize(path)
+
+    # Wykonuje jedno żądanie: dopisuje brakującą część pliku .part i sprawdza rozmiar; zwraca liczbę odebranych bajtów.
+    def _transfer(self, url, part, cancel_event):
+        # Sprawdza anulowanie przed wysłaniem żądania.
+        if cancel_event is not None and cancel_event.is_set():
+            raise RequestCancelled(url)
+        # Odczytuje rozmiar już pobranej części.
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        received = 0
+        with self.http.stream(url, headers = headers) as response:
+            # Zakres poza plikiem: część ma już pełny rozmiar lub jest nieaktualna.
+            if response.status_code == 416:
+                _, total = parse_content_range(response.headers.get("Content-Range"))
+                if total == offset:
+                    return 0
+                os.remove(part)
+                raise IncompleteDownload(url)
+            response.raise_for_status()
+            if response.status_code == 206:
+                # Serwer wznowił transfer - sprawdza, czy zakres zaczyna się tam, gdzie kończy się część.
+                start, total = parse_content_range(response.headers.get("Content-Range"))
+                if start != offset:
+                    os.remove(part)
+                    raise IncompleteDownload(url)
+                mode = "ab"
+            else:
+                # Serwer zignorował Range (lub to pierwsze żądanie) i wysyła cały plik - zaczyna od nowa.
+                total = int(response.headers.get("Content-Length", 0)) or None
+                mode = "wb"
+            # Strumieniuje odpowiedź do pliku w kawałkach.
+            with open(part, mode) as file:
+                for chunk in response.iter_content(self.chunk_size):
+                    # Przerywa transfer (plik .part zostaje do wznowienia).
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise RequestCancelled(url)
+                    file.write(chunk)
+                    received += len(chunk)
+                    self._count("bytes", len(chunk))
+        # Weryfikuje rozmiar pliku z rozmiarem zapowiedzianym przez serwer.
+        size = os.path.getsize(part)
+        if total is not None and size != total:
+            # Plik większy niż całość jest uszkodzony - zostanie pobrany od nowa.
+            if size > total:
+                os.remove(part)
+            raise IncompleteDownload(url)
+        return received
+
+    # Pobiera obraz jednego elementu wyników (wywoływane w wątku roboczym).
+    def download_item(self, item, cancel_event = None):
+        nasa_id, url = self.resolve_item(item)
+        if url is None:
+            self._count("skipped")
+            return
+        path = self.target_path(url, nasa_id)
+        # Pomija pliki pobrane wcześniej (plik docelowy powstaje tylko po weryfikacji rozmiaru).
+        if os.path.exists(path):
+            self._count("existing")
+            return
+        with self.timer.stage("download.file"):
+            self.download_file(url, path, cancel_event)
+        self._count("files")
+
+    # Pobiera obrazy wszystkich elementów (np. z FetchNasaImages.iter_images) i zwraca słownik z podsumowaniem.
+    # Elementy są pobierane leniwie: kolejne strony wyników są odczytywane, gdy zwalnia się miejsce w kolejce.
+    def run(self, items, cancel_event = None):
+        start = time.perf_counter()
+        self.stats = {}
+        # Ogranicza liczbę zleconych zadań, aby nie trzymać w pamięci całej listy wyników.
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        with ThreadPoolExecutor(max_workers = self.workers, thread_name_prefix = "nasa-download") as executor:
+            for item in items:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                slots.acquire()
+                future = executor.submit(self.download_item, item, cancel_event)
+                future.add_done_callback(lambda f: self._on_item_done(f, slots))
+        # Oblicza czas i przepustowość.
+        elapsed = time.perf_counter() - start
+        megabytes = self.stats.get("bytes", 0) / (1024 * 1024)
+        return {
+            "files": self.stats.get("files", 0),
+            "existing": self.stats.get("existing", 0),
+            "skipped": self.stats.get("skipped", 0),
+            "resumed": self.stats.get("resumed", 0),
+            "errors": self.stats.get("errors", 0),
+            "mb": round(megabytes, 2),
+            "elapsed_s": round(elapsed, 3),
+            "mb_per_s": round(megabytes / elapsed, 2) if elapsed else None,
+        }
+
+    # Zwalnia miejsce w kolejce i zlicza błędy zakończonego zadania.
+    def _on_item_done(self, future, slots):
+        slots.release()
+        exception = future.exception()
+        if exception is not None and not isinstance(exception, RequestCancelled):
+            # Błąd jednego pliku nie przerywa pobierania pozostałych.
+            self._count("errors")
+            print(f"Błąd pobierania: {exception}", file = sys.stderr)
+
+
+# Definiuje główną funkcję pobierania wyników zapytania.
+def main(argv = None):
+    # Importuje klienta wyszukiwania dopiero tutaj (Obiekt_Projekt_Nasa importuje ten moduł).
+    from Obiekt_Projekt_Nasa import FetchNasaImages
+
+    # Tworzy parser argumentów wiersza poleceń.
+    parser = argparse.ArgumentParser(description = "Pobieranie obrazów z wyników zapytania do API NASA Images.")
+    parser.add_argument("query", help = "zapytanie wyszukiwania")
+    parser.add_argument("-o", "--output", default = "nasa_images", help = "katalog docelowy")
+    parser.add_argument("-w", "--workers", type = int, default = 4, help = "liczba równoległych transferów")
+    parser.add_argument("-p", "--max-pages", type = int, default = 1, help = "maksymalna liczba stron wyników (0 - wszystkie)")
+    parser.add_argument("--rendition", default = "orig", choices = [name for name, _ in RENDITIONS],
+                        help = "pobierana wersja obrazu")
+    args = parser.parse_args(argv)
+
+    # Zamienia nazwę wersji na rozmiar, który ma zostać pokryty (None - oryginał).
+    edge = dict(RENDITIONS)[args.rendition]
+    size = (edge, edge) if edge is not None else None
+    # Pobiera obrazy i wypisuje podsumowanie.
+    summary = FetchNasaImages().download_images(args.query, args.output, args.max_pages or None, args.workers, size)
+    print(json.dumps(summary, ensure_ascii = False))
+    # Zwraca kod wyjścia różny od zera, jeśli wystąpiły błędy.
+    return 1 if summary["errors"] else 0
+
+
+# Sprawdza, czy skrypt jest uruchamiany bezpośrednio.
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+# Importuje moduł argparse do obsługi argumentów wiersza poleceń.
+import argparse
+# Importuje hashlib do wyznaczania deterministycznych kolorów obrazów na podstawie nasa_id.
+import hashlib
+# Importuje moduł json do budowania odpowiedzi API.
+import json
+# Importuje moduł os do odczytu nagranych odpowiedzi z dysku.
+import os
+# Importuje moduł random do losowania opóźnień i błędów.
+import random
+# Importuje moduł re do parsowania nagłówka Range.
+import re
+# Importuje moduł threading do uruchamiania serwera w tle i blokady cache obrazów.
+import threading
+# Importuje moduł time do symulacji opóźnień i ograniczenia przepustowości.
+import time
+# Importuje klasy serwera HTTP z biblioteki standardowej.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+# Importuje BytesIO do kodowania obrazów JPEG w pamięci.
+from io import BytesIO
+# Importuje funkcje do parsowania i budowania adresów URL.
+from urllib.parse import parse_qs, urlencode, urlparse
+# Importuje moduły PIL do generowania syntetycznych obrazów.
+from PIL import Image, ImageDraw
+
+# Rozmiary syntetycznych wersji obrazów (zgodnie z nazwami wersji w API NASA).
+RENDITIONS = {
+    "thumb": (320, 240),
+    "small": (640, 480),
+    "medium": (1280, 960),
+    "large": (1920, 1440),
+    "orig": (4000, 3000),
+}
+
+
+# Definiuje klasę FakeNasaConfig z parametrami symulacji sieci i danych.
+class FakeNasaConfig:
+    # Inicjalizuje konfigurację z domyślnymi wartościami.
+    def __init__(self, latency = 0.0, jitter = 0.0, bandwidth = None, error_rate = 0.0,
+                 total_hits = 500, page_size = 100, recordings = None, renditions = None, cut_rate = 0.0,
+                 rate_limit = None):
+        # Stałe opóźnienie (w sekundach) przed każdą odpowiedzią.
+        self.latency = latency
+        # Maksymalne losowe opóźnienie dodawane do stałego.
+        self.jitter = jitter
+        # Przepustowość w bajtach na sekundę (None - bez ograniczenia).
+        self.bandwidth = bandwidth
+        # Prawdopodobieństwo odpowiedzi 503 zamiast właściwej odpowiedzi.
+        self.error_rate = error_rate
+        # Liczba wyników zwracanych dla każdego zapytania.
+        self.total_hits = total_hits
+        # Liczba wyników na stronę.
+        self.page_size = page_size
+        # Katalog z nagranymi odpowiedziami wyszukiwania (None - tylko dane syntetyczne).
+        self.recordings = recordings
+        # Rozmiary wersji obrazów.
+        self.renditions = dict(renditions or RENDITIONS)
+        # Prawdopodobieństwo zerwania połączenia w połowie przesyłania obrazu (test wznawiania pobierania).
+        self.cut_rate = cut_rate
+        # Limit zapytań na sekundę, powyżej którego serwer odpowiada 429 z Retry-After (None - bez limitu).
+        self.rate_limit = rate_limit
+
+
+# Definiuje klasę obsługującą żądania do sztucznego API NASA.
+class FakeNasaHandler(BaseHTTPRequestHandler):
+    # Używa HTTP/1.1, aby klienci mogli utrzymywać połączenia keep-alive.
+    protocol_version = "HTTP/1.1"
+    # Wyłącza algorytm Nagle'a, aby nagłówki i treść nie czekały na opóźnione potwierdzenia TCP.
+    disable_nagle_algorithm = True
+
+    # Obsługuje żądania GET.
+    def do_GET(self):
+        # Pobiera konfigurację serwera.
+        config = self.server.config
+        # Symuluje opóźnienie sieci.
+        delay = config.latency + random.uniform(0, config.jitter)
+        if delay:
+            time.sleep(delay)
+        # Symuluje limit zapytań (429 z Retry-After).
+        if not self.server.admit():
+            self.send_body(429, b"Too Many Requests", "text/plain", {"Retry-After": "1"})
+            return
+        # Symuluje przeciążenie serwera.
+        if random.random() < config.error_rate:
+            self.send_body(503, b"Service Unavailable", "text/plain")
+            return
+        # Rozdziela ścieżkę i parametry zapytania.
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+        # Kieruje żądanie do odpowiedniej obsługi.
+        if url.path == "/search":
+            self.send_json(self.server.search_page(params))
+        elif len(parts) == 3 and parts[0] == "image" and parts[2] == "collection.json":
+            self.send_json(self.server.manifest(parts[1]))
+        elif len(parts) == 3 and parts[0] == "image" and parts[2].endswith(".jpg"):
+            data = self.server.image(parts[1], parts[2])
+            if data is None:
+                self.send_body(404, b"Not Found", "text/plain")
+            else:
+                self.send_range(data, "image/jpeg")
+        else:
+            self.send_body(404, b"Not Found", "text/plain")
+
+    # Obsługuje żądania HEAD (klient otwiera nimi połączenie z wyprzedzeniem) - pusta odpowiedź 200 dla każdej ścieżki.
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    # Wysyła odpowiedź JSON.
+    def send_json(self, payload):
+        self.send_body(200, json.dumps(payload).encode("utf-8"), "application/json")
+
+    # Wysyła plik z obsługą nagłówka Range (bytes=początek-[koniec]), tak jak serwer plików API NASA.
+    def send_range(self, data, content_type):
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", "").strip())
+        if match is None:
+            self.send_body(200, data, content_type, {"Accept-Ranges": "bytes"}, cut = True)
+            return
+        # Wyznacza zakres (koniec włącznie, przycięty do rozmiaru pliku).
+        start = int(match.group(1))
+        end = min(len(data) - 1, int(match.group(2))) if match.group(2) else len(data) - 1
+        if start >= len(data) or end < start:
+            self.send_body(416, b"", content_type, {"Content-Range": f"bytes */{len(data)}"})
+            return
+        headers = {"Accept-Ranges": "bytes", "Content-Range": f"bytes {start}-{end}/{len(data)}"}
+        self.send_body(206, data[start:end + 1], content_type, headers, cut = True)
+
+    # Wysyła odpowiedź z treścią, ograniczając przepustowość, jeśli jest skonfigurowana.
+    # Jeśli cut jest True, połączenie może zostać zerwane w połowie treści (zgodnie z cut_rate).
+    def send_body(self, status, body, content_type, headers = None, cut = False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        # Wyznacza miejsce zerwania połączenia (None - treść zostanie wysłana w całości).
+        config = self.server.config
+        cut_at = len(body) // 2 if cut and len(body) > 1 and random.random() < config.cut_rate else None
+        # Wysyła treść w kawałkach z przerwami odpowiadającymi przepustowości.
+        chunk_size = 16 * 1024
+        for offset in range(0, len(body), chunk_size):
+            chunk = body[offset:offset + chunk_size]
+            if cut_at is not None and offset + len(chunk) > cut_at:
+                # Wysyła część treści i zamyka połączenie (klient otrzyma mniej bajtów niż Content-Length).
+                self.wfile.write(chunk[:cut_at - offset])
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.wfile.write(chunk)
+            if config.bandwidth:
+                time.sleep(len(chunk) / config.bandwidth)
+
+    # Wyłącza logowanie każdego żądania na stderr.
+    def log_message(self, format, *args):
+        pass
+
+
+# Definiuje klasę FakeNasaServer - lokalny zamiennik images-api.nasa.gov.
+class FakeNasaServer(ThreadingHTTPServer):
+    # Wątki obsługujące żądania nie blokują zamknięcia programu.
+    daemon_threads = True
+
+    # Inicjalizuje serwer na podanym adresie (port 0 - dowolny wolny port).
+    def __init__(self, host = "127.0.0.1", port = 0, config = None):
+        super().__init__((host, port), FakeNasaHandler)
+        # Przypisuje konfigurację symulacji.
+        self.config = config or FakeNasaConfig()
+        # Cache wygenerowanych obrazów: (kolor, wersja) -> bajty JPEG.
+        self.images = {}
+        # Blokada chroniąca cache obrazów.
+        self.lock = threading.Lock()
+        # Wątek, w którym serwer działa po wywołaniu start().
+        self.thread = None
+        # Stan limitu zapytań (token bucket o pojemności jednej sekundy zapytań) i liczniki odpowiedzi.
+        self.tokens = self.config.rate_limit or 0
+        self.tokens_updated = time.monotonic()
+        self.admitted = 0
+        self.rejected = 0
+
+    # Zwraca bazowy adres serwera.
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # Uruchamia serwer w wątku w tle.
+    def start(self):
+        self.thread = threading.Thread(target = self.serve_forever, name = "fake-nasa", daemon = True)
+        self.thread.start()
+        return self
+
+    # Zatrzymuje serwer.
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    # Sprawdza limit zapytań; zwraca False, jeśli zapytanie należy odrzucić odpowiedzią 429.
+    def admit(self):
+        with self.lock:
+            if self.config.rate_limit:
+                now = time.monotonic()
+                self.tokens = min(self.config.rate_limit, self.tokens + (now - self.tokens_updated) * self.config.rate_limit)
+                self.tokens_updated = now
+                if self.tokens < 1:
+                    self.rejected += 1
+                    return False
+                self.tokens -= 1
+            self.admitted += 1
+            return True
+
+    # Zwraca stronę wyników wyszukiwania (nagraną lub syntetyczną).
+    def search_page(self, params):
+        query = params.get("q", "")
+        page = max(1, int(params.get("page", 1)))
+        # Zwraca nagraną odpowiedź, jeśli istnieje plik <zapytanie>.json lub <zapytanie>_p<strona>.json.
+        recorded = self.recorded_page(query, page)
+        if recorded is not None:
+            return recorded
+        # Wyznacza zakres wyników na danej stronie.
+        start = (page - 1) * self.config.page_size
+        stop = min(self.config.total_hits, start + self.config.page_size)
+        items = [self.search_item(query, index) for index in range(start, stop)]
+        # Dodaje link do kolejnej strony, jeśli są dalsze wyniki.
+        links = []
+        if stop < self.config.total_hits:
+            next_params = dict(params, page = page + 1)
+            links.append({"rel": "next", "prompt": "Next", "href": f"{self.url}/search?{urlencode(next_params)}"})
+        # Zwraca kolekcję w formacie API NASA.
+        return {
+            "collection": {
+                "version": "1.0",
+                "href": f"{self.url}/search?{urlencode(params)}",
+                "items": items,
+                "metadata": {"total_hits": self.config.total_hits},
+                "links": links,
+            }
+        }
+
+    # Odczytuje nagraną stronę wyników z katalogu recordings.
+    def recorded_page(self, query, page):
+        if not self.config.recordings:
+            return None
+        # Buduje nazwę pliku na podstawie zapytania (znaki inne niż litery, cyfry, _ i - są zamieniane na _, np. "../").
+        name = re.sub(r"[^\w-]", "_", "_".join(query.lower().split())) or "_"
+        suffix = "" if page == 1 else f"_p{page}"
+        root = os.path.realpath(self.config.recordings)
+        path = os.path.realpath(os.path.join(root, f"{name}{suffix}.json"))
+        # Odczytuje tylko pliki leżące w katalogu nagrań.
+        if os.path.dirname(path) != root or not os.path.exists(path):
+            return None
+        with open(path, encoding = "utf-8") as file:
+            return json.load(file)
+
+    # Buduje syntetyczny element wyników.
+    def search_item(self, query, index):
+        nasa_id = f"{'_'.join(query.split()) or 'item'}-{index:05d}"
+        return {
+            "href": f"{self.url}/image/{nasa_id}/collection.json",
+            "data": [{
+                "nasa_id": nasa_id,
+                "title": f"{query} #{index}",
+                "description": f"Syntetyczny obraz nr {index} dla zapytania '{query}'.",
+                "keywords": query.split(),
+                "center": "JSC",
+                "date_created": "2020-01-01T00:00:00Z",
+                "media_type": "image",
+            }],
+            "links": [{
+                "href": f"{self.url}/image/{nasa_id}/{nasa_id}~thumb.jpg",
+                "rel": "preview",
+                "render": "image",
+            }],
+        }
+
+    # Zwraca manifest zasobów (listę adresów wszystkich wersji obrazu).
+    def manifest(self, nasa_id):
+        return [f"{self.url}/image/{nasa_id}/{nasa_id}~{name}.jpg" for name in self.config.renditions]
+
+    # Zwraca bajty JPEG dla pliku <nasa_id>~<wersja>.jpg lub None, jeśli wersja jest nieznana.
+    def image(self, nasa_id, filename):
+        rendition = filename[:-len(".jpg")].rpartition("~")[2]
+        size = self.config.renditions.get(rendition)
+        if size is None:
+            return None
+        # Wyznacza kolor obrazu z nasa_id (16 kolorów, aby cache generowanych obrazów był mały).
+        color = int(hashlib.sha256(nasa_id.encode("utf-8")).hexdigest(), 16) % 16
+        with self.lock:
+            if (color, rendition) not in self.images:
+                self.images[(color, rendition)] = self.render_image(color, size)
+            return self.images[(color, rendition)]
+
+    # Generuje syntetyczny obraz JPEG o podanym rozmiarze.
+    @staticmethod
+    def render_image(color, size):
+        # Tworzy obraz z kolorem tła zależnym od numeru koloru.
+        background = (color * 16, 255 - color * 16, (color * 97) % 256)
+        image = Image.new("RGB", size, background)
+        # Rysuje wzór, aby obraz nie kompresował się do kilku bajtów.
+        draw = ImageDraw.Draw(image)
+        step = max(8, size[0] // 40)
+        for x in range(0, size[0], step):
+            draw.line([(x, 0), (size[0] - x, size[1])], fill = (255 - background[0], 128, color * 16), width = 2)
+        # Koduje obraz do JPEG.
+        buffer = BytesIO()
+        image.save(buffer, format = "JPEG", quality = 85)
+        return buffer.getvalue()
+
+
+# Definiuje główną funkcję uruchamiającą serwer z wiersza poleceń.
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Lokalny zamiennik API NASA Images do testów i benchmarków.")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--latency", type = float, default = 0.0, help = "stałe opóźnienie odpowiedzi w sekundach")
+    parser.add_argument("--jitter", type = float, default = 0.0, help = "maksymalne losowe opóźnienie w sekundach")
+    parser.add_argument("--bandwidth", type = float, default = None, help = "przepustowość w bajtach na sekundę")
+    parser.add_argument("--error-rate", type = float, default = 0.0, help = "odsetek odpowiedzi 503 (0-1)")
+    parser.add_argument("--total-hits", type = int, default = 500, help = "liczba wyników na zapytanie")
+    parser.add_argument("--page-size", type = int, default = 100, help = "liczba wyników na stronę")
+    parser.add_argument("--recordings", default = None, help = "katalog z nagranymi odpowiedziami <zapytanie>.json")
+    parser.add_argument("--rate-limit", type = float, default = None, help = "limit zapytań na sekundę (powyżej - 429)")
+    parser.add_argument("--cut-rate", type = float, default = 0.0, help = "odsetek transferów obrazów zrywanych w połowie (0-1)")
+    args = parser.parse_args(argv)
+
+    # Tworzy konfigurację i serwer.
+    config = FakeNasaConfig(args.latency, args.jitter, args.bandwidth, args.error_rate,
+                            args.total_hits, args.page_size, args.recordings, cut_rate = args.cut_rate,
+                            rate_limit = args.rate_limit)
+    server = FakeNasaServer(args.host, args.port, config)
+    # Wypisuje adres, który należy ustawić w zmiennej NASA_API_URL.
+    print(f"Serwer działa: NASA_API_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# Sprawdza, czy skrypt jest uruchamiany bezpośrednio.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+# Importuje moduł os do odczytu limitu zapytań ze zmiennej środowiskowej.
+import os
+# Importuje moduł random do losowego rozrzutu (jitter) czasu oczekiwania między ponowieniami.
+import random
+# Importuje moduł threading, aby bezpiecznie tworzyć współdzieloną instancję klienta i synchronizować limiter.
+import threading
+# Importuje moduł time do odmierzania tokenów i blokad po odpowiedziach 429.
+import time
+# Importuje contextmanager do zapisu żądania zajmującego miejsce w limiterze do końca odczytu odpowiedzi.
+from contextlib import contextmanager
+# Importuje parsedate_to_datetime do odczytu nagłówka Retry-After w postaci daty HTTP.
+from email.utils import parsedate_to_datetime
+# Importuje bibliotekę requests do wykonywania zapytań HTTP.
+import requests
+# Importuje adapter HTTP, który zarządza pulą połączeń dla każdego hosta.
+from requests.adapters import HTTPAdapter
+# Importuje klasę Retry z urllib3, która definiuje politykę ponowień.
+from urllib3.util.retry import Retry
+
+# Statusy oznaczające przeciążenie serwera (obsługiwane przez limiter, a nie przez ponowienia urllib3).
+THROTTLE_STATUSES = frozenset({429, 503})
+# Maksymalna liczba zapytań na sekundę, którą można nadpisać zmienną środowiskową NASA_RATE_LIMIT.
+RATE_LIMIT = float(os.environ.get("NASA_RATE_LIMIT", 20))
+
+
+# Definiuje wyjątek zgłaszany, gdy pobieranie zostało anulowane (np. przez nowe wyszukiwanie).
+class RequestCancelled(Exception):
+    pass
+
+
+# Definiuje politykę ponowień z wykładniczym opóźnieniem i losowym rozrzutem.
+class JitteredRetry(Retry):
+    # Zwraca czas oczekiwania przed kolejną próbą, losowany z przedziału [0, opóźnienie wykładnicze].
+    def get_backoff_time(self):
+        # Pobiera opóźnienie wykładnicze obliczone przez urllib3.
+        backoff = super().get_backoff_time()
+        # Losuje czas z przedziału (full jitter), aby ponowienia wielu klientów się nie nakładały.
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+
+# Zwraca czas oczekiwania w sekundach z nagłówka Retry-After (liczba sekund lub data HTTP) lub None.
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Sprawdza, czy wyjątek to błąd HTTP oznaczający przeciążenie serwera (429/503).
+def is_throttled(exception):
+    response = getattr(exception, "response", None)
+    return isinstance(exception, requests.HTTPError) and response is not None and response.status_code in THROTTLE_STATUSES
+
+
+# Definiuje klasę AdaptiveLimiter - wspólny limiter wszystkich zapytań do API NASA.
+# Token bucket ogranicza liczbę zapytań na sekundę, a limit jednoczesnych zapytań dostosowuje się metodą AIMD:
+# rośnie o 1 na "okno" udanych odpowiedzi i spada o połowę po odpowiedzi 429/503. Retry-After wstrzymuje wszystkie zapytania.
+class AdaptiveLimiter:
+    # Inicjalizuje limiter z liczbą zapytań na sekundę, pojemnością kubełka i zakresem limitu jednoczesnych zapytań.
+    def __init__(self, rate = RATE_LIMIT, burst = None, initial_limit = 4, min_limit = 1, max_limit = 16,
+                 backoff_factor = 0.5, max_delay = 60):
+        # Przypisuje parametry token bucket (domyślnie kubełek mieści zapytania z dwóch sekund).
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, 2 * rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        # Przypisuje parametry AIMD.
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        # Przypisuje parametry oczekiwania po przeciążeniu bez nagłówka Retry-After.
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        # Liczba trwających zapytań, czas końca wstrzymania i liczba kolejnych przeciążeń.
+        self.active = 0
+        self.blocked_until = 0.0
+        self.throttles = 0
+        # Czas ostatniego zmniejszenia limitu (odpowiedzi na zapytania wysłane wcześniej nie zmniejszają go ponownie).
+        self.decreased_at = 0.0
+        # Warunek, na którym czekają wątki bez wolnego miejsca lub tokenu.
+        self.condition = threading.Condition()
+
+    # Czeka na wolne miejsce i token; zwraca czas rozpoczęcia zapytania, który należy przekazać do release.
+    def acquire(self):
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                # Uzupełnia tokeny proporcjonalnie do czasu od ostatniego uzupełnienia.
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.blocked_until:
+                    # Czeka do końca wstrzymania (Retry-After).
+                    timeout = self.blocked_until - now
+                elif self.active >= int(self.limit):
+                    # Czeka na zakończenie któregoś z trwających zapytań.
+                    timeout = None
+                elif self.tokens < 1:
+                    # Czeka na kolejny token.
+                    timeout = (1 - self.tokens) / self.rate
+                else:
+                    self.tokens -= 1
+                    self.active += 1
+                    return now
+                self.condition.wait(timeout)
+
+    # Zwalnia miejsce i dostosowuje limit do statusu odpowiedzi (None - błąd połączenia, bez zmiany limitu).
+    def release(self, started, status = None, retry_after = None):
+        with self.condition:
+            self.active -= 1
+            now = time.monotonic()
+            if status in THROTTLE_STATUSES:
+                self.throttles += 1
+                # Zmniejsza limit o połowę raz na falę odpowiedzi 429/503.
+                if started >= self.decreased_at:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self.decreased_at = now
+                # Wstrzymuje zapytania na czas z Retry-After lub na losowy czas rosnący wykładniczo.
+                if retry_after is None:
+                    retry_after = random.uniform(0, self.backoff_factor * 2 ** min(self.throttles, 10))
+                self.blocked_until = max(self.blocked_until, now + min(retry_after, self.max_delay))
+            elif status is not None and status < 500:
+                # Zwiększa limit addytywnie (o 1 po limit udanych odpowiedziach).
+                self.throttles = 0
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    # Zwraca bieżący stan limitera jako słownik.
+    def stats(self):
+        with self.condition:
+            return {
+                "limit": round(self.limit, 2),
+                "active": self.active,
+                "blocked_s": round(max(0.0, self.blocked_until - time.monotonic()), 2),
+            }
+
+
+# Definiuje adapter HTTP, który ustawia domyślny limit czasu dla każdego żądania.
+class TimeoutHTTPAdapter(HTTPAdapter):
+    # Inicjalizuje adapter z domyślnym limitem czasu (połączenie, odczyt).
+    def __init__(self, timeout, **kwargs):
+        # Przypisuje domyślny limit czasu.
+        self.timeout = timeout
+        # Wywołuje konstruktor klasy bazowej (pula połączeń, ponowienia).
+        super().__init__(**kwargs)
+
+    # Wysyła żądanie, uzupełniając limit czasu, jeśli wywołujący go nie podał.
+    def send(self, request, **kwargs):
+        # Ustawia domyślny limit czasu, gdy go brak.
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        # Przekazuje żądanie do klasy bazowej.
+        return super().send(request, **kwargs)
+
+
+# Definiuje klasę NasaHttpClient - współdzielonego klienta HTTP dla wszystkich wywołań API NASA.
+class NasaHttpClient:
+    # Inicjalizuje klienta z limitami czasu, polityką ponowień, rozmiarem puli połączeń i limiterem zapytań.
+    def __init__(self, connect_timeout = 3.05, read_timeout = 20, retries = 3, backoff_factor = 0.5,
+                 pool_connections = 8, pool_maxsize = 16, limiter = None):
+        # Tworzy politykę ponowień dla błędów połączenia i odpowiedzi 5xx (429 i 503 ponawia limiter, który zwalnia wszystkie wątki).
+        retry = JitteredRetry(
+            total = retries, connect = retries, read = retries, status = retries,
+            backoff_factor = backoff_factor, status_forcelist = (500, 502, 504),
+            allowed_methods = frozenset({"GET", "HEAD"}), raise_on_status = False
+        )
+        # Tworzy adapter z pulą połączeń keep-alive (osobna pula dla każdego hosta).
+        adapter = TimeoutHTTPAdapter(
+            timeout = (connect_timeout, read_timeout), max_retries = retry,
+            pool_connections = pool_connections, pool_maxsize = pool_maxsize
+        )
+        # Tworzy sesję, która utrzymuje otwarte połączenia między żądaniami.
+        self.session = requests.Session()
+        # Podpina adapter dla połączeń HTTPS i HTTP.
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Przypisuje liczbę ponowień po odpowiedzi 429/503.
+        self.retries = retries
+        # Tworzy wspólny limiter (limit jednoczesnych zapytań nie przekracza rozmiaru puli połączeń).
+        self.limiter = limiter if limiter is not None else AdaptiveLimiter(max_limit = pool_maxsize)
+
+    # Wykonuje żądanie (domyślnie GET) w limiterze i zwraca odpowiedź; miejsce w limiterze jest zajęte do wyjścia z kontekstu.
+    # Odpowiedzi 429/503 są ponawiane po czasie z Retry-After (do wyczerpania ponowień zwracana jest ostatnia odpowiedź).
+    @contextmanager
+    def _limited(self, url, method = "GET", **kwargs):
+        attempt = 0
+        while True:
+            started = self.limiter.acquire()
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+                if response.status_code in THROTTLE_STATUSES and attempt < self.retries:
+                    # Zamyka odpowiedź i ponawia zapytanie, gdy limiter na to pozwoli.
+                    response.close()
+                    attempt += 1
+                    continue
+                yield response
+                return
+            finally:
+                # Przekazuje limiterowi status i Retry-After odpowiedzi.
+                if response is None:
+                    self.limiter.release(started)
+                else:
+                    self.limiter.release(started, response.status_code, parse_retry_after(response.headers.get("Retry-After")))
+
+    # Wykonuje żądanie GET przez współdzieloną sesję i wspólny limiter.
+    def get(self, url, **kwargs):
+        # Zwraca odpowiedź z sesji (połączenie jest ponownie używane).
+        with self._limited(url, **kwargs) as response:
+            return response
+
+    # Otwiera połączenie z hostem adresu (TCP i TLS) żądaniem HEAD i zostawia je w puli, aby kolejne zapytanie go nie zestawiało.
+    # Zwraca czas żądania w sekundach; błędy są pomijane (zapytanie i tak otworzy połączenie samo).
+    def warm_up(self, url):
+        start = time.perf_counter()
+        try:
+            with self._limited(url, method = "HEAD", allow_redirects = False):
+                pass
+        except requests.RequestException:
+            return None
+        return time.perf_counter() - start
+
+    # Wykonuje strumieniowe żądanie GET; miejsce w limiterze jest zajęte do końca odczytu, a odpowiedź zamykana po wyjściu.
+    @contextmanager
+    def stream(self, url, **kwargs):
+        with self._limited(url, stream = True, **kwargs) as response, response:
+            yield response
+
+    # Pobiera zawartość spod adresu URL, zgłaszając wyjątek przy błędzie HTTP.
+    # Jeśli podano cancel_event (threading.Event), dane są pobierane w kawałkach, a ustawienie zdarzenia przerywa transfer.
+    # Jeśli podano progress, jest on wywoływany po każdym kawałku z liczbą odebranych bajtów i rozmiarem całości (lub None).
+    def get_content(self, url, cancel_event = None, chunk_size = 64 * 1024, progress = None, **kwargs):
+        # Bez zdarzenia anulowania i śledzenia postępu pobiera całą odpowiedź naraz.
+        if cancel_event is None and progress is None:
+            response = self.get(url, **kwargs)
+            # Zgłasza wyjątek, jeśli żądanie zwróci błąd HTTP.
+            response.raise_for_status()
+            # Zwraca dane binarne odpowiedzi.
+            return response.content
+        # Sprawdza anulowanie przed wysłaniem żądania.
+        if cancel_event is not None and cancel_event.is_set():
+            raise RequestCancelled(url)
+        # Wykonuje żądanie w trybie strumieniowym.
+        with self.stream(url, **kwargs) as response:
+            response.raise_for_status()
+            # Odczytuje rozmiar całości z nagłówka (None, jeśli serwer go nie podał).
+            total = int(response.headers.get("Content-Length", 0)) or None
+            chunks = []
+            received = 0
+            for chunk in response.iter_content(chunk_size):
+                # Przerywa transfer (i zamyka połączenie), jeśli pobieranie zostało anulowane.
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RequestCancelled(url)
+                chunks.append(chunk)
+                received += len(chunk)
+                # Zgłasza postęp pobierania.
+                if progress is not None:
+                    progress(received, total)
+        # Łączy kawałki w całość.
+        return b"".join(chunks)
+
+    # Strumieniuje zawartość spod adresu URL do otwartego pliku binarnego (bez trzymania całości w pamięci).
+    # Zwraca liczbę zapisanych bajtów; ustawienie cancel_event przerywa transfer.
+    def download(self, url, file, cancel_event = None, chunk_size = 256 * 1024, **kwargs):
+        # Sprawdza anulowanie przed wysłaniem żądania.
+        if cancel_event is not None and cancel_event.is_set():
+            raise RequestCancelled(url)
+        written = 0
+        # Wykonuje żądanie w trybie strumieniowym.
+        with self.stream(url, **kwargs) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size):
+                # Przerywa transfer, jeśli pobieranie zostało anulowane.
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RequestCancelled(url)
+                file.write(chunk)
+                written += len(chunk)
+        return written
+
+    # Zamyka wszystkie połączenia w puli.
+    def close(self):
+        self.session.close()
+
+
+# Przechowuje jedyną instancję klienta HTTP (Singleton).
+_http_client = None
+# Ustawienia, z którymi utworzono instancję.
+_http_client_settings = None
+# Blokada chroniąca tworzenie instancji.
+_http_client_lock = threading.Lock()
+
+
+# Zwraca współdzieloną instancję NasaHttpClient, tworząc ją przy pierwszym użyciu z podanymi ustawieniami.
+# Ustawienia różne od tych, z którymi utworzono instancję, zgłaszają ValueError (zamiast być po cichu pomijane);
+# wywołanie bez ustawień zawsze zwraca istniejącą instancję.
+def get_http_client(**settings):
+    global _http_client, _http_client_settings
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = NasaHttpClient(**settings)
+            _http_client_settings = settings
+        elif settings and settings != _http_client_settings:
+            raise ValueError(
+                f"Współdzielony klient HTTP został już utworzony z ustawieniami {_http_client_settings}, a nie {settings}"
+            )
+        return _http_client
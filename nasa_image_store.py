@@ -0,0 +1,138 @@
+# Importuje OrderedDict, który przechowuje kolejność użycia wpisów (LRU).
+from collections import OrderedDict
+# Importuje BytesIO do dekodowania skompresowanych kopii z pamięci.
+from io import BytesIO
+# Importuje moduły Image i ImageTk z PIL do dekodowania obrazów i tworzenia obrazów Tkinter.
+from PIL import Image, ImageTk
+# Importuje funkcję kodującą obraz do skompresowanych bajtów.
+from nasa_cache import encode_image
+# Importuje funkcję zwracającą współdzielony licznik czasu etapów.
+from nasa_timing import get_stage_timer
+
+
+# Definiuje klasę StoreEntry - jeden obraz w magazynie: skompresowana kopia i opcjonalnie zdekodowany PhotoImage.
+class StoreEntry:
+    # Inicjalizuje wpis ze skompresowanymi bajtami obrazu.
+    def __init__(self, data):
+        # Skompresowana kopia (JPEG/PNG), z której PhotoImage jest odtwarzany po zwolnieniu.
+        self.data = data
+        # Zdekodowany obraz Tkinter (None - zwolniony lub jeszcze nie utworzony).
+        self.photo = None
+        # Rozmiar zdekodowanego obrazu w bajtach (Tk przechowuje 4 bajty na piksel).
+        self.decoded_bytes = 0
+        # Liczba widgetów, które aktualnie wyświetlają obraz (takich wpisów nie wolno zwolnić).
+        self.users = 0
+
+
+# Definiuje klasę PhotoImageStore - magazyn obrazów Tkinter z budżetem pamięci w bajtach.
+# Zdekodowane obrazy nieużywane przez żaden widget są zwalniane od najdawniej używanych po przekroczeniu budżetu
+# i odtwarzane ze skompresowanej kopii przy kolejnym użyciu. Wszystkie metody wywołuje się w wątku Tkinter.
+class PhotoImageStore:
+    # Inicjalizuje magazyn z budżetem zdekodowanych obrazów i budżetem skompresowanych kopii.
+    def __init__(self, max_bytes = 64 * 1024 * 1024, max_compressed_bytes = 32 * 1024 * 1024):
+        # Przypisuje budżety w bajtach.
+        self.max_bytes = max_bytes
+        self.max_compressed_bytes = max_compressed_bytes
+        # Wpisy w kolejności użycia: klucz -> StoreEntry.
+        self.entries = OrderedDict()
+        # Aktualny rozmiar zdekodowanych obrazów i skompresowanych kopii.
+        self.decoded_bytes = 0
+        self.compressed_bytes = 0
+        # Przypisuje współdzielony licznik czasu etapów.
+        self.timer = get_stage_timer()
+
+    # Sprawdza, czy magazyn ma obraz dla klucza (zdekodowany lub skompresowany).
+    def __contains__(self, key):
+        return key in self.entries
+
+    # Zapisuje obraz PIL pod kluczem jako skompresowaną kopię (PhotoImage powstaje dopiero przy acquire).
+    def put(self, key, image):
+        # Koduje obraz do skompresowanych bajtów.
+        with self.timer.stage("image_store.encode"):
+            data = encode_image(image)
+        entry = self.entries.get(key)
+        # Tworzy nowy wpis lub podmienia kopię istniejącego (zdekodowany obraz pozostaje w użyciu).
+        if entry is None:
+            entry = self.entries[key] = StoreEntry(data)
+        else:
+            self.compressed_bytes -= len(entry.data)
+            entry.data = data
+        self.compressed_bytes += len(data)
+        # Oznacza wpis jako ostatnio używany i usuwa nadmiarowe wpisy.
+        self.entries.move_to_end(key)
+        self._evict()
+
+    # Zwraca PhotoImage dla klucza i oznacza go jako używany (lub None, jeśli magazyn nie ma obrazu).
+    # Każde acquire musi mieć odpowiadające mu release, gdy widget przestaje wyświetlać obraz.
+    def acquire(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        # Oznacza wpis jako ostatnio używany.
+        self.entries.move_to_end(key)
+        # Odtwarza zwolniony obraz ze skompresowanej kopii.
+        if entry.photo is None:
+            with self.timer.stage("image_store.decode"):
+                entry.photo = ImageTk.PhotoImage(Image.open(BytesIO(entry.data)))
+            entry.decoded_bytes = entry.photo.width() * entry.photo.height() * 4
+            self.decoded_bytes += entry.decoded_bytes
+        entry.users += 1
+        # Zwalnia nieużywane obrazy ponad budżet.
+        self._evict()
+        return entry.photo
+
+    # Zwraca obraz PIL zdekodowany ze skompresowanej kopii (lub None), bez tworzenia PhotoImage i bez zmiany kolejności LRU.
+    def get_image(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        image = Image.open(BytesIO(entry.data))
+        image.load()
+        return image
+
+    # Oznacza, że widget przestał wyświetlać obraz (obraz może zostać zwolniony po przekroczeniu budżetu).
+    def release(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and entry.users:
+            entry.users -= 1
+            self._evict()
+
+    # Zwalnia zdekodowany obraz wpisu, zostawiając skompresowaną kopię.
+    def _drop_photo(self, entry):
+        self.decoded_bytes -= entry.decoded_bytes
+        entry.photo = None
+        entry.decoded_bytes = 0
+
+    # Zwalnia nieużywane obrazy i kopie od najdawniej używanych, dopóki rozmiary przekraczają budżety.
+    def _evict(self):
+        # Zwalnia zdekodowane obrazy (skompresowana kopia zostaje).
+        if self.decoded_bytes > self.max_bytes:
+            for entry in self.entries.values():
+                if self.decoded_bytes <= self.max_bytes:
+                    break
+                if entry.photo is not None and not entry.users:
+                    self._drop_photo(entry)
+        # Usuwa całe wpisy (obraz trzeba będzie ponownie pobrać z cache na dysku).
+        if self.compressed_bytes > self.max_compressed_bytes:
+            for key, entry in list(self.entries.items()):
+                if self.compressed_bytes <= self.max_compressed_bytes:
+                    break
+                if not entry.users:
+                    self.discard(key)
+
+    # Usuwa wpis z magazynu (także używany - widget musi wtedy zmienić obraz).
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self._drop_photo(entry)
+            self.compressed_bytes -= len(entry.data)
+
+    # Zwraca statystyki magazynu jako słownik.
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "decoded": sum(1 for entry in self.entries.values() if entry.photo is not None),
+            "in_use": sum(1 for entry in self.entries.values() if entry.users),
+            "decoded_mb": round(self.decoded_bytes / (1024 * 1024), 2),
+            "compressed_mb": round(self.compressed_bytes / (1024 * 1024), 2),
+        }
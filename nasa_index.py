@@ -0,0 +1,183 @@
+# Importuje moduł os do budowy ścieżki pliku bazy.
+import os
+# Importuje moduł re do dzielenia zapytania na słowa.
+import re
+# Importuje moduł sqlite3 do lokalnej bazy z indeksem pełnotekstowym (FTS5).
+import sqlite3
+# Importuje moduł threading do blokady chroniącej wspólne połączenie z bazą.
+import threading
+# Importuje domyślny katalog cache.
+from nasa_cache import DEFAULT_CACHE_DIR
+# Importuje model elementu wyników.
+from nasa_model import NasaItem
+# Importuje funkcję zwracającą współdzielony licznik czasu etapów.
+from nasa_timing import get_stage_timer
+
+# Schemat bazy: tabela elementów (jeden wiersz na nasa_id) i zewnętrzny indeks FTS5 aktualizowany wyzwalaczami.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    nasa_id TEXT NOT NULL UNIQUE,
+    title TEXT, description TEXT, keywords TEXT, center TEXT, date_created TEXT,
+    href TEXT, manifest_url TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    nasa_id, title, description, keywords, center, date_created,
+    content = 'items', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts(rowid, nasa_id, title, description, keywords, center, date_created)
+    VALUES (new.id, new.nasa_id, new.title, new.description, new.keywords, new.center, new.date_created);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, nasa_id, title, description, keywords, center, date_created)
+    VALUES ('delete', old.id, old.nasa_id, old.title, old.description, old.keywords, old.center, old.date_created);
+END;
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, nasa_id, title, description, keywords, center, date_created)
+    VALUES ('delete', old.id, old.nasa_id, old.title, old.description, old.keywords, old.center, old.date_created);
+    INSERT INTO items_fts(rowid, nasa_id, title, description, keywords, center, date_created)
+    VALUES (new.id, new.nasa_id, new.title, new.description, new.keywords, new.center, new.date_created);
+END;
+"""
+
+# Zapis elementu: nowy nasa_id jest dodawany, istniejący aktualizowany tylko wtedy, gdy metadane się zmieniły
+# (powtórzone odpowiedzi nie przepisują indeksu FTS).
+UPSERT = """
+INSERT INTO items (nasa_id, title, description, keywords, center, date_created, href, manifest_url)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(nasa_id) DO UPDATE SET
+    title = excluded.title, description = excluded.description, keywords = excluded.keywords,
+    center = excluded.center, date_created = excluded.date_created,
+    href = excluded.href, manifest_url = excluded.manifest_url
+WHERE (title, description, keywords, center, date_created, href, manifest_url)
+    IS NOT (excluded.title, excluded.description, excluded.keywords, excluded.center,
+            excluded.date_created, excluded.href, excluded.manifest_url)
+"""
+
+# Wyszukiwanie: elementy pasujące do zapytania FTS, od najlepiej dopasowanych (bm25).
+SEARCH = """
+SELECT items.nasa_id, items.title, items.description, items.keywords, items.center, items.date_created,
+       items.href, items.manifest_url
+FROM items_fts JOIN items ON items.id = items_fts.rowid
+WHERE items_fts MATCH ?
+ORDER BY bm25(items_fts)
+LIMIT ? OFFSET ?
+"""
+
+
+# Zamienia element wyników API na wiersz bazy (lub None, jeśli element nie ma nasa_id).
+def item_row(item):
+    data = (item.get("data") or [{}])[0]
+    link = (item.get("links") or [{}])[0]
+    nasa_id = data.get("nasa_id")
+    if not nasa_id:
+        return None
+    # Słowa kluczowe są listą - zapisuje je jako jeden tekst.
+    keywords = data.get("keywords")
+    if isinstance(keywords, list):
+        keywords = "; ".join(str(keyword) for keyword in keywords)
+    return (nasa_id, data.get("title"), data.get("description"), keywords, data.get("center"),
+            data.get("date_created"), link.get("href"), item.get("href"))
+
+
+# Zamienia wiersz bazy z powrotem na element w formacie API (zgodny z wynikami zdalnego wyszukiwania).
+def row_item(row):
+    nasa_id, title, description, keywords, center, date_created, href, manifest_url = row
+    data = {"nasa_id": nasa_id, "title": title, "description": description, "center": center,
+            "date_created": date_created, "keywords": keywords.split("; ") if keywords else []}
+    item = {"href": manifest_url, "data": [{name: value for name, value in data.items() if value is not None}]}
+    if href:
+        item["links"] = [{"href": href, "rel": "preview", "render": "image"}]
+    return item
+
+
+# Buduje zapytanie FTS z tekstu użytkownika: każde słowo jako fraza, ostatnie także jako prefiks (wyszukiwanie w trakcie pisania).
+def fts_query(text):
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+# Definiuje klasę MetadataIndex - lokalny indeks pełnotekstowy metadanych elementów pobranych z API.
+# Indeks jest uzupełniany każdą odpowiedzią wyszukiwania (jeden wiersz na nasa_id) i pozwala wyszukiwać bez sieci.
+class MetadataIndex:
+    # Inicjalizuje indeks w pliku bazy SQLite (":memory:" - indeks tylko w pamięci).
+    def __init__(self, path = os.path.join(DEFAULT_CACHE_DIR, "metadata.sqlite3")):
+        # Tworzy katalog bazy, jeśli jeszcze nie istnieje.
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok = True)
+        # Otwiera jedno połączenie współdzielone przez wątki (dostęp chroni blokada).
+        self.connection = sqlite3.connect(path, check_same_thread = False)
+        self.lock = threading.Lock()
+        # Przypisuje współdzielony licznik czasu etapów.
+        self.timer = get_stage_timer()
+        with self.lock:
+            # Tryb WAL pozwala czytać bazę podczas zapisu innego procesu.
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            self.connection.executescript(SCHEMA)
+
+    # Dodaje do indeksu elementy z odpowiedzi wyszukiwania API; zwraca liczbę nowych lub zmienionych elementów.
+    def add_response(self, data):
+        return self.add_items(data.get("collection", {}).get("items", []))
+
+    # Dodaje elementy wyników API w jednej transakcji; zwraca liczbę nowych lub zmienionych elementów.
+    def add_items(self, items):
+        rows = [row for row in map(item_row, items) if row is not None]
+        if not rows:
+            return 0
+        with self.timer.stage("index.add"):
+            with self.lock, self.connection:
+                return self.connection.executemany(UPSERT, rows).rowcount
+
+    # Wyszukuje elementy w indeksie i zwraca listę elementów w formacie API.
+    def search(self, text, limit = 100, offset = 0):
+        query = fts_query(text)
+        if query is None:
+            return []
+        with self.timer.stage("index.search"):
+            with self.lock:
+                rows = self.connection.execute(SEARCH, (query, limit, offset)).fetchall()
+        return [row_item(row) for row in rows]
+
+    # Zwraca element NasaItem o podanym nasa_id lub None, jeśli nie ma go w indeksie.
+    def get(self, nasa_id):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT nasa_id, title, href, manifest_url FROM items WHERE nasa_id = ?", (nasa_id,)
+            ).fetchone()
+        return NasaItem(*row) if row else None
+
+    # Zwraca wynik lokalnego wyszukiwania jako odpowiedź w formacie API (bez linku do kolejnej strony).
+    def search_response(self, text, limit = 100):
+        items = self.search(text, limit)
+        return {"collection": {"items": items, "metadata": {"total_hits": len(items)}, "links": []}}
+
+    # Zwraca liczbę elementów w indeksie.
+    def count(self):
+        with self.lock:
+            return self.connection.execute("SELECT count(*) FROM items").fetchone()[0]
+
+    # Zamyka połączenie z bazą.
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+# Przechowuje jedyną instancję indeksu (Singleton).
+_metadata_index = None
+# Blokada chroniąca tworzenie instancji.
+_metadata_index_lock = threading.Lock()
+
+
+# Zwraca współdzieloną instancję MetadataIndex.
+def get_metadata_index():
+    global _metadata_index
+    with _metadata_index_lock:
+        if _metadata_index is None:
+            _metadata_index = MetadataIndex()
+        return _metadata_index
@@ -0,0 +1,204 @@
+# Importuje moduł multiprocessing do wyboru sposobu uruchamiania procesów dekodujących.
+import multiprocessing
+# Importuje moduł os do odczytu liczby rdzeni i zmiennej środowiskowej z liczbą procesów dekodujących.
+import os
+# Importuje moduł queue, przez który wątki robocze przekazują gotowe wyniki do wątku Tkinter.
+import queue
+# Importuje moduł threading, aby bezpiecznie tworzyć współdzieloną pulę procesów.
+import threading
+# Importuje pulę wątków (pobieranie obrazów) i pulę procesów (dekodowanie i skalowanie na wszystkich rdzeniach).
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+# Importuje wyjątek zgłaszany, gdy proces roboczy puli zakończył się niespodziewanie.
+from concurrent.futures.process import BrokenProcessPool
+# Importuje BytesIO, aby otwierać pobrane dane binarne jak plik.
+from io import BytesIO
+# Importuje Image z biblioteki PIL do dekodowania i skalowania obrazów.
+from PIL import Image
+# Importuje funkcję zwracającą współdzielonego klienta HTTP z pulą połączeń i wyjątek anulowania.
+from nasa_http import RequestCancelled, get_http_client
+# Importuje funkcję kodującą gotowe miniatury przed zapisem do cache.
+from nasa_cache import encode_image
+# Importuje funkcję zwracającą współdzielony licznik czasu etapów.
+from nasa_timing import get_stage_timer
+
+# Liczba procesów dekodujących (0 - dekodowanie w wątku wywołującym). Domyślnie połowa rdzeni, najwyżej 4
+# (dekodowanie i tak zlecają najwyżej 4 wątki loadera miniatur), a na jednym rdzeniu 0.
+DECODE_PROCESSES = int(os.environ.get("NASA_DECODE_PROCESSES", min(4, (os.cpu_count() or 1) // 2)))
+# Sposób uruchamiania procesów dekodujących. Pula powstaje w wielowątkowej aplikacji, a fork kopiowałby blokady
+# trzymane przez inne wątki (pula HTTP, loader, logowanie), dlatego procesy startują z czystego interpretera.
+DECODE_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+# Parametry skalowania dla rozmiarów docelowych: (zapas dekodowania w zmniejszonej skali, filtr skalowania).
+# Zapas 1.5 pozwala dekodować oryginał 4000x3000 w skali 1/2 dla podglądu 1000x800 (przy zapasie 2.0 dekoder musiałby użyć pełnej skali);
+# miniatury siatki używają szybszego filtru BICUBIC, podgląd dokładniejszego LANCZOS.
+SCALE_PROFILES = {
+    (200, 200): (1.5, Image.Resampling.BICUBIC),
+    (1000, 800): (1.5, Image.Resampling.LANCZOS),
+}
+# Parametry skalowania dla pozostałych rozmiarów (jak domyślne Image.thumbnail).
+DEFAULT_SCALE_PROFILE = (2.0, Image.Resampling.BICUBIC)
+
+
+# Dekoduje dane obrazu w zmniejszonej skali i skaluje go do zadanego rozmiaru; zwraca (obraz, zakodowane bajty lub None).
+# Funkcja jest wykonywana w procesie roboczym, dlatego przyjmuje i zwraca tylko obiekty, które można serializować (pickle).
+def decode_scaled(data, size, encode = False):
+    # Otwiera obraz z danych binarnych w pamięci (odczyt nagłówka, bez dekodowania pikseli).
+    image = Image.open(BytesIO(data))
+    # Pobiera parametry skalowania dla rozmiaru docelowego.
+    reducing_gap, resample = SCALE_PROFILES.get(tuple(size), DEFAULT_SCALE_PROFILE)
+    # Prosi dekoder JPEG o skalę 1/2, 1/4 lub 1/8, nadal nie mniejszą niż rozmiar docelowy z zapasem (inne formaty ignorują draft).
+    image.draft(None, (int(size[0] * reducing_gap), int(size[1] * reducing_gap)))
+    # Skaluje zdekodowany obraz do rozmiaru docelowego (draft został już wykonany, więc thumbnail go nie powtarza).
+    image.thumbnail(size, resample, reducing_gap = None)
+    # Zwraca obraz i, jeśli potrzeba, jego zakodowaną kopię do zapisu w cache (kodowanie też odbywa się w procesie roboczym).
+    return image, encode_image(image) if encode else None
+
+
+# Przechowuje jedyną instancję puli procesów dekodujących (Singleton).
+_decode_pool = None
+# Blokada chroniąca tworzenie puli.
+_decode_pool_lock = threading.Lock()
+
+
+# Zwraca współdzieloną pulę procesów dekodujących (lub None, jeśli dekodowanie odbywa się w wątkach).
+def get_decode_pool():
+    global _decode_pool
+    with _decode_pool_lock:
+        if _decode_pool is None and DECODE_PROCESSES > 0:
+            _decode_pool = ProcessPoolExecutor(
+                max_workers = DECODE_PROCESSES, mp_context = multiprocessing.get_context(DECODE_START_METHOD)
+            )
+        return _decode_pool
+
+
+# Dekoduje i skaluje obraz w puli procesów, a bez niej (lub po awarii procesu roboczego) w bieżącym wątku.
+def decode_in_pool(data, size, encode = False):
+    pool = get_decode_pool()
+    if pool is not None:
+        try:
+            # Wątek roboczy czeka na wynik, więc liczba jednoczesnych dekodowań jest ograniczona rozmiarem puli wątków loadera.
+            return pool.submit(decode_scaled, data, size, encode).result()
+        except BrokenProcessPool:
+            pass
+    return decode_scaled(data, size, encode)
+
+
+# Pobiera obraz (lub odczytuje go z cache) i skaluje go do zadanego rozmiaru; bezpieczne poza wątkiem Tkinter.
+# Czasy etapów są zapisywane pod nazwami "<stage_prefix>.<etap>"; ustawienie cancel_event przerywa pracę (RequestCancelled).
+# Funkcja progress(odebrane bajty, rozmiar lub None) jest wywoływana w trakcie pobierania (w wątku roboczym).
+def load_scaled_image(url, size, cache = None, stage_prefix = "load_image", cancel_event = None, progress = None):
+    # Pobiera współdzielony licznik czasu etapów.
+    timer = get_stage_timer()
+    # Sprawdza, czy przeskalowany obraz jest już w cache dyskowym.
+    with timer.stage(f"{stage_prefix}.cache"):
+        cached = cache.get(url) if cache else None
+    if cached is not None:
+        # Otwiera obraz z cache i wymusza jego zdekodowanie w bieżącym wątku.
+        with timer.stage(f"{stage_prefix}.decode"):
+            image = Image.open(BytesIO(cached))
+            image.load()
+        return image
+    # Pobiera dane obrazu przez współdzieloną sesję HTTP (DNS i połączenie są liczone tylko dla nowych połączeń w puli).
+    with timer.stage(f"{stage_prefix}.http"):
+        img_data = get_http_client().get_content(url, cancel_event = cancel_event, progress = progress)
+    # Pomija dekodowanie, jeśli zadanie zostało anulowane w trakcie pobierania.
+    if cancel_event is not None and cancel_event.is_set():
+        raise RequestCancelled(url)
+    # Dekoduje obraz w zmniejszonej skali i skaluje go w procesie roboczym (razem z kodowaniem kopii do cache).
+    with timer.stage(f"{stage_prefix}.decode_scaled"):
+        image, encoded = decode_in_pool(img_data, size, encode = cache is not None)
+    # Zapisuje przeskalowany obraz w cache, aby kolejne wyszukiwania nie korzystały z sieci.
+    if cache:
+        with timer.stage(f"{stage_prefix}.cache_put"):
+            cache.put(url, encoded)
+    # Zwraca gotowy obraz PIL.
+    return image
+
+
+# Definiuje klasę ImageLoader, która pobiera i dekoduje obrazy poza głównym wątkiem Tkinter.
+class ImageLoader:
+    # Inicjalizuje loader, przyjmując dowolny widget Tkinter (do planowania wywołań przez after), limit równoległości i opcjonalny cache dyskowy.
+    def __init__(self, widget, max_workers=4, poll_interval=20, cache=None):
+        # Przypisuje widget, na którego pętli zdarzeń będą wywoływane callbacki.
+        self.widget = widget
+        # Przypisuje cache dyskowy przeskalowanych obrazów (lub None, jeśli wyłączony).
+        self.cache = cache
+        # Zapamiętuje maksymalną liczbę jednoczesnych pobrań.
+        self.max_workers = max_workers
+        # Zapamiętuje odstęp (w ms) między sprawdzeniami kolejki wyników.
+        self.poll_interval = poll_interval
+        # Tworzy ograniczoną pulę wątków roboczych.
+        self.executor = ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "nasa-loader")
+        # Tworzy kolejkę wyników przekazywanych z wątków roboczych do wątku Tkinter.
+        self.results = queue.Queue()
+        # Licznik zadań, których wyniki nie zostały jeszcze obsłużone w wątku Tkinter.
+        self.pending = 0
+        # Flaga informująca, czy cykliczne sprawdzanie kolejki jest aktywne.
+        self._polling = False
+
+    # Zleca pobranie i przeskalowanie obrazu; callbacki zostaną wywołane w wątku Tkinter.
+    # Ustawienie cancel_event przerywa trwające pobieranie i pomija dekodowanie.
+    def submit(self, url, size, on_done, on_error, cancel_event = None):
+        # Uruchamia pobieranie i dekodowanie w tle.
+        return self.run_in_background(self.fetch_and_decode, (url, size, cancel_event), on_done, on_error)
+
+    # Wykonuje dowolną funkcję w puli wątków; callbacki z wynikiem lub błędem zostaną wywołane w wątku Tkinter.
+    def run_in_background(self, func, args, on_done, on_error):
+        # Zwiększa licznik oczekujących zadań.
+        self.pending += 1
+        # Przekazuje zadanie do puli wątków.
+        future = self.executor.submit(func, *args)
+        # Po zakończeniu zadania wkłada future i callbacki do kolejki (to jedyna operacja wykonywana w wątku roboczym).
+        future.add_done_callback(lambda f: self.results.put((f, on_done, on_error)))
+        # Uruchamia sprawdzanie kolejki, jeśli jeszcze nie działa.
+        self._ensure_polling()
+        # Zwraca future, aby wywołujący mógł np. anulować zadanie.
+        return future
+
+    # Pobiera obraz i skaluje go do zadanego rozmiaru; wykonywane w wątku roboczym.
+    def fetch_and_decode(self, url, size, cancel_event = None):
+        # Korzysta ze wspólnej funkcji z cache dyskowym loadera.
+        return load_scaled_image(url, size, self.cache, cancel_event = cancel_event)
+
+    # Planuje sprawdzanie kolejki wyników, jeśli nie jest już zaplanowane.
+    def _ensure_polling(self):
+        # Sprawdza, czy sprawdzanie już działa.
+        if not self._polling:
+            # Oznacza sprawdzanie jako aktywne.
+            self._polling = True
+            # Planuje pierwsze sprawdzenie kolejki w pętli zdarzeń Tkinter.
+            self.widget.after(self.poll_interval, self._poll)
+
+    # Odbiera gotowe wyniki z kolejki i wywołuje callbacki w wątku Tkinter.
+    def _poll(self):
+        # Przetwarza wszystkie wyniki dostępne w kolejce.
+        while True:
+            try:
+                # Pobiera wynik bez blokowania.
+                future, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                # Kończy pętlę, gdy kolejka jest pusta.
+                break
+            # Zmniejsza licznik oczekujących zadań.
+            self.pending -= 1
+            # Pomija zadania anulowane przed uruchomieniem.
+            if future.cancelled():
+                continue
+            # Pobiera ewentualny wyjątek zgłoszony w wątku roboczym.
+            error = future.exception()
+            # Wywołuje callback błędu lub sukcesu.
+            if error is not None:
+                on_error(error)
+            else:
+                on_done(future.result())
+        # Sprawdza, czy są jeszcze zadania w toku.
+        if self.pending > 0:
+            # Planuje kolejne sprawdzenie kolejki.
+            self.widget.after(self.poll_interval, self._poll)
+        else:
+            # Zatrzymuje sprawdzanie do czasu zlecenia nowego zadania.
+            self._polling = False
+
+    # Zamyka pulę wątków, anulując zadania, które jeszcze się nie rozpoczęły.
+    def shutdown(self):
+        # Zamyka pulę bez czekania na zakończenie trwających pobrań.
+        self.executor.shutdown(wait = False, cancel_futures = True)
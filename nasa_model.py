@@ -0,0 +1,56 @@
+# Definiuje klasę NasaItem - jeden element wyników z polami używanymi przez interfejsy.
+# __slots__ usuwa słownik atrybutów z każdej instancji, a element nie trzyma referencji do drzewa JSON odpowiedzi.
+class NasaItem:
+    __slots__ = ("nasa_id", "title", "href", "manifest_url")
+
+    # Inicjalizuje element z identyfikatorem, tytułem, adresem miniatury i adresem manifestu.
+    def __init__(self, nasa_id, title, href, manifest_url):
+        self.nasa_id = nasa_id
+        self.title = title
+        self.href = href
+        self.manifest_url = manifest_url
+
+    # Tworzy element z elementu wyników API, odczytując tylko pierwsze dane i pierwszy link (pozostałe poddrzewa są pomijane).
+    @classmethod
+    def from_api(cls, item):
+        data = item.get("data")
+        data = data[0] if data else {}
+        links = item.get("links")
+        link = links[0] if links else {}
+        return cls(data.get("nasa_id"), data.get("title"), link.get("href"), item.get("href"))
+
+    # Zwraca tekstową reprezentację elementu (do logów i debugowania).
+    def __repr__(self):
+        return f"NasaItem({self.nasa_id!r}, {self.title!r})"
+
+
+# Definiuje klasę SearchPage - sparsowaną stronę wyników: elementy, łączną liczbę wyników i adres kolejnej strony.
+class SearchPage:
+    __slots__ = ("items", "total_hits", "next_url")
+
+    # Inicjalizuje stronę z elementami (lista lub generator), liczbą wyników i adresem kolejnej strony.
+    def __init__(self, items, total_hits, next_url):
+        self.items = items
+        self.total_hits = total_hits
+        self.next_url = next_url
+
+
+# Zwraca generator elementów NasaItem dla listy elementów API (każdy jest parsowany dopiero przy pobraniu).
+def iter_parsed(items):
+    for item in items:
+        yield NasaItem.from_api(item)
+
+
+# Parsuje odpowiedź wyszukiwania API w jednym przejściu.
+# Jeśli lazy jest True, elementy są zwracane jako generator parsujący je przy iteracji (np. gdy potrzeba tylko kilku pierwszych).
+def parse_response(data, lazy = False):
+    collection = data.get("collection", {})
+    items = collection.get("items", [])
+    # Odczytuje adres kolejnej strony z linków kolekcji.
+    next_url = None
+    for link in collection.get("links", []):
+        if link.get("rel") == "next" and link.get("href"):
+            next_url = link["href"]
+            break
+    total_hits = collection.get("metadata", {}).get("total_hits", len(items))
+    return SearchPage(iter_parsed(items) if lazy else [NasaItem.from_api(item) for item in items], total_hits, next_url)
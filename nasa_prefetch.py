@@ -0,0 +1,163 @@
+# Importuje heapq do kolejki priorytetowej zadań pobierania z wyprzedzeniem.
+import heapq
+# Importuje itertools do numerowania zadań (kolejność zadań o tym samym priorytecie).
+import itertools
+# Importuje moduł threading, którego zdarzenia (Event) przerywają pobieranie po wstrzymaniu.
+import threading
+# Importuje wyjątek zgłaszany po anulowaniu pobierania.
+from nasa_http import RequestCancelled
+# Importuje loader, który wykonuje zadania w tle i wywołuje callbacki w wątku Tkinter.
+from nasa_loader import ImageLoader
+
+# Priorytet elementów wskazanych kursorem (pobierane najpierw).
+HOVER_PRIORITY = 0
+# Priorytet elementów widocznych w siatce.
+VISIBLE_PRIORITY = 1
+
+
+# Definiuje klasę PreviewPrefetcher, która w wolnym czasie pobiera z wyprzedzeniem podglądy elementów siatki.
+# Pracuje na jednym wątku, tylko gdy nie trwają żadne operacje pierwszoplanowe (pause/resume), i kończy po wyczerpaniu budżetu bajtów.
+# Wszystkie metody publiczne wywołuje się w wątku Tkinter.
+class PreviewPrefetcher:
+    # Inicjalizuje prefetcher z widgetem Tkinter, funkcją ładującą load(zadanie, cancel_event, progress) wykonywaną w tle,
+    # funkcją on_loaded(klucz, wynik) wywoływaną w wątku Tkinter, budżetem pobranych bajtów i opóźnieniem startu w ms.
+    def __init__(self, widget, load, on_loaded, max_bytes = 16 * 1024 * 1024, idle_delay = 500):
+        # Przypisuje widget, funkcje i parametry.
+        self.widget = widget
+        self.load = load
+        self.on_loaded = on_loaded
+        self.max_bytes = max_bytes
+        self.idle_delay = idle_delay
+        # Tworzy loader z jednym wątkiem (pobieranie z wyprzedzeniem nie konkuruje o pasmo z samym sobą).
+        self.loader = ImageLoader(widget, max_workers = 1)
+        # Kolejka priorytetowa: (priorytet, numer, klucz, zadanie) oraz aktualny priorytet każdego klucza w kolejce.
+        self.heap = []
+        self.priorities = {}
+        self.counter = itertools.count()
+        # Klucze już pobrane (lub zakończone błędem) w bieżącej generacji.
+        self.done = set()
+        # Powody wstrzymania (np. "grid", okno podglądu); praca trwa tylko, gdy zbiór jest pusty.
+        self.busy = set()
+        # Bieżące zadanie: (klucz, zadanie, priorytet, cancel_event) lub None.
+        self.current = None
+        # Liczba bajtów pobranych w bieżącej generacji.
+        self.bytes_used = 0
+        # Numer generacji (zwiększany przez reset, aby odrzucić wyniki poprzedniego wyszukiwania).
+        self.generation = 0
+        # Flaga informująca, czy uruchomienie kolejnego zadania jest już zaplanowane.
+        self._scheduled = False
+
+    # Dodaje zadanie do kolejki lub podnosi priorytet zadania, które już w niej jest.
+    def request(self, key, task, priority = VISIBLE_PRIORITY):
+        # Pomija klucze pobrane lub właśnie pobierane.
+        if key in self.done or (self.current is not None and self.current[0] == key):
+            return
+        # Pomija zadania, które są już w kolejce z takim samym lub wyższym priorytetem.
+        if self.priorities.get(key, priority + 1) <= priority:
+            return
+        # Dodaje wpis (poprzedni wpis tego klucza zostanie pominięty przy pobraniu z kolejki).
+        self.priorities[key] = priority
+        heapq.heappush(self.heap, (priority, next(self.counter), key, task))
+        self._schedule()
+
+    # Zastępuje zbiór widocznych elementów (słownik klucz -> zadanie); elementy wskazane kursorem zostają w kolejce.
+    def set_visible(self, tasks):
+        # Usuwa z kolejki nieaktualne wpisy i widoczne wcześniej elementy, które wyszły poza ekran.
+        self.heap = [
+            entry for entry in self.heap
+            if self.priorities.get(entry[2]) == entry[0] and (entry[0] == HOVER_PRIORITY or entry[2] in tasks)
+        ]
+        heapq.heapify(self.heap)
+        self.priorities = {key: priority for priority, _, key, _ in self.heap}
+        # Dodaje nowe elementy w kolejności ich występowania w siatce.
+        for key, task in tasks.items():
+            self.request(key, task, VISIBLE_PRIORITY)
+
+    # Wstrzymuje pobieranie z podanego powodu i przerywa bieżące zadanie (wróci do kolejki).
+    def pause(self, reason):
+        self.busy.add(reason)
+        if self.current is not None:
+            self.current[3].set()
+
+    # Usuwa powód wstrzymania i, jeśli nie ma innych, planuje wznowienie pracy.
+    def resume(self, reason):
+        self.busy.discard(reason)
+        self._schedule()
+
+    # Czyści kolejkę, budżet i przerywa bieżące zadanie (np. przy nowym wyszukiwaniu).
+    def reset(self):
+        self.generation += 1
+        self.heap.clear()
+        self.priorities.clear()
+        self.done.clear()
+        self.bytes_used = 0
+        if self.current is not None:
+            self.current[3].set()
+            self.current = None
+
+    # Planuje uruchomienie kolejnego zadania po chwili bezczynności.
+    def _schedule(self):
+        if not self._scheduled and not self.busy and self.heap:
+            self._scheduled = True
+            self.widget.after(self.idle_delay, self._pump)
+
+    # Uruchamia kolejne zadanie z kolejki, jeśli nic go nie wstrzymuje.
+    def _pump(self):
+        self._scheduled = False
+        # Nie uruchamia zadania w trakcie operacji pierwszoplanowych, gdy inne trwa lub po wyczerpaniu budżetu.
+        if self.busy or self.current is not None or self.bytes_used >= self.max_bytes:
+            return
+        # Pobiera z kolejki pierwszy aktualny wpis (pomija wpisy z nieaktualnym priorytetem).
+        while self.heap:
+            priority, _, key, task = heapq.heappop(self.heap)
+            if self.priorities.get(key) == priority:
+                del self.priorities[key]
+                break
+        else:
+            return
+        # Uruchamia zadanie w tle.
+        cancel_event = threading.Event()
+        self.current = (key, task, priority, cancel_event)
+        generation = self.generation
+        self.loader.run_in_background(
+            self._run, (task, cancel_event),
+            on_done = lambda result: self._on_done(generation, key, result),
+            on_error = lambda e: self._on_error(generation, key, task, priority, e)
+        )
+
+    # Wykonuje zadanie w wątku roboczym i zwraca (wynik, liczba pobranych bajtów).
+    def _run(self, task, cancel_event):
+        received = [0]
+
+        # Zapamiętuje liczbę odebranych bajtów.
+        def progress(count, total):
+            received[0] = count
+
+        result = self.load(task, cancel_event, progress)
+        return result, received[0]
+
+    # Obsługuje wynik zadania w wątku Tkinter.
+    def _on_done(self, generation, key, result):
+        # Odrzuca wynik poprzedniej generacji.
+        if generation != self.generation:
+            return
+        self.current = None
+        value, received = result
+        # Dolicza pobrane bajty do budżetu (odczyt z cache na dysku nie zużywa budżetu).
+        self.bytes_used += received
+        self.done.add(key)
+        self.on_loaded(key, value)
+        self._schedule()
+
+    # Obsługuje błąd zadania w wątku Tkinter.
+    def _on_error(self, generation, key, task, priority, exception):
+        if generation != self.generation:
+            return
+        self.current = None
+        if isinstance(exception, RequestCancelled):
+            # Zadanie przerwane przez wstrzymanie wraca do kolejki.
+            self.request(key, task, priority)
+        else:
+            # Błędy nie są ponawiane (podgląd zostanie pobrany przy otwarciu okna).
+            self.done.add(key)
+        self._schedule()
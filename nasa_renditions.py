@@ -0,0 +1,155 @@
+# Importuje moduł os do budowy ścieżki katalogu cache manifestów.
+import os
+# Importuje moduł threading do blokady chroniącej słownik trwających pobrań.
+import threading
+# Importuje pulę wątków, która pobiera manifesty wielu elementów równolegle.
+from concurrent.futures import ThreadPoolExecutor
+# Importuje urlsplit, aby odczytać nazwę pliku z adresu URL.
+from urllib.parse import urlsplit
+# Importuje bibliotekę requests, aby rozpoznawać błędy żądań HTTP.
+import requests
+# Importuje domyślny katalog cache.
+from nasa_cache import DEFAULT_CACHE_DIR
+# Importuje funkcję zwracającą współdzielonego klienta HTTP z pulą połączeń.
+from nasa_http import get_http_client
+# Importuje dwupoziomowy cache (pamięć i dysk), używany tu do przechowywania manifestów.
+from nasa_search import SearchCache
+
+# Wersje obrazów w API NASA od najmniejszej z nominalną długością dłuższego boku w pikselach (None - oryginał, bez limitu).
+RENDITIONS = (("thumb", 320), ("small", 640), ("medium", 1280), ("large", 1920), ("orig", None))
+# Rozszerzenia plików obrazów branych pod uwagę w manifeście (manifest zawiera też np. metadata.json).
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".tif", ".tiff")
+
+
+# Zwraca nazwę wersji z adresu pliku (np. ".../PIA123~medium.jpg" -> "medium") lub None.
+def rendition_name(url):
+    # Odczytuje nazwę pliku bez rozszerzenia.
+    filename = urlsplit(url).path.rsplit("/", 1)[-1]
+    stem, _, extension = filename.rpartition(".")
+    if "~" not in stem or "." + extension.lower() not in IMAGE_EXTENSIONS:
+        return None
+    return stem.rpartition("~")[2].lower()
+
+
+# Wybiera z listy adresów najmniejszą wersję, która pokrywa rozmiar wyświetlania (lub największą dostępną).
+# Rozmiar None oznacza oryginał (pełną rozdzielczość).
+def select_rendition(urls, size):
+    # Buduje słownik: nazwa wersji -> adres (pierwszy adres danej wersji).
+    available = {}
+    for url in urls:
+        name = rendition_name(url)
+        if name is not None:
+            available.setdefault(name, url)
+    # Przeszukuje wersje od najmniejszej.
+    largest = None
+    for name, edge in RENDITIONS:
+        if name not in available:
+            continue
+        largest = available[name]
+        # Zwraca pierwszą wersję, której dłuższy bok mieści dłuższy bok obszaru wyświetlania.
+        if edge is None or (size is not None and edge >= max(size)):
+            return largest
+    return largest
+
+
+# Zwraca adres innej wersji utworzony z adresu miniatury (np. ~thumb.jpg -> ~medium.jpg), gdy manifest jest niedostępny.
+def derive_rendition_url(thumb_url, size):
+    # Wybiera najmniejszą wersję pokrywającą rozmiar wyświetlania.
+    name = next((name for name, edge in RENDITIONS if edge is None or (size is not None and edge >= max(size))), "orig")
+    # Zamienia oznaczenie wersji w nazwie pliku.
+    return thumb_url.replace("~thumb.", f"~{name}.")
+
+
+# Definiuje klasę RenditionResolver, która wybiera wersję obrazu na podstawie manifestu elementu (collection.json).
+# Manifesty są pobierane równolegle dla całych stron wyników, współdzielone przez równoczesne zapytania
+# i zapisywane w cache (pamięć i dysk) według nasa_id.
+class RenditionResolver:
+    # Inicjalizuje resolver z cache manifestów, klientem HTTP i liczbą równoległych pobrań.
+    def __init__(self, cache = None, http = None, max_workers = 8):
+        # Przypisuje cache manifestów (manifesty się nie zmieniają, więc wiek wpisów nie jest sprawdzany).
+        self.cache = cache if cache is not None else SearchCache(
+            max_entries = 2048, directory = os.path.join(DEFAULT_CACHE_DIR, "manifests")
+        )
+        # Przypisuje klienta HTTP (domyślnie współdzielony).
+        self.http = http if http is not None else get_http_client()
+        # Tworzy pulę wątków pobierających manifesty.
+        self.executor = ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "nasa-manifest")
+        # Trwające pobrania: nasa_id -> Future.
+        self.in_flight = {}
+        # Blokada chroniąca słownik trwających pobrań.
+        self.lock = threading.Lock()
+
+    # Zwraca listę adresów z manifestu zapisanego w cache lub None (memory_only - tylko z pamięci, bez odczytu z dysku).
+    def cached_manifest(self, nasa_id, memory_only = False):
+        cached = self.cache.get(nasa_id, memory_only = memory_only)
+        return cached[1] if cached else None
+
+    # Zleca pobranie manifestu, współdzieląc trwające pobranie tego samego elementu; zwraca Future z listą adresów.
+    def fetch_shared(self, nasa_id, manifest_url):
+        with self.lock:
+            future = self.in_flight.get(nasa_id)
+            if future is None:
+                future = self.in_flight[nasa_id] = self.executor.submit(self._fetch, nasa_id, manifest_url)
+                # Usuwa zakończone pobranie ze słownika.
+                future.add_done_callback(lambda f: self._forget(nasa_id))
+        return future
+
+    # Usuwa pobranie ze słownika trwających pobrań.
+    def _forget(self, nasa_id):
+        with self.lock:
+            self.in_flight.pop(nasa_id, None)
+
+    # Odczytuje manifest z cache na dysku lub pobiera go z API i zapisuje w cache.
+    def _fetch(self, nasa_id, manifest_url):
+        urls = self.cached_manifest(nasa_id)
+        if urls is not None:
+            return urls
+        response = self.http.get(manifest_url)
+        response.raise_for_status()
+        urls = response.json()
+        self.cache.put(nasa_id, urls)
+        return urls
+
+    # Zleca pobranie brakujących manifestów dla wielu elementów naraz (np. całej strony wyników) i zwraca listę Future.
+    # Elementy to pary (nasa_id, adres manifestu); elementy bez manifestu są pomijane. Wywołujący wątek (np. Tkinter)
+    # sprawdza tylko pamięć - odczyt z dysku i pobranie wykonuje pula resolvera.
+    def prefetch(self, entries):
+        return [
+            self.fetch_shared(nasa_id, manifest_url)
+            for nasa_id, manifest_url in entries
+            if nasa_id and manifest_url and self.cached_manifest(nasa_id, memory_only = True) is None
+        ]
+
+    # Zwraca adres najmniejszej wersji obrazu pokrywającej rozmiar wyświetlania (size None - oryginał).
+    # Jeśli fetch jest False, używa tylko manifestu z pamięci (bez odczytu z dysku i sieci, więc można go wywołać
+    # w wątku Tkinter); bez manifestu zwraca fallback_url.
+    def resolve(self, nasa_id, manifest_url, fallback_url, size, fetch = True):
+        if nasa_id and manifest_url:
+            urls = self.cached_manifest(nasa_id, memory_only = not fetch)
+            # Pobiera manifest (lub czeka na trwające pobranie), jeśli go brak.
+            if urls is None and fetch:
+                try:
+                    urls = self.fetch_shared(nasa_id, manifest_url).result()
+                except (requests.RequestException, ValueError):
+                    # Błąd manifestu nie blokuje wyświetlania - zostaje adres zapasowy.
+                    urls = None
+            if urls:
+                url = select_rendition(urls, size)
+                if url is not None:
+                    return url
+        return fallback_url
+
+
+# Przechowuje jedyną instancję resolvera (Singleton).
+_rendition_resolver = None
+# Blokada chroniąca tworzenie instancji.
+_rendition_resolver_lock = threading.Lock()
+
+
+# Zwraca współdzieloną instancję RenditionResolver.
+def get_rendition_resolver():
+    global _rendition_resolver
+    with _rendition_resolver_lock:
+        if _rendition_resolver is None:
+            _rendition_resolver = RenditionResolver()
+        return _rendition_resolver
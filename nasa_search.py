@@ -0,0 +1,301 @@
+# Importuje hashlib do wyznaczania nazw plików cache na podstawie klucza zapytania.
+import hashlib
+# Importuje moduł json do zapisu odpowiedzi API na dysku.
+import json
+# Importuje moduł os do operacji na plikach i zmiennych środowiskowych.
+import os
+# Importuje moduł sqlite3, aby rozpoznawać błędy lokalnego indeksu.
+import sqlite3
+# Importuje moduł sys do wypisywania błędów odświeżania w tle na stderr.
+import sys
+# Importuje moduł tempfile do atomowego zapisu plików cache.
+import tempfile
+# Importuje moduł threading do blokad i odświeżania wpisów w tle.
+import threading
+# Importuje moduł time do mierzenia wieku wpisów.
+import time
+# Importuje OrderedDict do ograniczenia liczby wpisów w pamięci (LRU).
+from collections import OrderedDict
+# Importuje pulę wątków, która pobiera kolejną stronę wyników w tle, oraz Future do współdzielenia trwających zapytań.
+from concurrent.futures import Future, ThreadPoolExecutor
+# Importuje urlencode do budowania znormalizowanego klucza zapytania.
+from urllib.parse import urlencode
+# Importuje bibliotekę requests, aby rozpoznawać błędy żądań HTTP.
+import requests
+# Importuje domyślny katalog cache współdzielony z cache obrazów.
+from nasa_cache import DEFAULT_CACHE_DIR
+# Importuje funkcję zwracającą współdzielonego klienta HTTP z pulą połączeń.
+from nasa_http import get_http_client
+# Importuje funkcję zwracającą współdzielony lokalny indeks metadanych.
+from nasa_index import get_metadata_index
+
+# Adres API NASA Images, który można nadpisać zmienną środowiskową NASA_API_URL.
+API_URL = os.environ.get("NASA_API_URL", "https://images-api.nasa.gov").rstrip("/")
+# Adres endpointu wyszukiwania.
+SEARCH_URL = API_URL + "/search"
+
+
+# Normalizuje parametry zapytania, aby identyczne wyszukiwania miały ten sam klucz cache.
+def normalize_params(params):
+    # Tworzy słownik na znormalizowane parametry.
+    normalized = {}
+    for name, value in params.items():
+        # Pomija puste wartości.
+        if value is None or value == "":
+            continue
+        # Zamienia nazwę na małe litery, a wartość na tekst bez nadmiarowych spacji.
+        name = name.strip().lower()
+        value = " ".join(str(value).split())
+        # Tekst zapytania jest nieczuły na wielkość liter, więc sprowadza go do małych liter.
+        normalized[name] = value.lower() if name == "q" else value
+    # Zwraca parametry posortowane po nazwie.
+    return dict(sorted(normalized.items()))
+
+
+# Definiuje klasę SearchCache - dwupoziomowy cache (pamięć i dysk) wyników wyszukiwania z TTL.
+class SearchCache:
+    # Inicjalizuje cache z czasem ważności ttl, oknem stale-while-revalidate i limitem wpisów w pamięci.
+    def __init__(self, ttl = 15 * 60, stale_ttl = 24 * 60 * 60, max_entries = 256,
+                 directory = os.path.join(DEFAULT_CACHE_DIR, "search")):
+        # Czas (w sekundach), przez który wpis jest świeży.
+        self.ttl = ttl
+        # Dodatkowy czas, przez który nieświeży wpis może być zwrócony przy odświeżaniu w tle.
+        self.stale_ttl = stale_ttl
+        # Maksymalna liczba wpisów w pamięci.
+        self.max_entries = max_entries
+        # Katalog cache na dysku (None wyłącza poziom dyskowy).
+        self.directory = directory
+        # Wpisy w pamięci: klucz -> (czas zapisu, dane).
+        self.memory = OrderedDict()
+        # Blokada chroniąca słownik wpisów w pamięci.
+        self.lock = threading.Lock()
+        # Tworzy katalog cache na dysku, jeśli jest włączony.
+        if self.directory:
+            os.makedirs(self.directory, exist_ok = True)
+
+    # Zwraca ścieżkę pliku dla klucza zapytania.
+    def _path(self, key):
+        # Nazwa pliku to skrót SHA-256 klucza.
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    # Zwraca krotkę (czas zapisu, dane) dla klucza lub None, jeśli brak wpisu.
+    def get(self, key, memory_only = False):
+        with self.lock:
+            # Sprawdza najpierw poziom pamięci.
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+        # Sprawdza poziom dyskowy, jeśli jest włączony (memory_only - bez odczytu z dysku, np. w wątku Tkinter).
+        if memory_only or not self.directory:
+            return None
+        try:
+            with open(self._path(key), encoding = "utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            # Brak pliku lub uszkodzony plik traktuje jak brak wpisu.
+            return None
+        # Przenosi wpis z dysku do pamięci.
+        stored = (entry["stored_at"], entry["data"])
+        self._remember(key, stored)
+        return stored
+
+    # Zapisuje dane dla klucza w pamięci i na dysku.
+    def put(self, key, data):
+        # Tworzy wpis z bieżącym czasem.
+        stored = (time.time(), data)
+        self._remember(key, stored)
+        # Zapisuje wpis na dysku, jeśli poziom dyskowy jest włączony.
+        if self.directory:
+            fd, tmp_path = tempfile.mkstemp(dir = self.directory, prefix = ".tmp-")
+            try:
+                with os.fdopen(fd, "w", encoding = "utf-8") as file:
+                    json.dump({"stored_at": stored[0], "key": key, "data": data}, file)
+                # Atomowo podmienia plik docelowy.
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                # Błąd zapisu na dysku nie przerywa wyszukiwania - wpis zostaje w pamięci.
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    # Dodaje wpis do pamięci, usuwając najdawniej używane ponad limit.
+    def _remember(self, key, stored):
+        with self.lock:
+            self.memory[key] = stored
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last = False)
+
+
+# Definiuje klasę NasaSearchClient - wspólną warstwę wyszukiwania dla wszystkich interfejsów.
+class NasaSearchClient:
+    # Inicjalizuje klienta z adresem wyszukiwania, cache wyników, klientem HTTP i lokalnym indeksem metadanych.
+    def __init__(self, search_url = SEARCH_URL, cache = None, http = None, index = None):
+        # Przypisuje adres endpointu wyszukiwania.
+        self.search_url = search_url
+        # Przypisuje klienta HTTP (domyślnie współdzielony, z pulą połączeń i ponowieniami).
+        self.http = http if http is not None else get_http_client()
+        # Przypisuje cache wyników (domyślnie dwupoziomowy SearchCache).
+        self.cache = cache if cache is not None else SearchCache()
+        # Przypisuje indeks metadanych uzupełniany każdą pobraną stroną wyników (domyślnie współdzielony).
+        self.index = index if index is not None else get_metadata_index()
+        # Zbiór kluczy, które są właśnie odświeżane w tle.
+        self.refreshing = set()
+        # Trwające zapytania do API: klucz -> Future (identyczne równoległe zapytania czekają na ten sam wynik).
+        self.in_flight = {}
+        # Blokada chroniąca zbiór odświeżanych kluczy.
+        self.lock = threading.Lock()
+
+    # Wykonuje zapytanie do API bez użycia cache.
+    def fetch(self, params):
+        # Pobiera stronę wyników dla adresu wyszukiwania i parametrów.
+        return self.fetch_page(self.search_url, params)
+
+    # Pobiera stronę wyników spod podanego adresu (np. linku "next" z poprzedniej strony).
+    def fetch_page(self, url, params = None):
+        # Wykonuje żądanie GET do API NASA przez współdzieloną sesję.
+        response = self.http.get(url, params = params)
+        # Zgłasza wyjątek, jeśli żądanie zwróci błąd HTTP.
+        response.raise_for_status()
+        # Parsuje odpowiedź z JSON.
+        data = response.json()
+        # Dodaje elementy strony do lokalnego indeksu (błąd bazy nie przerywa wyszukiwania).
+        try:
+            self.index.add_response(data)
+        except sqlite3.Error:
+            pass
+        return data
+
+    # Zwraca adres kolejnej strony wyników z odpowiedzi API lub None, jeśli to ostatnia strona.
+    @staticmethod
+    def next_page_url(data):
+        # Przegląda linki kolekcji w poszukiwaniu relacji "next".
+        for link in data.get("collection", {}).get("links", []):
+            if link.get("rel") == "next" and link.get("href"):
+                return link["href"]
+        return None
+
+    # Generator zwracający kolejno wszystkie elementy wyników, strona po stronie.
+    def iter_items(self, query, max_pages = None, **params):
+        # Pobiera pierwszą stronę (przez cache, tak jak zwykłe wyszukiwanie).
+        data = self.search(query, **params)
+        # Tworzy jednowątkową pulę, która pobiera następną stronę, gdy bieżąca jest przetwarzana.
+        executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "nasa-search-prefetch")
+        pages = 1
+        try:
+            while True:
+                # Zleca pobranie kolejnej strony, zanim zaczną być zwracane elementy bieżącej.
+                next_url = self.next_page_url(data)
+                has_next = next_url and (max_pages is None or pages < max_pages)
+                next_page = executor.submit(self.fetch_page, next_url) if has_next else None
+                # Zwraca elementy bieżącej strony po jednym.
+                items = data.get("collection", {}).get("items", [])
+                # Zwalnia odpowiedź, aby w pamięci była najwyżej bieżąca i następna strona.
+                data = None
+                yield from items
+                # Kończy, jeśli nie ma kolejnej strony.
+                if next_page is None:
+                    return
+                # Czeka na pobraną w tle stronę i przechodzi do niej.
+                data = next_page.result()
+                pages += 1
+        finally:
+            # Zamyka pulę także wtedy, gdy wywołujący przerwał iterację.
+            executor.shutdown(wait = False, cancel_futures = True)
+
+    # Wyszukuje w lokalnym indeksie metadanych (bez sieci) i zwraca odpowiedź w formacie API.
+    # Jeśli remote_fallback jest True, a indeks nie zawiera pasujących elementów, wykonuje zwykłe wyszukiwanie w API.
+    def search_local(self, query, limit = 100, remote_fallback = False, **params):
+        data = self.index.search_response(query, limit)
+        if not data["collection"]["items"] and remote_fallback:
+            return self.search(query, **params)
+        return data
+
+    # Wyszukuje obrazy; zwraca wynik z cache, jeśli jest dostępny.
+    def search(self, query, **params):
+        # Łączy zapytanie z dodatkowymi parametrami i normalizuje je.
+        params = normalize_params({"q": query, **params})
+        # Buduje klucz cache ze znormalizowanych parametrów.
+        key = urlencode(params)
+        # Sprawdza, czy wynik jest w cache.
+        cached = self.cache.get(key)
+        if cached is not None:
+            stored_at, data = cached
+            # Oblicza wiek wpisu.
+            age = time.time() - stored_at
+            # Zwraca świeży wpis bez odpytywania API.
+            if age < self.cache.ttl:
+                return data
+            # Zwraca nieświeży wpis i odświeża go w tle (stale-while-revalidate).
+            if age < self.cache.ttl + self.cache.stale_ttl:
+                self._refresh_in_background(key, params)
+                return data
+        # Pobiera wynik z API (lub dołącza do identycznego trwającego zapytania).
+        return self.fetch_shared(key, params)
+
+    # Pobiera wynik z API i zapisuje go w cache; równoległe wywołania z tym samym kluczem wykonują jedno zapytanie.
+    def fetch_shared(self, key, params):
+        with self.lock:
+            # Sprawdza, czy identyczne zapytanie jest już w toku.
+            future = self.in_flight.get(key)
+            owner = future is None
+            # Rejestruje nowe zapytanie, jeśli żadne nie trwa.
+            if owner:
+                future = Future()
+                self.in_flight[key] = future
+        # Czeka na wynik zapytania wykonywanego przez inny wątek.
+        if not owner:
+            return future.result()
+        try:
+            # Wykonuje zapytanie i zapisuje wynik w cache.
+            data = self.fetch(params)
+            self.cache.put(key, data)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            # Przekazuje błąd także wątkom czekającym na to zapytanie.
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+    # Uruchamia odświeżenie wpisu w wątku w tle (co najwyżej jedno na klucz).
+    def _refresh_in_background(self, key, params):
+        with self.lock:
+            # Pomija odświeżenie, jeśli to samo zapytanie jest już odświeżane.
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        # Definiuje funkcję wykonywaną w wątku w tle.
+        def refresh():
+            try:
+                self.fetch_shared(key, params)
+            except requests.exceptions.RequestException:
+                # Błąd sieci zostawia w cache poprzedni wpis (kolejne wyszukiwanie spróbuje ponownie).
+                pass
+            except Exception as e:
+                # Inny błąd (np. niepoprawny JSON lub błąd zapisu cache) także zostawia poprzedni wpis, ale jest zgłaszany.
+                print(f"Błąd odświeżania wyników '{key}': {e!r}", file = sys.stderr)
+            finally:
+                # Zawsze zwalnia klucz, aby kolejne wyszukiwanie mogło ponownie odświeżyć wpis.
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        # Uruchamia wątek odświeżający.
+        threading.Thread(target = refresh, name = "nasa-search-refresh", daemon = True).start()
+
+
+# Przechowuje jedyną instancję klienta wyszukiwania (Singleton).
+_search_client = None
+# Blokada chroniąca tworzenie instancji.
+_search_client_lock = threading.Lock()
+
+
+# Zwraca współdzieloną instancję NasaSearchClient, tworząc ją przy pierwszym użyciu.
+def get_search_client():
+    global _search_client
+    with _search_client_lock:
+        if _search_client is None:
+            _search_client = NasaSearchClient()
+        return _search_client
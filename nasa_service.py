@@ -0,0 +1,240 @@
+# Usługa HTTP (Django ASGI) udostępniająca wyszukiwanie i miniatury z tych samych cache co aplikacja Tk.
+# Wymaga pakietów Django i uvicorn (requierments.txt). Uruchamiana jest serwerem ASGI w jednym procesie, aby cache,
+# pula połączeń i łączenie zadań były współdzielone, np.:
+#     NASA_SERVICE_SECRET_KEY=... NASA_SERVICE_HOSTS=api.example.org uvicorn nasa_service:application --host 0.0.0.0 --port 8000
+# (lub: python nasa_service.py 0.0.0.0:8000; zamiast uvicorn można użyć np. daphne nasa_service:application).
+# Importuje moduł argparse do obsługi adresu nasłuchiwania.
+import argparse
+# Importuje moduł asyncio do oczekiwania na zadania wykonywane w puli wątków.
+import asyncio
+# Importuje moduł os do odczytu ustawień ze zmiennych środowiskowych.
+import os
+# Importuje moduł secrets do wygenerowania klucza Django, jeśli nie podano go w środowisku.
+import secrets
+# Importuje moduł sqlite3, aby rozpoznawać błędy indeksu metadanych.
+import sqlite3
+# Importuje moduł threading do blokady chroniącej słownik trwających zadań.
+import threading
+# Importuje pulę wątków, w której wykonywane są blokujące operacje (HTTP, dekodowanie, SQLite).
+from concurrent.futures import ThreadPoolExecutor
+# Importuje urlencode do budowania klucza zapytania.
+from urllib.parse import urlencode
+# Importuje bibliotekę requests, aby rozpoznawać błędy żądań do API NASA.
+import requests
+# Importuje Image (wyjątek zbyt dużego obrazu) i wyjątek PIL zgłaszany dla odpowiedzi, które nie są obrazem.
+from PIL import Image, UnidentifiedImageError
+# Importuje konfigurację Django (usługa jest jednym modułem, bez osobnego projektu).
+from django.conf import settings
+
+# Konfiguruje Django, jeśli moduł nie jest uruchamiany w ramach istniejącego projektu.
+if not settings.configured:
+    settings.configure(
+        DEBUG = os.environ.get("NASA_SERVICE_DEBUG") == "1",
+        # Usługa nie używa sesji ani podpisów, ale Django wymaga klucza - bez NASA_SERVICE_SECRET_KEY każdy proces losuje własny.
+        SECRET_KEY = os.environ.get("NASA_SERVICE_SECRET_KEY") or secrets.token_urlsafe(50),
+        # Domyślnie przyjmuje tylko żądania do lokalnego hosta (inne adresy trzeba podać w NASA_SERVICE_HOSTS).
+        ALLOWED_HOSTS = os.environ.get("NASA_SERVICE_HOSTS", "localhost,127.0.0.1,[::1]").split(","),
+        ROOT_URLCONF = __name__,
+        INSTALLED_APPS = [],
+        MIDDLEWARE = [],
+        USE_TZ = True,
+    )
+
+# Importuje Django dopiero po konfiguracji.
+import django
+django.setup()
+from django.core.asgi import get_asgi_application
+from django.http import HttpResponse, JsonResponse
+from django.urls import path
+# Importuje funkcję kodującą obraz, jeśli cache nie zwróci gotowych bajtów.
+from nasa_cache import encode_image, get_image_cache
+# Importuje funkcję zwracającą współdzielonego klienta HTTP (stan wspólnego limitera zapytań).
+from nasa_http import get_http_client
+# Importuje współdzielony indeks metadanych (elementy znalezione przez dowolnego klienta).
+from nasa_index import get_metadata_index
+# Importuje funkcję pobierającą i skalującą obraz.
+from nasa_loader import load_scaled_image
+# Importuje współdzielony resolver wersji obrazów.
+from nasa_renditions import derive_rendition_url, get_rendition_resolver
+# Importuje normalizację parametrów i współdzielonego klienta wyszukiwania (cache wyników i pula połączeń).
+from nasa_search import get_search_client, normalize_params
+
+# Parametry zapytania przekazywane do API NASA.
+SEARCH_PARAMS = ("media_type", "page", "center", "year_start", "year_end", "keywords")
+# Parametry liczbowe sprawdzane przed przekazaniem do API.
+NUMERIC_PARAMS = ("page", "year_start", "year_end")
+# Błędy zamieniane na odpowiedź JSON: requests i dysk (podklasy OSError), indeks SQLite i zbyt duże obrazy.
+SERVICE_ERRORS = (OSError, sqlite3.Error, Image.DecompressionBombError)
+# Rozmiary obrazów zwracanych przez endpoint miniatur: nazwa -> (rozmiar, nazwa cache) - te same cache co w aplikacji Tk.
+THUMBNAIL_SIZES = {"thumb": ((200, 200), "thumbs"), "preview": ((1000, 800), "previews")}
+
+
+# Definiuje klasę AsyncCoalescer, która wykonuje blokujące funkcje w puli wątków i łączy równoczesne identyczne zadania.
+# Żądania z tym samym kluczem czekają na jedno wykonanie, więc N klientów pytających naraz o to samo kosztuje jedno zapytanie do API.
+class AsyncCoalescer:
+    # Inicjalizuje koordynator z pulą wątków.
+    def __init__(self, executor):
+        self.executor = executor
+        # Trwające zadania: klucz -> concurrent.futures.Future (bezpieczne dla wielu pętli zdarzeń).
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        # Liczba wykonanych zadań i liczba żądań dołączonych do trwającego zadania.
+        self.stats = {"executed": 0, "coalesced": 0}
+
+    # Wykonuje func(*args) w puli wątków lub dołącza do trwającego zadania z tym samym kluczem i zwraca wynik.
+    async def run(self, key, func, *args):
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is None:
+                self.stats["executed"] += 1
+                future = self.in_flight[key] = self.executor.submit(func, *args)
+                # Usuwa zakończone zadanie, aby kolejne żądanie skorzystało już z cache.
+                future.add_done_callback(lambda f: self._forget(key, f))
+            else:
+                self.stats["coalesced"] += 1
+        # Rozłączenie jednego klienta nie anuluje zadania, na które czekają inni.
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    # Usuwa zadanie ze słownika trwających zadań.
+    def _forget(self, key, future):
+        with self.lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+
+# Tworzy pulę wątków usługi (rozmiar odpowiada rozmiarowi puli połączeń klienta HTTP).
+executor = ThreadPoolExecutor(max_workers = int(os.environ.get("NASA_SERVICE_WORKERS", 16)), thread_name_prefix = "nasa-service")
+# Tworzy koordynator zadań współdzielony przez wszystkie żądania.
+coalescer = AsyncCoalescer(executor)
+
+
+# Wykonuje wyszukiwanie (w lokalnym indeksie lub przez cache klienta wyszukiwania) - wywoływane w puli wątków.
+def search_sync(query, local, params):
+    client = get_search_client()
+    if local:
+        return client.search_local(query, remote_fallback = True, **params)
+    return client.search(query, **params)
+
+
+# Zwraca zakodowany obraz elementu w danym rozmiarze (z cache na dysku lub pobrany i przeskalowany) - wywoływane w puli wątków.
+def thumbnail_sync(item, size_name):
+    size, cache_name = THUMBNAIL_SIZES[size_name]
+    cache = get_image_cache(cache_name)
+    # Wybiera najmniejszą wersję pokrywającą rozmiar (manifest jest współdzielony i zapisywany w cache).
+    url = get_rendition_resolver().resolve(
+        item.nasa_id, item.manifest_url, derive_rendition_url(item.href, size), size
+    )
+    # Zwraca gotowe bajty z cache bez dekodowania.
+    cached = cache.get(url)
+    if cached is not None:
+        return cached
+    image = load_scaled_image(url, size, cache, "service.thumbnail")
+    return cache.get(url) or encode_image(image)
+
+
+# Zamienia błąd żądania do API NASA, dekodowania obrazu, indeksu metadanych lub cache na dysku na odpowiedź JSON usługi.
+def upstream_error(exception):
+    if isinstance(exception, requests.HTTPError) and exception.response is not None:
+        return JsonResponse({"error": f"API NASA zwróciło kod {exception.response.status_code}"}, status = 502)
+    if isinstance(exception, requests.Timeout):
+        return JsonResponse({"error": "Przekroczono czas oczekiwania na API NASA"}, status = 504)
+    if isinstance(exception, requests.RequestException):
+        return JsonResponse({"error": f"Błąd połączenia z API NASA: {exception}"}, status = 502)
+    # Obraz zwrócony przez API nie daje się zdekodować.
+    if isinstance(exception, UnidentifiedImageError):
+        return JsonResponse({"error": "API NASA zwróciło nieprawidłowy obraz"}, status = 502)
+    # Obraz zwrócony przez API przekracza limit pikseli dekodera.
+    if isinstance(exception, Image.DecompressionBombError):
+        return JsonResponse({"error": f"API NASA zwróciło zbyt duży obraz: {exception}"}, status = 502)
+    # Indeks metadanych jest niedostępny (np. zablokowana lub uszkodzona baza).
+    if isinstance(exception, sqlite3.Error):
+        return JsonResponse({"error": f"Indeks metadanych jest niedostępny: {exception}"}, status = 503)
+    # Pozostałe błędy OSError pochodzą z dekodowania obrazu lub z cache na dysku.
+    return JsonResponse({"error": f"Błąd odczytu danych: {exception}"}, status = 502)
+
+
+# Obsługuje GET /search?q=...: zwraca odpowiedź w formacie API NASA (local=1 - wyszukiwanie w lokalnym indeksie).
+async def search_view(request):
+    query = request.GET.get("q", "").strip()
+    if not query:
+        return JsonResponse({"error": "Brak parametru q"}, status = 400)
+    params = {name: request.GET[name] for name in SEARCH_PARAMS if request.GET.get(name)}
+    # Sprawdza parametry liczbowe (numer strony zaczyna się od 1).
+    for name in NUMERIC_PARAMS:
+        if name in params:
+            try:
+                value = int(params[name])
+            except ValueError:
+                value = None
+            if value is None or (name == "page" and value < 1):
+                return JsonResponse({"error": f"Nieprawidłowa wartość parametru {name}: {params[name]}"}, status = 400)
+            params[name] = str(value)
+    local = request.GET.get("local") == "1"
+    # Klucz łączenia to znormalizowane zapytanie (jak klucz cache wyników).
+    key = ("search", local, urlencode(normalize_params({"q": query, **params})))
+    try:
+        data = await coalescer.run(key, search_sync, query, local, params)
+    # Obejmuje błędy requests (podklasy OSError), cache wyników na dysku i lokalnego indeksu.
+    except SERVICE_ERRORS as e:
+        return upstream_error(e)
+    return JsonResponse(data)
+
+
+# Obsługuje GET /thumbnail/<nasa_id>?size=thumb|preview: zwraca przeskalowany obraz elementu znalezionego wcześniej przez /search.
+async def thumbnail_view(request, nasa_id):
+    size_name = request.GET.get("size", "thumb")
+    if size_name not in THUMBNAIL_SIZES:
+        return JsonResponse({"error": f"Nieznany rozmiar: {size_name}"}, status = 400)
+    # Odczytuje adresy elementu z indeksu metadanych (usługa nie pobiera obrazów spod dowolnych adresów).
+    try:
+        item = await asyncio.wrap_future(executor.submit(get_metadata_index().get, nasa_id))
+    except SERVICE_ERRORS as e:
+        return upstream_error(e)
+    if item is None or not item.href:
+        return JsonResponse({"error": f"Nieznany nasa_id: {nasa_id}"}, status = 404)
+    try:
+        data = await coalescer.run(("thumbnail", nasa_id, size_name), thumbnail_sync, item, size_name)
+    # Obejmuje błędy requests (podklasy OSError), dekodowania obrazu, zbyt duże obrazy i zapis cache na dysku.
+    except SERVICE_ERRORS as e:
+        return upstream_error(e)
+    # Rozpoznaje format po nagłówku (cache zapisuje JPEG lub PNG).
+    content_type = "image/jpeg" if data[:2] == b"\xff\xd8" else "image/png"
+    response = HttpResponse(data, content_type = content_type)
+    # Pozwala przeglądarkom i pośrednikom przechowywać obraz (obrazy w API się nie zmieniają).
+    response["Cache-Control"] = "public, max-age=86400"
+    return response
+
+
+# Obsługuje GET /stats: zwraca liczbę wykonanych i połączonych zadań oraz stan limitera zapytań do API.
+async def stats_view(request):
+    with coalescer.lock:
+        stats = dict(coalescer.stats, in_flight = len(coalescer.in_flight))
+    stats["limiter"] = get_http_client().limiter.stats()
+    return JsonResponse(stats)
+
+
+# Definiuje adresy usługi.
+urlpatterns = [
+    path("search", search_view),
+    path("thumbnail/<str:nasa_id>", thumbnail_view),
+    path("stats", stats_view),
+]
+
+# Tworzy aplikację ASGI (np. uvicorn nasa_service:application - jeden proces, aby cache i pula były współdzielone).
+application = get_asgi_application()
+
+
+# Uruchamia usługę serwerem ASGI uvicorn w jednym procesie (np. python nasa_service.py 0.0.0.0:8000).
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Usługa HTTP wyszukiwania i miniatur NASA Images.")
+    parser.add_argument("address", nargs = "?", default = "127.0.0.1:8000", help = "adres nasłuchiwania host:port")
+    args = parser.parse_args(argv)
+    host, _, port = args.address.rpartition(":")
+    # Importuje uvicorn dopiero tutaj (przy uruchamianiu innym serwerem ASGI nie jest potrzebny).
+    import uvicorn
+    uvicorn.run(application, host = host or "127.0.0.1", port = int(port), workers = 1)
+
+
+# Sprawdza, czy skrypt jest uruchamiany bezpośrednio.
+if __name__ == "__main__":
+    main()
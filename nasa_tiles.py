@@ -0,0 +1,284 @@
+# Importuje hashlib do wyznaczania nazw katalogów piramid na podstawie adresu URL.
+import hashlib
+# Importuje moduł json do zapisu i odczytu opisu piramidy.
+import json
+# Importuje moduł math do obliczania liczby poziomów i kafelków.
+import math
+# Importuje moduł os do operacji na plikach i katalogach.
+import os
+# Importuje moduł shutil do usuwania całych katalogów piramid.
+import shutil
+# Importuje moduł tempfile do tymczasowego zapisu pobieranego oryginału.
+import tempfile
+# Importuje moduł threading, aby jedna piramida nie była budowana równocześnie przez kilka wątków.
+import threading
+# Importuje Counter do zliczania okien korzystających z poszczególnych piramid.
+from collections import Counter
+# Importuje Image z biblioteki PIL do dekodowania i cięcia obrazów oraz dekoder JPEG do odczytu nagłówka bez limitu PIL.
+from PIL import Image, JpegImagePlugin
+# Importuje domyślny katalog cache.
+from nasa_cache import DEFAULT_CACHE_DIR
+# Importuje wyjątek anulowania i funkcję zwracającą współdzielonego klienta HTTP.
+from nasa_http import RequestCancelled, get_http_client
+# Importuje funkcję zwracającą współdzielony licznik czasu etapów.
+from nasa_timing import get_stage_timer
+
+# Rozmiar boku kafelka w pikselach.
+TILE_SIZE = 256
+# Liczba poziomów, które dekoder JPEG potrafi zdekodować bezpośrednio w zmniejszonej skali (1/2, 1/4, 1/8).
+DRAFT_LEVELS = 3
+# Nazwa pliku z opisem gotowej piramidy (zapisywany na końcu budowy).
+META_FILE = "meta.json"
+# Największa liczba pikseli poziomu dekodowanego naraz w pamięci (ok. 192 MB dla RGB).
+MAX_LEVEL_PIXELS = 64 * 1024 * 1024
+# Największy obsługiwany oryginał: JPEG, którego poziom 1/8 mieści się w MAX_LEVEL_PIXELS (ok. 4 gigapiksele).
+# Zastępuje dla JPEG limit Image.MAX_IMAGE_PIXELS (ok. 179 MP), który odrzucałby właśnie obrazy, dla których powstała piramida.
+MAX_SOURCE_PIXELS = MAX_LEVEL_PIXELS * 4 ** DRAFT_LEVELS
+
+
+# Otwiera oryginał (tylko nagłówek); większy obraz niż MAX_SOURCE_PIXELS zgłasza DecompressionBombError.
+# JPEG jest otwierany bezpośrednio dekoderem JPEG, który nie sprawdza globalnego limitu PIL (limit pozostaje w mocy dla
+# wszystkich innych wywołań Image.open); pozostałe formaty muszą zmieścić się w poziomie 0, więc obowiązuje je limit PIL.
+def open_source(path):
+    with open(path, "rb") as file:
+        is_jpeg = file.read(3) == b"\xff\xd8\xff"
+    image = JpegImagePlugin.JpegImageFile(path) if is_jpeg else Image.open(path)
+    if image.width * image.height > MAX_SOURCE_PIXELS:
+        image.close()
+        raise Image.DecompressionBombError(
+            f"Obraz {image.width}x{image.height} przekracza limit {MAX_SOURCE_PIXELS} pikseli piramidy kafelków"
+        )
+    return image
+
+
+# Usuwa z cache zdekodowanych kafelków (OrderedDict w kolejności ostatniego użycia) najdawniej używane ponad limit;
+# kafelki z kolekcji keep (np. wyświetlane w oknie) są zachowywane nawet ponad limit.
+def trim_tiles(tiles, max_tiles, keep = ()):
+    for key in list(tiles):
+        if len(tiles) <= max_tiles:
+            break
+        if key not in keep:
+            del tiles[key]
+
+
+# Definiuje klasę TilePyramid - piramidę kafelków jednego obrazu zapisaną na dysku.
+# Poziom 0 to największa rozdzielczość mieszcząca się w MAX_LEVEL_PIXELS (zwykle pełna), każdy kolejny ma o połowę mniejsze wymiary;
+# kafelki to pliki <poziom>/<kolumna>_<wiersz>.jpg.
+class TilePyramid:
+    # Inicjalizuje piramidę w podanym katalogu (jeśli jest już zbudowana, wczytuje jej opis).
+    def __init__(self, directory, tile_size = TILE_SIZE):
+        # Przypisuje katalog i rozmiar kafelka.
+        self.directory = directory
+        self.tile_size = tile_size
+        # Wymiary poziomów jako lista (szerokość, wysokość); pusta, dopóki piramida nie jest zbudowana.
+        self.levels = []
+        # Wymiary oryginału (mogą być większe niż poziom 0).
+        self.size = None
+        # Wczytuje opis piramidy, jeśli istnieje.
+        self._load_meta()
+
+    # Wczytuje opis piramidy z dysku.
+    def _load_meta(self):
+        try:
+            with open(os.path.join(self.directory, META_FILE), encoding = "utf-8") as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return
+        # Przyjmuje opis tylko dla zgodnego rozmiaru kafelka.
+        if meta.get("tile_size") == self.tile_size:
+            self.levels = [tuple(size) for size in meta["levels"]]
+            self.size = (meta["width"], meta["height"])
+
+    # Informuje, czy piramida jest gotowa do wyświetlania.
+    @property
+    def ready(self):
+        return bool(self.levels)
+
+    # Zwraca liczbę kolumn i wierszy kafelków na poziomie.
+    def tile_grid(self, level):
+        width, height = self.levels[level]
+        return math.ceil(width / self.tile_size), math.ceil(height / self.tile_size)
+
+    # Zwraca ścieżkę pliku kafelka.
+    def tile_path(self, level, col, row, directory = None):
+        return os.path.join(directory or self.directory, str(level), f"{col}_{row}.jpg")
+
+    # Wczytuje i dekoduje jeden kafelek (bezpieczne poza wątkiem Tkinter).
+    def load_tile(self, level, col, row):
+        with get_stage_timer().stage("tiles.load"):
+            image = Image.open(self.tile_path(level, col, row))
+            image.load()
+        return image
+
+    # Buduje piramidę z pliku źródłowego: najpierw w katalogu tymczasowym, który na końcu atomowo zastępuje docelowy.
+    # W pamięci jest naraz tylko jeden poziom, nie większy niż MAX_LEVEL_PIXELS; poziomy 1-3 obrazów JPEG są dekodowane
+    # bezpośrednio w zmniejszonej skali, więc oryginał większy niż budżet nigdy nie jest dekodowany w pełnej rozdzielczości
+    # (piramida zaczyna się wtedy od pierwszego poziomu mieszczącego się w budżecie).
+    def build(self, source_path, cancel_event = None):
+        # Odczytuje wymiary i format obrazu (bez dekodowania pikseli).
+        with open_source(source_path) as image:
+            width, height = image.size
+            is_jpeg = image.format == "JPEG"
+        # Wyznacza liczbę poziomów: ostatni mieści się w jednym kafelku.
+        count = max(1, math.ceil(math.log2(max(width, height) / self.tile_size)) + 1)
+        levels = [(max(1, math.ceil(width / 2 ** level)), max(1, math.ceil(height / 2 ** level))) for level in range(count)]
+        # Wybiera pierwszy poziom, który mieści się w budżecie pamięci (dla innych formatów niż JPEG tylko pełna rozdzielczość).
+        first = next(level for level, (w, h) in enumerate(levels) if w * h <= MAX_LEVEL_PIXELS or level == len(levels) - 1)
+        if first > (DRAFT_LEVELS if is_jpeg else 0):
+            raise Image.DecompressionBombError(
+                f"Obraz {width}x{height} ({image.format}) jest zbyt duży, aby zdekodować go w budżecie {MAX_LEVEL_PIXELS} pikseli"
+            )
+        # Pomija poziomy większe niż budżet (piramida zaczyna się od pierwszego zdekodowanego poziomu).
+        levels = levels[first:]
+        # Przygotowuje pusty katalog tymczasowy.
+        building = self.directory + ".part"
+        shutil.rmtree(building, ignore_errors = True)
+        current = None
+        try:
+            for level, size in enumerate(levels):
+                with get_stage_timer().stage("tiles.decode_level"):
+                    if current is None or (is_jpeg and first + level <= DRAFT_LEVELS):
+                        # Zwalnia poprzedni poziom przed dekodowaniem kolejnego.
+                        current = None
+                        # Dekoduje oryginał (dla JPEG w skali 1/2^poziom bezpośrednio w dekoderze).
+                        current = open_source(source_path)
+                        current.draft(None, size)
+                        current.load()
+                    # Doprowadza obraz do dokładnych wymiarów poziomu (po draft lub przez pomniejszenie poprzedniego poziomu).
+                    if current.size != size:
+                        current = current.resize(size, Image.Resampling.LANCZOS, reducing_gap = 2.0)
+                    # Konwertuje tryby nieobsługiwane przez JPEG do RGB.
+                    if current.mode not in ("RGB", "L"):
+                        current = current.convert("RGB")
+                # Tnie poziom na kafelki i zapisuje je na dysku.
+                self._write_tiles(current, level, building, cancel_event)
+            # Zapisuje opis piramidy jako ostatni plik (jego obecność oznacza kompletną piramidę).
+            with open(os.path.join(building, META_FILE), "w", encoding = "utf-8") as file:
+                json.dump({"width": width, "height": height, "tile_size": self.tile_size, "levels": levels}, file)
+            # Zastępuje katalog docelowy gotową piramidą.
+            shutil.rmtree(self.directory, ignore_errors = True)
+            os.replace(building, self.directory)
+        except BaseException:
+            # Sprząta niekompletną piramidę (np. po anulowaniu).
+            shutil.rmtree(building, ignore_errors = True)
+            raise
+        # Wczytuje opis gotowej piramidy.
+        self._load_meta()
+
+    # Tnie obraz poziomu na kafelki i zapisuje je w katalogu piramidy.
+    def _write_tiles(self, image, level, directory, cancel_event):
+        os.makedirs(os.path.join(directory, str(level)), exist_ok = True)
+        columns = math.ceil(image.width / self.tile_size)
+        rows = math.ceil(image.height / self.tile_size)
+        with get_stage_timer().stage("tiles.write_level"):
+            for row in range(rows):
+                # Przerywa budowę, jeśli przeglądarka została zamknięta.
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RequestCancelled(self.directory)
+                for col in range(columns):
+                    # Wycina kafelek (ostatnia kolumna i wiersz mogą być mniejsze).
+                    box = (col * self.tile_size, row * self.tile_size,
+                           min(image.width, (col + 1) * self.tile_size), min(image.height, (row + 1) * self.tile_size))
+                    image.crop(box).save(self.tile_path(level, col, row, directory), format = "JPEG", quality = 85)
+
+
+# Definiuje klasę TileCache - katalog piramid kafelków z budżetem rozmiaru i usuwaniem najdawniej używanych piramid.
+class TileCache:
+    # Inicjalizuje cache w podanym katalogu z budżetem max_bytes.
+    def __init__(self, root = os.path.join(DEFAULT_CACHE_DIR, "tiles"), max_bytes = 1024 * 1024 * 1024, tile_size = TILE_SIZE):
+        # Przypisuje katalog, budżet i rozmiar kafelka.
+        self.root = root
+        self.max_bytes = max_bytes
+        self.tile_size = tile_size
+        # Blokady budowy dla poszczególnych piramid: klucz -> Lock.
+        self.build_locks = {}
+        # Blokada chroniąca słownik blokad, licznik otwartych piramid i usuwanie piramid.
+        self.lock = threading.Lock()
+        # Liczba okien korzystających z piramidy: katalog -> licznik (takie piramidy nie są usuwane).
+        self.held = Counter()
+        # Tworzy katalog, jeśli jeszcze nie istnieje.
+        os.makedirs(self.root, exist_ok = True)
+
+    # Zwraca piramidę dla adresu URL (gotową lub pustą, jeśli nie została jeszcze zbudowana).
+    def pyramid(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        pyramid = TilePyramid(os.path.join(self.root, key), self.tile_size)
+        # Aktualizuje czas modyfikacji, aby kolejność LRU uwzględniała ostatnie otwarcie.
+        if pyramid.ready:
+            os.utime(pyramid.directory)
+        return pyramid
+
+    # Zwraca gotową piramidę, w razie potrzeby pobierając oryginał na dysk i budując ją (wykonywane poza wątkiem Tkinter).
+    # Zwrócona piramida jest zajęta (nie zostanie usunięta), dopóki wywołujący nie zwolni jej metodą release.
+    def build(self, url, cancel_event = None):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        # Pobiera blokadę tej piramidy, aby dwa okna nie budowały jej równocześnie.
+        with self.lock:
+            build_lock = self.build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            pyramid = self.pyramid(url)
+            if pyramid.ready:
+                self.hold(pyramid)
+                return pyramid
+            # Pobiera oryginał strumieniowo do pliku tymczasowego (bez trzymania go w pamięci).
+            fd, source_path = tempfile.mkstemp(dir = self.root, prefix = ".download-")
+            try:
+                with get_stage_timer().stage("tiles.download"):
+                    with os.fdopen(fd, "wb") as file:
+                        get_http_client().download(url, file, cancel_event = cancel_event)
+                pyramid.build(source_path, cancel_event)
+            finally:
+                os.remove(source_path)
+            # Zajmuje piramidę, zanim budowa innej piramidy mogłaby ją usunąć.
+            self.hold(pyramid)
+        # Usuwa najdawniej używane piramidy ponad budżet.
+        self._evict()
+        return pyramid
+
+    # Oznacza piramidę jako używaną przez okno (nie zostanie usunięta do wywołania release).
+    def hold(self, pyramid):
+        with self.lock:
+            self.held[pyramid.directory] += 1
+
+    # Zwalnia piramidę zajętą przez build lub hold.
+    def release(self, pyramid):
+        with self.lock:
+            self.held[pyramid.directory] -= 1
+            if self.held[pyramid.directory] <= 0:
+                del self.held[pyramid.directory]
+
+    # Usuwa najdawniej używane piramidy, dopóki łączny rozmiar przekracza budżet (zajęte piramidy nigdy nie są usuwane).
+    def _evict(self):
+        with self.lock:
+            # Zbiera (czas modyfikacji, katalog, rozmiar) dla wszystkich piramid.
+            entries = []
+            for entry in os.scandir(self.root):
+                # Pomija pliki tymczasowe i katalogi budowanych piramid.
+                if not entry.is_dir() or entry.name.endswith(".part"):
+                    continue
+                size = sum(file.stat().st_size for level in os.scandir(entry.path) if level.is_dir()
+                           for file in os.scandir(level.path))
+                entries.append((entry.stat().st_mtime, entry.path, size))
+            total = sum(size for _, _, size in entries)
+            # Usuwa piramidy od najdawniej używanej.
+            for _, path, size in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path not in self.held:
+                    shutil.rmtree(path, ignore_errors = True)
+                    total -= size
+
+
+# Przechowuje jedyną instancję cache piramid (Singleton).
+_tile_cache = None
+# Blokada chroniąca tworzenie instancji.
+_tile_cache_lock = threading.Lock()
+
+
+# Zwraca współdzieloną instancję TileCache.
+def get_tile_cache():
+    global _tile_cache
+    with _tile_cache_lock:
+        if _tile_cache is None:
+            _tile_cache = TileCache()
+        return _tile_cache
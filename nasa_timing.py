@@ -0,0 +1,142 @@
+# Importuje moduł csv do eksportu statystyk w formacie CSV.
+import csv
+# Importuje moduł json do eksportu statystyk w formacie JSON.
+import json
+# Importuje moduł os do odczytu zmiennej środowiskowej włączającej pomiary.
+import os
+# Importuje moduł threading, aby pomiary z wielu wątków nie nadpisywały się nawzajem.
+import threading
+# Importuje moduł time do precyzyjnego pomiaru czasu.
+import time
+# Importuje bisect do szybkiego wyboru przedziału histogramu.
+from bisect import bisect_left
+# Importuje contextmanager do budowy kontekstu pomiaru oraz nullcontext, zwracany, gdy pomiary są wyłączone.
+from contextlib import contextmanager, nullcontext
+
+# Górne granice przedziałów histogramu w milisekundach (ostatni przedział jest otwarty).
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+# Wspólny pusty kontekst zwracany przy wyłączonych pomiarach (bez alokacji przy każdym wywołaniu).
+_NULL_STAGE = nullcontext()
+
+
+# Definiuje klasę LatencyHistogram - histogram czasów jednego etapu.
+class LatencyHistogram:
+    # Inicjalizuje pusty histogram.
+    def __init__(self):
+        # Liczniki dla każdego przedziału (plus przedział ponad ostatnią granicą).
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        # Liczba pomiarów, suma, minimum i maksimum (w milisekundach).
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    # Dodaje pomiar w milisekundach.
+    def record(self, ms):
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+
+    # Zwraca przybliżony percentyl (górną granicę przedziału, w którym leży).
+    def percentile(self, fraction):
+        if not self.count:
+            return None
+        # Wyznacza numer szukanego pomiaru.
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                # Dla ostatniego (otwartego) przedziału zwraca maksimum.
+                return BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    # Zwraca podsumowanie histogramu jako słownik.
+    def summary(self):
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "min_ms": round(self.min_ms, 2) if self.min_ms is not None else None,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 2) if self.max_ms is not None else None,
+        }
+
+
+# Definiuje klasę StageTimer, która zbiera czasy nazwanych etapów w histogramach.
+class StageTimer:
+    # Inicjalizuje licznik; domyślnie włączony przez zmienną środowiskową NASA_TIMING=1.
+    def __init__(self, enabled = os.environ.get("NASA_TIMING") == "1"):
+        # Flaga włączenia pomiarów.
+        self.enabled = enabled
+        # Histogramy: nazwa etapu -> LatencyHistogram.
+        self.histograms = {}
+        # Blokada chroniąca histogramy przed równoczesnym zapisem.
+        self.lock = threading.Lock()
+
+    # Zwraca kontekst mierzący czas etapu (lub pusty kontekst, gdy pomiary są wyłączone).
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._measure(name)
+
+    # Mierzy czas bloku kodu i zapisuje go w histogramie etapu.
+    @contextmanager
+    def _measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    # Zapisuje zmierzony czas (w milisekundach) dla etapu.
+    def record(self, name, ms):
+        with self.lock:
+            if name not in self.histograms:
+                self.histograms[name] = LatencyHistogram()
+            self.histograms[name].record(ms)
+
+    # Usuwa wszystkie zebrane pomiary.
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+
+    # Zwraca podsumowanie wszystkich etapów posortowane po nazwie.
+    def summary(self):
+        with self.lock:
+            return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    # Zwraca podsumowanie jako listę czytelnych linii tekstu.
+    def summary_lines(self):
+        lines = []
+        for name, stats in self.summary().items():
+            lines.append(
+                f"{name}: n={stats['count']} śr={stats['avg_ms']} ms p50≤{stats['p50_ms']} ms "
+                f"p95≤{stats['p95_ms']} ms max={stats['max_ms']} ms"
+            )
+        return lines
+
+    # Eksportuje podsumowanie do pliku JSON lub CSV (w zależności od rozszerzenia).
+    def export(self, path):
+        summary = self.summary()
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline = "", encoding = "utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerow(["stage", "count", "avg_ms", "min_ms", "p50_ms", "p95_ms", "max_ms"])
+                for name, stats in summary.items():
+                    writer.writerow([name, stats["count"], stats["avg_ms"], stats["min_ms"],
+                                     stats["p50_ms"], stats["p95_ms"], stats["max_ms"]])
+        else:
+            with open(path, "w", encoding = "utf-8") as file:
+                json.dump(summary, file, indent = 2, ensure_ascii = False)
+
+
+# Przechowuje jedyną instancję licznika etapów (Singleton).
+_stage_timer = StageTimer()
+
+
+# Zwraca współdzieloną instancję StageTimer.
+def get_stage_timer():
+    return _stage_timer
@@ -0,0 +1,8 @@
+# Testy zachowania modułów nasa_* uruchamiane z katalogu repozytorium (python -m pytest lub python -m unittest discover tests).
+# Importuje moduł os do ustawienia katalogu cache przed importem modułów nasa_*.
+import os
+# Importuje moduł tempfile do utworzenia katalogu cache testów.
+import tempfile
+
+# Kieruje domyślne cache (wyniki, manifesty, skróty) do katalogu tymczasowego, aby testy nie zmieniały cache użytkownika.
+os.environ.setdefault("NASA_CACHE_DIR", tempfile.mkdtemp(prefix = "nasa-tests-"))
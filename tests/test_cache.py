@@ -0,0 +1,51 @@
+# Importuje moduł os do sprawdzania plików cache i ustawiania czasów modyfikacji.
+import os
+# Importuje moduł tempfile do katalogów cache testów.
+import tempfile
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje Image z PIL do kodowania obrazów.
+from PIL import Image
+# Importuje testowane klasy i funkcje.
+from nasa_cache import ImageDiskCache, encode_image
+
+
+# Testuje trwały cache obrazów na dysku z budżetem rozmiaru.
+class ImageDiskCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ImageDiskCache(self.directory, max_bytes = 250)
+        for name in "abc":
+            cache.put(name, name.encode() * 100)
+        # Trzeci wpis przekracza budżet, więc usuwany jest najdawniej użyty a.
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.total_bytes, 200)
+        # Odczyt b czyni go ostatnio użytym, więc kolejny zapis usuwa c.
+        self.assertEqual(cache.get("b"), b"b" * 100)
+        cache.put("d", b"d" * 100)
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted(cache.key_for(name) for name in "bd"))
+
+    def test_single_entry_larger_than_budget_is_kept(self):
+        cache = ImageDiskCache(self.directory, max_bytes = 10)
+        cache.put("a", b"a" * 100)
+        self.assertEqual(cache.get("a"), b"a" * 100)
+
+    def test_index_is_restored_in_lru_order(self):
+        cache = ImageDiskCache(self.directory, max_bytes = 1000)
+        for age, name in enumerate("cba"):
+            cache.put(name, name.encode() * 100)
+            # Ustawia czasy modyfikacji: c jest najstarszy, a - najświeższy.
+            os.utime(cache._path(cache.key_for(name)), (1000 + age, 1000 + age))
+        # Nowa instancja z mniejszym budżetem odtwarza indeks z dysku i usuwa najdawniej używany wpis.
+        restored = ImageDiskCache(self.directory, max_bytes = 250)
+        self.assertEqual(restored.total_bytes, 200)
+        self.assertIsNone(restored.get("c"))
+        self.assertEqual(restored.get("a"), b"a" * 100)
+
+    def test_encode_image_picks_jpeg_or_png(self):
+        self.assertEqual(encode_image(Image.new("RGB", (8, 8)))[:2], b"\xff\xd8")
+        self.assertEqual(encode_image(Image.new("RGBA", (8, 8)))[:4], b"\x89PNG")
+        self.assertEqual(encode_image(Image.new("CMYK", (8, 8)))[:2], b"\xff\xd8")
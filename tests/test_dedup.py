@@ -0,0 +1,77 @@
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje NumPy do budowy obrazów testowych.
+import numpy as np
+# Importuje Image z PIL do tworzenia obrazów.
+from PIL import Image
+# Importuje testowane klasy i funkcje.
+from nasa_dedup import DUPLICATE_DISTANCE, DuplicateFilter, HashCache, dhash, hamming
+# Importuje model elementu wyników.
+from nasa_model import NasaItem
+
+
+# Tworzy obraz z gradientem poziomym i pionowym (opcjonalnie odwróconym i zaszumionym).
+def gradient(size = (200, 150), flip = False, noise = 0, seed = 0):
+    x = np.linspace(0, 255, size[0])[None, :]
+    y = np.linspace(0, 255, size[1])[:, None]
+    pixels = (x * 0.7 + np.sin(y / 20) * 60 + 60)
+    if flip:
+        pixels = pixels[:, ::-1]
+    pixels = pixels + np.random.default_rng(seed).normal(0, noise, pixels.shape) if noise else pixels
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).convert("RGB")
+
+
+# Testuje skróty różnicowe, odległości Hamminga i filtr powtórzeń.
+class DedupTest(unittest.TestCase):
+    def test_dhash_shape_and_similarity(self):
+        hashes = dhash([gradient(), gradient((400, 300), noise = 4), gradient(flip = True)])
+        self.assertEqual(hashes.shape, (3, 8))
+        self.assertEqual(hashes.dtype, np.uint8)
+        distances = hamming(hashes, hashes)
+        self.assertEqual(distances.shape, (3, 3))
+        self.assertTrue((np.diag(distances) == 0).all())
+        # Przeskalowana i zaszumiona kopia jest blisko, odbicie lustrzane - daleko.
+        self.assertLessEqual(distances[0, 1], DUPLICATE_DISTANCE)
+        self.assertGreater(distances[0, 2], DUPLICATE_DISTANCE)
+        self.assertTrue((distances == distances.T).all())
+
+    def test_hamming_counts_bits(self):
+        a = np.array([[0b11110000, 0, 0, 0, 0, 0, 0, 1]], dtype = np.uint8)
+        b = np.zeros((2, 8), dtype = np.uint8)
+        b[1, 7] = 1
+        self.assertEqual(hamming(a, b).tolist(), [[5, 4]])
+
+    def test_filter_uses_known_hashes_and_checks_the_rest_later(self):
+        cache = HashCache(":memory:")
+        first, copy, other, unknown = (NasaItem(f"id{n}", "t", f"http://x/{n}~thumb.jpg", None) for n in range(4))
+        for item, image in ((first, gradient()), (copy, gradient(noise = 3)), (other, gradient(flip = True))):
+            cache.put_many({item.href: dhash([image])[0].tobytes()})
+        dedup = DuplicateFilter(hash_cache = cache)
+        # Powtórzony nasa_id i zdjęcie o znanym, bliskim skrócie są odrzucane od razu; element bez skrótu czeka na miniaturę.
+        repeated = NasaItem("id0", "t", "http://x/other.jpg", None)
+        self.assertEqual(dedup.filter([first, copy, repeated, other, unknown]), [first, other, unknown])
+        self.assertEqual(dedup.removed, 2)
+        self.assertEqual(dedup.unhashed, {unknown.href})
+        # Skrót wczytanej miniatury rozstrzyga o elemencie przyjętym warunkowo (i trafia do cache).
+        self.assertEqual(dedup.add(unknown, dedup.hash_image(unknown.href, gradient((320, 240)))), [unknown])
+        self.assertEqual(dedup.removed, 3)
+        self.assertIn(unknown.href, cache.get_many([unknown.href]))
+        # Elementy sprawdzone przy filtrowaniu nie są sprawdzane ponownie.
+        self.assertEqual(dedup.add(first, dedup.hash_image(first.href, gradient())), [])
+
+    def test_thumbnails_loaded_in_reverse_order_keep_the_higher_ranked_item(self):
+        dedup = DuplicateFilter(hash_cache = HashCache(":memory:"))
+        first, other, copy = (NasaItem(f"id{n}", "t", f"http://x/{n}~thumb.jpg", None) for n in range(3))
+        # Żaden skrót nie jest znany, więc wszystkie elementy są przyjęte warunkowo.
+        self.assertEqual(dedup.filter([first, other, copy]), [first, other, copy])
+        # Miniatury wczytują się od końca: kopia jest najpierw przyjęta, a po wczytaniu oryginału usuwana zamiast niego.
+        self.assertEqual(dedup.add(copy, dedup.hash_image(copy.href, gradient(noise = 3))), [])
+        self.assertEqual(dedup.add(other, dedup.hash_image(other.href, gradient(flip = True))), [])
+        self.assertEqual(dedup.add(first, dedup.hash_image(first.href, gradient())), [copy])
+        self.assertEqual(dedup.accepted_items, [other, first])
+        self.assertEqual(dedup.removed, 1)
+        # Kolejna strona z kopią oryginału jest filtrowana względem przyjętego oryginału.
+        late = NasaItem("id3", "t", "http://x/3~thumb.jpg", None)
+        dedup.hash_image(late.href, gradient((400, 300), noise = 2))
+        self.assertEqual(dedup.filter([late]), [])
+        self.assertEqual(dedup.removed, 2)
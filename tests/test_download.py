@@ -0,0 +1,56 @@
+# Importuje moduł os do odczytu pobranych plików.
+import os
+# Importuje moduł random, aby zerwania połączeń były powtarzalne.
+import random
+# Importuje moduł tempfile do katalogów docelowych.
+import tempfile
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje testowane klasy i funkcje.
+from nasa_download import BulkDownloader, parse_content_range
+# Importuje sztuczne API NASA.
+from nasa_fake_server import FakeNasaConfig, FakeNasaServer
+# Importuje klienta HTTP (osobny dla testu).
+from nasa_http import NasaHttpClient
+# Importuje resolver wersji i cache manifestów.
+from nasa_renditions import RenditionResolver
+from nasa_search import SearchCache
+
+
+# Testuje pobieranie obrazów ze wznawianiem przerwanych transferów żądaniem Range.
+class BulkDownloaderTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(1)
+        self.server = FakeNasaServer(config = FakeNasaConfig(total_hits = 8, page_size = 8, cut_rate = 0.5)).start()
+        self.addCleanup(self.server.stop)
+        self.http = NasaHttpClient()
+        self.addCleanup(self.http.close)
+        self.items = self.http.get(self.server.url + "/search?q=moon").json()["collection"]["items"]
+        resolver = RenditionResolver(cache = SearchCache(directory = None), http = self.http)
+        self.directory = tempfile.mkdtemp()
+        self.downloader = BulkDownloader(self.directory, workers = 2, size = (640, 480), resolver = resolver,
+                                         http = self.http, chunk_size = 4096, attempts = 5)
+
+    def test_cut_transfers_are_resumed_to_identical_files(self):
+        summary = self.downloader.run(self.items)
+        self.assertEqual(summary["files"], len(self.items))
+        self.assertEqual(summary["errors"], 0)
+        self.assertGreater(summary["resumed"], 0)
+        # Każdy plik jest identyczny z obrazem serwera, a pliki .part zostały usunięte.
+        for item in self.items:
+            nasa_id = item["data"][0]["nasa_id"]
+            with open(os.path.join(self.directory, f"{nasa_id}~small.jpg"), "rb") as file:
+                self.assertEqual(file.read(), self.server.image(nasa_id, f"{nasa_id}~small.jpg"))
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith(".part")])
+
+    def test_existing_files_are_skipped(self):
+        self.downloader.run(self.items)
+        summary = self.downloader.run(self.items)
+        self.assertEqual(summary["files"], 0)
+        self.assertEqual(summary["existing"], len(self.items))
+
+    def test_parse_content_range(self):
+        self.assertEqual(parse_content_range("bytes 100-199/1000"), (100, 1000))
+        self.assertEqual(parse_content_range("bytes */1000"), (None, 1000))
+        self.assertEqual(parse_content_range("bytes 0-9/*"), (0, None))
+        self.assertEqual(parse_content_range(None), (None, None))
@@ -0,0 +1,32 @@
+# Importuje moduł json do zapisu nagranych odpowiedzi.
+import json
+# Importuje moduł os do budowy ścieżek plików nagrań.
+import os
+# Importuje moduł tempfile do katalogu nagrań.
+import tempfile
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje testowane klasy.
+from nasa_fake_server import FakeNasaConfig, FakeNasaServer
+
+
+# Testuje odtwarzanie nagranych odpowiedzi sztucznego API.
+class RecordedPageTest(unittest.TestCase):
+    def setUp(self):
+        parent = tempfile.mkdtemp()
+        self.recordings = os.path.join(parent, "recordings")
+        os.makedirs(self.recordings)
+        # Zapisuje nagrania w katalogu nagrań oraz plik poza nim, którego serwer nie może udostępnić.
+        for directory, name, value in ((self.recordings, "apollo_11", 1), (self.recordings, "apollo_11_p2", 2), (parent, "secret", 3)):
+            with open(os.path.join(directory, f"{name}.json"), "w", encoding = "utf-8") as file:
+                json.dump({"value": value}, file)
+        self.server = FakeNasaServer(config = FakeNasaConfig(recordings = self.recordings))
+
+    def test_recordings_are_found_by_query_and_page(self):
+        self.assertEqual(self.server.recorded_page("Apollo  11", 1), {"value": 1})
+        self.assertEqual(self.server.recorded_page("apollo 11", 2), {"value": 2})
+        self.assertIsNone(self.server.recorded_page("apollo 11", 3))
+
+    def test_query_cannot_escape_recordings_directory(self):
+        for query in ("../secret", "..\\secret", "/../secret", os.path.join(os.path.dirname(self.recordings), "secret")):
+            self.assertIsNone(self.server.recorded_page(query, 1), query)
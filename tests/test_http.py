@@ -0,0 +1,32 @@
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje mock do podmiany współdzielonej instancji na czas testu.
+from unittest import mock
+# Importuje testowany moduł.
+import nasa_http
+
+
+# Testuje współdzieloną instancję klienta HTTP.
+class GetHttpClientTest(unittest.TestCase):
+    def setUp(self):
+        # Każdy test zaczyna bez współdzielonego klienta; poprzednia instancja jest przywracana po teście.
+        for name in ("_http_client", "_http_client_settings"):
+            patcher = mock.patch.object(nasa_http, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_settings_are_used_only_by_first_call(self):
+        client = nasa_http.get_http_client(read_timeout = 5, retries = 1)
+        self.addCleanup(client.close)
+        # Te same ustawienia lub brak ustawień zwracają istniejącą instancję.
+        self.assertIs(nasa_http.get_http_client(), client)
+        self.assertIs(nasa_http.get_http_client(retries = 1, read_timeout = 5), client)
+        # Inne ustawienia nie są po cichu pomijane.
+        with self.assertRaises(ValueError):
+            nasa_http.get_http_client(read_timeout = 30)
+
+    def test_settings_after_default_client_are_rejected(self):
+        client = nasa_http.get_http_client()
+        self.addCleanup(client.close)
+        with self.assertRaises(ValueError):
+            nasa_http.get_http_client(pool_maxsize = 4)
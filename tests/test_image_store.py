@@ -0,0 +1,65 @@
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje mock do zastąpienia PhotoImage (wymaga okna Tk) obiektem o tych samych wymiarach.
+from unittest import mock
+# Importuje Image z PIL do tworzenia obrazów.
+from PIL import Image
+# Importuje testowaną klasę.
+from nasa_image_store import PhotoImageStore
+
+
+# Zastępuje ImageTk.PhotoImage w testach bez ekranu (magazyn używa tylko wymiarów obrazu).
+class FakePhoto:
+    def __init__(self, image):
+        self.size = image.size
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+
+# Testuje budżety zdekodowanych obrazów i skompresowanych kopii w magazynie obrazów Tkinter.
+class PhotoImageStoreTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("nasa_image_store.ImageTk.PhotoImage", FakePhoto)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Budżet mieści dwa zdekodowane obrazy 100x100 (po 40 000 bajtów).
+        self.store = PhotoImageStore(max_bytes = 100000)
+        for key in "abc":
+            self.store.put(key, Image.new("RGB", (100, 100), (ord(key), 0, 0)))
+
+    def test_unused_photos_are_released_over_budget(self):
+        for key in "abc":
+            self.store.acquire(key)
+            self.store.release(key)
+        # Najdawniej używany a jest zwolniony, ale jego skompresowana kopia zostaje.
+        self.assertIsNone(self.store.entries["a"].photo)
+        self.assertIn("a", self.store)
+        self.assertEqual(self.store.decoded_bytes, 80000)
+        # Ponowne użycie odtwarza obraz z kopii i zwalnia najdawniej używany b.
+        self.assertEqual(self.store.acquire("a").size, (100, 100))
+        self.assertIsNone(self.store.entries["b"].photo)
+        self.assertEqual(self.store.stats()["decoded"], 2)
+
+    def test_photos_in_use_are_kept_over_budget(self):
+        for key in "abc":
+            self.store.acquire(key)
+        self.assertEqual(self.store.decoded_bytes, 120000)
+        self.assertEqual(self.store.stats()["in_use"], 3)
+        # Po zwolnieniu przez widget obraz może zostać zwolniony.
+        self.store.release("a")
+        self.assertIsNone(self.store.entries["a"].photo)
+        self.assertEqual(self.store.decoded_bytes, 80000)
+
+    def test_compressed_copies_are_evicted_over_budget(self):
+        size = len(self.store.entries["a"].data)
+        self.store.acquire("a")
+        self.store.max_compressed_bytes = 2 * size
+        self.store.put("d", Image.new("RGB", (100, 100), (ord("a"), 0, 0)))
+        # Zostają używany a i najnowszy d; nieużywane b i c są usuwane.
+        self.assertEqual(list(self.store.entries), ["a", "d"])
+        self.assertEqual(self.store.get_image("d").size, (100, 100))
+        self.assertIsNone(self.store.get_image("b"))
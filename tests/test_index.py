@@ -0,0 +1,44 @@
+# Importuje moduł sqlite3, aby sprawdzić, że zapytania użytkownika nie powodują błędów składni FTS.
+import sqlite3
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje sztuczne API NASA (buduje elementy wyników).
+from nasa_fake_server import FakeNasaServer
+# Importuje testowane klasy i funkcje.
+from nasa_index import MetadataIndex, fts_query
+
+
+# Testuje budowę zapytań FTS i wyszukiwanie w lokalnym indeksie metadanych.
+class MetadataIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeNasaServer()
+        self.addCleanup(self.server.server_close)
+        self.index = MetadataIndex(":memory:")
+        self.addCleanup(self.index.close)
+        self.index.add_items([self.server.search_item("apollo moon", index) for index in range(3)])
+        self.index.add_items([self.server.search_item("mars rover", index) for index in range(2)])
+
+    def test_words_are_quoted_and_last_is_prefix(self):
+        self.assertEqual(fts_query("apollo 11"), '"apollo" "11"*')
+        # Cudzysłowy, operatory i znaki specjalne FTS są traktowane jak zwykły tekst.
+        self.assertEqual(fts_query('moon OR "mars" NOT -x*'), '"moon" "OR" "mars" "NOT" "x"*')
+        self.assertEqual(fts_query("AS11-40-5874"), '"AS11" "40" "5874"*')
+        self.assertIsNone(fts_query(' "*-() '))
+
+    def test_operators_in_user_text_do_not_break_search(self):
+        for text in ('moon OR', '"apollo', 'NEAR(', 'title:mars', 'mars AND (', "a'b", "*"):
+            try:
+                self.index.search(text)
+            except sqlite3.OperationalError as e:
+                self.fail(f"{text!r}: {e}")
+
+    def test_prefix_search_while_typing(self):
+        self.assertEqual(len(self.index.search("apol")), 3)
+        self.assertEqual(len(self.index.search("mars rov")), 2)
+        self.assertEqual(self.index.search("rover mars")[0]["data"][0]["nasa_id"], "mars_rover-00000")
+        self.assertEqual(self.index.search("venus"), [])
+
+    def test_items_are_upserted_by_nasa_id(self):
+        self.index.add_items([self.server.search_item("apollo moon", 0)])
+        self.assertEqual(self.index.count(), 5)
+        self.assertEqual(self.index.get("apollo_moon-00001").title, "apollo moon #1")
@@ -0,0 +1,53 @@
+# Importuje moduł time do pomiaru czasu oczekiwania.
+import time
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje pulę wątków do równoległych zapytań.
+from concurrent.futures import ThreadPoolExecutor
+# Importuje sztuczne API NASA.
+from nasa_fake_server import FakeNasaConfig, FakeNasaServer
+# Importuje testowane klasy i funkcje.
+from nasa_http import AdaptiveLimiter, NasaHttpClient, parse_retry_after
+
+
+# Testuje limiter zapytań: zmniejszanie limitu i wstrzymanie po odpowiedziach 429 z Retry-After.
+class AdaptiveLimiterTest(unittest.TestCase):
+    def test_throttle_halves_limit_once_per_wave(self):
+        limiter = AdaptiveLimiter(rate = 1000, initial_limit = 8)
+        started = [limiter.acquire() for _ in range(3)]
+        # Odpowiedzi 429 na zapytania wysłane przed pierwszym zmniejszeniem zmniejszają limit tylko raz.
+        for value in started:
+            limiter.release(value, 429, 0)
+        self.assertEqual(limiter.limit, 4)
+        # Udane odpowiedzi zwiększają limit addytywnie.
+        limiter.release(limiter.acquire(), 200)
+        self.assertAlmostEqual(limiter.limit, 4.25)
+
+    def test_retry_after_blocks_all_requests(self):
+        limiter = AdaptiveLimiter(rate = 1000)
+        limiter.release(limiter.acquire(), 429, 0.3)
+        self.assertGreater(limiter.stats()["blocked_s"], 0)
+        start = time.monotonic()
+        limiter.release(limiter.acquire(), 200)
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("2"), 2.0)
+        self.assertEqual(parse_retry_after("-1"), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        # Data HTTP w przeszłości oznacza brak oczekiwania.
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_client_retries_429_from_server(self):
+        server = FakeNasaServer(config = FakeNasaConfig(total_hits = 1, page_size = 1, rate_limit = 5)).start()
+        self.addCleanup(server.stop)
+        client = NasaHttpClient(limiter = AdaptiveLimiter(rate = 1000, initial_limit = 8))
+        self.addCleanup(client.close)
+        # Dziesięć równoczesnych zapytań przy limicie serwera 5/s: część dostaje 429 i jest ponawiana po Retry-After (1 s).
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers = 10) as executor:
+            statuses = list(executor.map(lambda _: client.get(server.url + "/search?q=moon").status_code, range(10)))
+        self.assertEqual(statuses, [200] * 10)
+        self.assertGreater(server.rejected, 0)
+        self.assertGreaterEqual(time.monotonic() - start, 0.9)
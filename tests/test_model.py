@@ -0,0 +1,49 @@
+# Importuje moduł types do rozpoznania generatora.
+import types
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje sztuczne API NASA (generator elementów w formacie API).
+from nasa_fake_server import FakeNasaServer
+# Importuje testowane klasy i funkcje.
+from nasa_model import NasaItem, parse_response
+
+
+# Testuje parsowanie elementów i stron wyników API.
+class ModelTest(unittest.TestCase):
+    def setUp(self):
+        # Serwer nie jest uruchamiany - używany jest tylko generator elementów.
+        self.server = FakeNasaServer()
+        self.items = [self.server.search_item("moon", index) for index in range(3)]
+
+    def test_item_from_api(self):
+        item = NasaItem.from_api(self.items[1])
+        self.assertEqual(item.nasa_id, "moon-00001")
+        self.assertEqual(item.title, "moon #1")
+        self.assertTrue(item.href.endswith("/moon-00001~thumb.jpg"))
+        self.assertTrue(item.manifest_url.endswith("/moon-00001/collection.json"))
+        # Element nie ma słownika atrybutów (__slots__).
+        self.assertFalse(hasattr(item, "__dict__"))
+        self.assertEqual(repr(item), "NasaItem('moon-00001', 'moon #1')")
+
+    def test_item_with_missing_fields(self):
+        item = NasaItem.from_api({"data": [], "links": []})
+        self.assertEqual((item.nasa_id, item.title, item.href, item.manifest_url), (None, None, None, None))
+
+    def test_parse_response(self):
+        data = {"collection": {
+            "items": self.items,
+            "metadata": {"total_hits": 42},
+            "links": [{"rel": "prev", "href": "http://x/p1"}, {"rel": "next", "href": "http://x/p3"}],
+        }}
+        page = parse_response(data)
+        self.assertEqual([item.nasa_id for item in page.items], ["moon-00000", "moon-00001", "moon-00002"])
+        self.assertEqual((page.total_hits, page.next_url), (42, "http://x/p3"))
+        # Tryb leniwy zwraca generator parsujący elementy przy iteracji.
+        lazy = parse_response(data, lazy = True)
+        self.assertIsInstance(lazy.items, types.GeneratorType)
+        self.assertEqual(next(lazy.items).nasa_id, "moon-00000")
+
+    def test_parse_empty_response(self):
+        page = parse_response({"collection": {"items": self.items[:2]}})
+        self.assertEqual((page.total_hits, page.next_url), (2, None))
+        self.assertEqual(parse_response({}).items, [])
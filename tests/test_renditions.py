@@ -0,0 +1,70 @@
+# Importuje moduł tempfile do katalogu cache manifestów.
+import tempfile
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje mock do klienta HTTP, który nie powinien być używany.
+from unittest import mock
+# Importuje testowane klasy i funkcje.
+from nasa_renditions import RenditionResolver, derive_rendition_url, rendition_name, select_rendition
+# Importuje cache manifestów.
+from nasa_search import SearchCache
+
+# Manifest elementu w kolejności z API (największe wersje najpierw, plus plik metadanych).
+MANIFEST = [
+    "https://images-assets.nasa.gov/image/PIA1/PIA1~orig.jpg",
+    "https://images-assets.nasa.gov/image/PIA1/PIA1~large.jpg",
+    "https://images-assets.nasa.gov/image/PIA1/PIA1~medium.jpg",
+    "https://images-assets.nasa.gov/image/PIA1/PIA1~small.jpg",
+    "https://images-assets.nasa.gov/image/PIA1/PIA1~thumb.jpg",
+    "https://images-assets.nasa.gov/image/PIA1/metadata.json",
+]
+
+
+# Testuje wybór wersji obrazu z manifestu i wyprowadzanie adresu bez manifestu.
+class RenditionTest(unittest.TestCase):
+    def test_rendition_name(self):
+        self.assertEqual(rendition_name(MANIFEST[2]), "medium")
+        self.assertEqual(rendition_name("https://x/a/PIA1~ORIG.TIF?download=1"), "orig")
+        self.assertIsNone(rendition_name(MANIFEST[5]))
+        self.assertIsNone(rendition_name("https://x/a/PIA1.jpg"))
+
+    def test_smallest_rendition_covering_size(self):
+        self.assertTrue(select_rendition(MANIFEST, (200, 200)).endswith("~thumb.jpg"))
+        self.assertTrue(select_rendition(MANIFEST, (640, 480)).endswith("~small.jpg"))
+        self.assertTrue(select_rendition(MANIFEST, (1000, 800)).endswith("~medium.jpg"))
+        self.assertTrue(select_rendition(MANIFEST, (1500, 1000)).endswith("~large.jpg"))
+        self.assertTrue(select_rendition(MANIFEST, (3000, 2000)).endswith("~orig.jpg"))
+        self.assertTrue(select_rendition(MANIFEST, None).endswith("~orig.jpg"))
+
+    def test_missing_renditions_fall_back_to_largest_available(self):
+        partial = [MANIFEST[3], MANIFEST[4]]
+        self.assertTrue(select_rendition(partial, (1000, 800)).endswith("~small.jpg"))
+        self.assertTrue(select_rendition(MANIFEST[2:], (200, 200)).endswith("~thumb.jpg"))
+        self.assertIsNone(select_rendition([MANIFEST[5]], (200, 200)))
+        self.assertIsNone(select_rendition([], None))
+
+    def test_derive_rendition_url(self):
+        thumb = MANIFEST[4]
+        self.assertEqual(derive_rendition_url(thumb, (1000, 800)), MANIFEST[2])
+        self.assertEqual(derive_rendition_url(thumb, None), MANIFEST[0])
+        self.assertEqual(derive_rendition_url(thumb, (100, 100)), thumb)
+
+
+# Testuje, że wątek wywołujący (np. Tkinter) nie odczytuje manifestów z dysku.
+class RenditionResolverTest(unittest.TestCase):
+    def test_disk_manifests_are_read_in_resolver_pool(self):
+        directory = tempfile.mkdtemp()
+        SearchCache(directory = directory).put("PIA1", MANIFEST)
+        # Nowy cache ma manifest tylko na dysku; klient HTTP zgłasza błąd, gdyby resolver sięgnął do sieci.
+        http = mock.Mock()
+        http.get.side_effect = AssertionError("manifest powinien zostać odczytany z dysku")
+        resolver = RenditionResolver(cache = SearchCache(directory = directory), http = http)
+        self.addCleanup(resolver.executor.shutdown)
+        entry = ("PIA1", "https://images-assets.nasa.gov/image/PIA1/collection.json")
+        # Bez pobierania używany jest tylko manifest z pamięci, więc zostaje adres zapasowy.
+        self.assertEqual(resolver.resolve(*entry, MANIFEST[4], (1000, 800), fetch = False), MANIFEST[4])
+        # Prefetch odczytuje manifest z dysku w puli resolvera i przenosi go do pamięci.
+        futures = resolver.prefetch([entry])
+        self.assertEqual([future.result() for future in futures], [MANIFEST])
+        self.assertEqual(resolver.resolve(*entry, MANIFEST[4], (1000, 800), fetch = False), MANIFEST[2])
+        self.assertEqual(resolver.prefetch([entry]), [])
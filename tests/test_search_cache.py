@@ -0,0 +1,72 @@
+# Importuje moduł tempfile do katalogów cache wyników.
+import tempfile
+# Importuje moduł time do sterowania wiekiem wpisów.
+import time
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje sztuczne API NASA.
+from nasa_fake_server import FakeNasaConfig, FakeNasaServer
+# Importuje klienta HTTP (osobny dla testu, bez współdzielonego limitera).
+from nasa_http import NasaHttpClient
+# Importuje indeks metadanych (w pamięci).
+from nasa_index import MetadataIndex
+# Importuje testowane klasy.
+from nasa_search import NasaSearchClient, SearchCache
+
+
+# Czeka, aż warunek będzie spełniony (najwyżej timeout sekund); zwraca wynik warunku.
+def wait_for(condition, timeout = 5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+# Testuje cache wyników wyszukiwania: TTL, stale-while-revalidate i poziom dyskowy.
+class SearchCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeNasaServer(config = FakeNasaConfig(total_hits = 5, page_size = 5)).start()
+        self.addCleanup(self.server.stop)
+        self.directory = tempfile.mkdtemp()
+        self.cache = SearchCache(ttl = 60, stale_ttl = 60, directory = self.directory)
+        self.client = NasaSearchClient(
+            self.server.url + "/search", cache = self.cache, http = NasaHttpClient(), index = MetadataIndex(":memory:")
+        )
+
+    # Przesuwa czas zapisu wpisu o seconds sekund wstecz.
+    def age_entry(self, key, seconds):
+        stored_at, data = self.cache.memory[key]
+        self.cache.memory[key] = (stored_at - seconds, data)
+
+    def test_fresh_entry_is_served_without_request(self):
+        first = self.client.search("Moon", media_type = "image")
+        # Zapytanie różniące się wielkością liter i spacjami ma ten sam klucz.
+        second = self.client.search("  moon ", media_type = "image")
+        self.assertEqual(first, second)
+        self.assertEqual(self.server.admitted, 1)
+
+    def test_stale_entry_is_returned_and_refreshed_in_background(self):
+        stale = self.client.search("moon")
+        self.age_entry("q=moon", 90)
+        # Nieświeży wpis jest zwracany od razu, a odświeżenie trwa w tle.
+        self.assertIs(self.client.search("moon"), stale)
+        self.assertTrue(wait_for(lambda: self.server.admitted == 2 and time.time() - self.cache.get("q=moon")[0] < 60))
+        self.assertTrue(wait_for(lambda: not self.client.refreshing))
+        # Po odświeżeniu wpis jest znowu świeży.
+        self.client.search("moon")
+        self.assertEqual(self.server.admitted, 2)
+
+    def test_expired_entry_is_fetched_synchronously(self):
+        expired = self.client.search("moon")
+        self.age_entry("q=moon", 150)
+        fresh = self.client.search("moon")
+        self.assertIsNot(fresh, expired)
+        self.assertEqual(self.server.admitted, 2)
+        self.assertFalse(self.client.refreshing)
+
+    def test_disk_entry_survives_new_cache(self):
+        data = self.client.search("moon")
+        # Nowa instancja cache (np. po ponownym uruchomieniu) odczytuje wpis z dysku.
+        stored_at, cached = SearchCache(directory = self.directory).get("q=moon")
+        self.assertEqual(cached, data)
+        self.assertLessEqual(stored_at, time.time())
@@ -0,0 +1,48 @@
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje sztuczne API NASA.
+from nasa_fake_server import FakeNasaConfig, FakeNasaServer
+# Importuje klienta HTTP (osobny dla testu, bez współdzielonego limitera).
+from nasa_http import NasaHttpClient
+# Importuje indeks metadanych (w pamięci).
+from nasa_index import MetadataIndex
+# Importuje testowane klasy.
+from nasa_search import NasaSearchClient, SearchCache
+
+
+# Testuje iterację po elementach wyników strona po stronie (z pobieraniem kolejnej strony w tle).
+class IterItemsTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeNasaServer(config = FakeNasaConfig(total_hits = 25, page_size = 10)).start()
+        self.addCleanup(self.server.stop)
+        http = NasaHttpClient()
+        self.addCleanup(http.close)
+        self.client = NasaSearchClient(
+            self.server.url + "/search", cache = SearchCache(directory = None), http = http, index = MetadataIndex(":memory:")
+        )
+
+    # Zwraca identyfikatory elementów w kolejności zwróconej przez iterator.
+    def ids(self, items):
+        return [item["data"][0]["nasa_id"] for item in items]
+
+    def test_all_pages_are_returned_in_order(self):
+        self.assertEqual(self.ids(self.client.iter_items("moon")), [f"moon-{index:05d}" for index in range(25)])
+        self.assertEqual(self.server.admitted, 3)
+        # Pobrane strony trafiają do lokalnego indeksu.
+        self.assertEqual(len(self.client.search_local("moon")["collection"]["items"]), 25)
+
+    def test_max_pages_limits_requests(self):
+        self.assertEqual(self.ids(self.client.iter_items("moon", max_pages = 2)), [f"moon-{index:05d}" for index in range(20)])
+        self.assertEqual(self.server.admitted, 2)
+
+    def test_first_page_comes_from_cache(self):
+        list(self.client.iter_items("moon", max_pages = 1))
+        list(self.client.iter_items("moon", max_pages = 1))
+        self.assertEqual(self.server.admitted, 1)
+
+    def test_stopping_early_does_not_fetch_beyond_the_next_page(self):
+        items = self.client.iter_items("moon")
+        self.assertEqual(self.ids(next(items) for _ in range(3)), ["moon-00000", "moon-00001", "moon-00002"])
+        items.close()
+        # Najwyżej pierwsza strona i strona pobierana z wyprzedzeniem.
+        self.assertLessEqual(self.server.admitted, 2)
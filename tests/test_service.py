@@ -0,0 +1,94 @@
+# Importuje moduł asyncio do wywoływania asynchronicznych widoków.
+import asyncio
+# Importuje moduł importlib.util, aby pominąć testy bez zainstalowanego Django.
+import importlib.util
+# Importuje moduł json do odczytu odpowiedzi.
+import json
+# Importuje moduł sqlite3 do symulowania błędu indeksu.
+import sqlite3
+# Importuje moduł threading do wstrzymania zadania, na które czekają kolejne żądania.
+import threading
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje mock do podmiany indeksu metadanych.
+from unittest import mock
+# Importuje pulę wątków koordynatora zadań.
+from concurrent.futures import ThreadPoolExecutor
+# Importuje bibliotekę requests do tworzenia błędów żądań.
+import requests
+# Importuje Image z biblioteki PIL (wyjątek zbyt dużego obrazu).
+from PIL import Image
+
+# Importuje usługę tylko z zainstalowanym Django (moduł konfiguruje Django przy imporcie).
+HAS_DJANGO = importlib.util.find_spec("django") is not None
+if HAS_DJANGO:
+    import nasa_service
+    from django.test import RequestFactory
+
+
+# Testuje obsługę błędów i walidację parametrów usługi HTTP (wymaga Django).
+@unittest.skipUnless(HAS_DJANGO, "wymaga Django")
+class ServiceErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_upstream_errors_map_to_status_codes(self):
+        self.assertEqual(nasa_service.upstream_error(requests.Timeout()).status_code, 504)
+        self.assertEqual(nasa_service.upstream_error(requests.ConnectionError()).status_code, 502)
+        self.assertEqual(nasa_service.upstream_error(Image.DecompressionBombError("duży")).status_code, 502)
+        self.assertEqual(nasa_service.upstream_error(sqlite3.OperationalError("database is locked")).status_code, 503)
+        self.assertEqual(nasa_service.upstream_error(OSError("dysk")).status_code, 502)
+
+    def test_invalid_numeric_params_are_rejected(self):
+        for query in ("page=abc", "page=0", "year_start=20x0", "year_end=1.5"):
+            response = asyncio.run(nasa_service.search_view(self.factory.get(f"/search?q=moon&{query}")))
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn("error", json.loads(response.content))
+
+    def test_metadata_index_errors_become_json(self):
+        index = mock.Mock()
+        index.get.side_effect = sqlite3.OperationalError("database is locked")
+        with mock.patch.object(nasa_service, "get_metadata_index", return_value = index):
+            response = asyncio.run(nasa_service.thumbnail_view(self.factory.get("/thumbnail/A1"), "A1"))
+        self.assertEqual(response.status_code, 503)
+
+
+# Testuje łączenie równoczesnych identycznych zadań usługi (wymaga Django).
+@unittest.skipUnless(HAS_DJANGO, "wymaga Django")
+class AsyncCoalescerTest(unittest.TestCase):
+    def setUp(self):
+        executor = ThreadPoolExecutor(max_workers = 4)
+        self.addCleanup(executor.shutdown)
+        self.coalescer = nasa_service.AsyncCoalescer(executor)
+        self.release = threading.Event()
+        self.calls = []
+
+    # Zadanie testowe: czeka na zwolnienie i zwraca wynik (lub zgłasza błąd dla klucza "error").
+    def work(self, key):
+        self.calls.append(key)
+        self.release.wait(5)
+        if key == "error":
+            raise OSError("błąd API")
+        return key.upper()
+
+    # Uruchamia żądania z podanymi kluczami równocześnie i zwalnia zadania, gdy wszystkie czekają.
+    async def run_all(self, keys):
+        tasks = [asyncio.ensure_future(self.coalescer.run(key, self.work, key)) for key in keys]
+        await asyncio.sleep(0.1)
+        self.release.set()
+        return await asyncio.gather(*tasks, return_exceptions = True)
+
+    def test_identical_requests_share_one_execution(self):
+        results = asyncio.run(self.run_all(["a", "a", "a", "b"]))
+        self.assertEqual(results, ["A", "A", "A", "B"])
+        self.assertEqual(sorted(self.calls), ["a", "b"])
+        self.assertEqual(self.coalescer.stats, {"executed": 2, "coalesced": 2})
+        # Zakończone zadanie jest usuwane, więc kolejne żądanie wykonuje je ponownie (np. po odświeżeniu cache).
+        self.assertEqual(self.coalescer.in_flight, {})
+        self.assertEqual(asyncio.run(self.run_all(["a"])), ["A"])
+        self.assertEqual(self.coalescer.stats["executed"], 3)
+
+    def test_errors_reach_every_waiting_request(self):
+        results = asyncio.run(self.run_all(["error", "error"]))
+        self.assertEqual(self.calls, ["error"])
+        self.assertTrue(all(isinstance(result, OSError) for result in results))
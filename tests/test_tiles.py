@@ -0,0 +1,97 @@
+# Importuje moduł os do sprawdzania katalogów piramid.
+import os
+# Importuje moduł struct do zapisu wymiarów w nagłówku JPEG.
+import struct
+# Importuje moduł tempfile do katalogów cache testów.
+import tempfile
+# Importuje moduł unittest do definicji testów.
+import unittest
+# Importuje OrderedDict jako cache zdekodowanych kafelków.
+from collections import OrderedDict
+# Importuje Image z biblioteki PIL do przygotowania obrazów testowych.
+from PIL import Image
+# Importuje sztuczne API NASA.
+from nasa_fake_server import FakeNasaConfig, FakeNasaServer
+# Importuje testowane klasy i funkcje.
+from nasa_tiles import TileCache, open_source, trim_tiles
+
+
+# Zwraca łączny rozmiar kafelków piramidy w bajtach (tak jak liczy go TileCache).
+def pyramid_bytes(pyramid):
+    return sum(file.stat().st_size for level in os.scandir(pyramid.directory) if level.is_dir()
+               for file in os.scandir(level.path))
+
+
+# Testuje budowę piramid kafelków i usuwanie ich z cache na dysku.
+class TileCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeNasaServer(config = FakeNasaConfig(renditions = {"orig": (1000, 700)})).start()
+        self.addCleanup(self.server.stop)
+        self.cache = TileCache(root = tempfile.mkdtemp())
+
+    # Zwraca adres oryginału elementu sztucznego API.
+    def url(self, nasa_id):
+        return f"{self.server.url}/image/{nasa_id}/{nasa_id}~orig.jpg"
+
+    def test_pyramid_levels_and_tiles(self):
+        pyramid = self.cache.build(self.url("A1"))
+        self.assertEqual(pyramid.size, (1000, 700))
+        self.assertEqual(pyramid.levels, [(1000, 700), (500, 350), (250, 175)])
+        self.assertEqual(pyramid.tile_grid(0), (4, 3))
+        # Ostatni kafelek poziomu jest przycięty do krawędzi obrazu.
+        self.assertEqual(pyramid.load_tile(0, 3, 2).size, (1000 - 3 * 256, 700 - 2 * 256))
+        # Gotowa piramida jest odczytywana z dysku bez ponownej budowy.
+        self.assertEqual(self.cache.pyramid(self.url("A1")).levels, pyramid.levels)
+
+    def test_least_recently_used_pyramid_is_evicted(self):
+        first = self.cache.build(self.url("A1"))
+        self.cache.release(first)
+        self.cache.max_bytes = pyramid_bytes(first) + 1
+        # Piramida drugiego obrazu nie mieści się w budżecie razem z pierwszą, więc pierwsza jest usuwana.
+        second = self.cache.build(self.url("B22"))
+        self.assertFalse(os.path.exists(first.directory))
+        self.assertTrue(second.ready)
+
+    def test_held_pyramid_is_not_evicted(self):
+        first = self.cache.build(self.url("A1"))
+        self.cache.max_bytes = pyramid_bytes(first) + 1
+        # Pierwsza piramida jest nadal wyświetlana, więc budowa drugiej jej nie usuwa (budżet jest chwilowo przekroczony).
+        second = self.cache.build(self.url("B22"))
+        self.assertTrue(os.path.exists(first.directory))
+        self.assertEqual(first.load_tile(0, 0, 0).size, (256, 256))
+        # Po zamknięciu obu okien kolejna budowa usuwa najdawniej używaną piramidę.
+        self.cache.release(first)
+        self.cache.release(second)
+        self.cache.build(self.url("C333"))
+        self.assertFalse(os.path.exists(first.directory))
+
+
+# Testuje odczyt nagłówka oryginału z limitem piramidy zamiast globalnego limitu PIL.
+class OpenSourceTest(unittest.TestCase):
+    def test_large_jpeg_header_is_read_without_changing_pil_limit(self):
+        # Zapisuje mały JPEG i zmienia wymiary w jego nagłówku SOF0 na 20000x20000 (400 MP, ponad dwukrotność limitu PIL).
+        path = os.path.join(tempfile.mkdtemp(), "large.jpg")
+        Image.new("RGB", (16, 16)).save(path, format = "JPEG")
+        with open(path, "rb") as file:
+            data = bytearray(file.read())
+        offset = data.index(b"\xff\xc0") + 5
+        data[offset:offset + 4] = struct.pack(">HH", 20000, 20000)
+        with open(path, "wb") as file:
+            file.write(data)
+        limit = Image.MAX_IMAGE_PIXELS
+        with open_source(path) as image:
+            self.assertEqual(image.size, (20000, 20000))
+        # Globalny limit nie jest zmieniany, więc zwykłe Image.open nadal odrzuca ten obraz.
+        self.assertEqual(Image.MAX_IMAGE_PIXELS, limit)
+        with self.assertRaises(Image.DecompressionBombError):
+            Image.open(path)
+
+
+# Testuje ograniczanie liczby zdekodowanych kafelków w pamięci.
+class TrimTilesTest(unittest.TestCase):
+    def test_least_recently_used_tiles_are_removed_except_visible(self):
+        tiles = OrderedDict((key, None) for key in "abcde")
+        tiles.move_to_end("a")
+        trim_tiles(tiles, 2, keep = {"b"})
+        # Usuwa kafelki od najdawniej używanego (c, d, e); wyświetlany b zostaje mimo limitu.
+        self.assertEqual(list(tiles), ["b", "a"])
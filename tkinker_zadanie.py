@@ -1,15 +1,72 @@
+# Importuje moduł time do pomiaru czasu uruchamiania aplikacji.
+import time
+# Zapamiętuje chwilę rozpoczęcia importu modułu (początek pomiaru zimnego startu).
+STARTED = time.perf_counter()
 # Importuje bibliotekę Tkinter.
 import tkinter as tk
+# Importuje moduł os do odczytu ścieżki pliku logów ze zmiennej środowiskowej.
+import os
+# Importuje moduł threading, którego zdarzenia (Event) służą do anulowania pobrań poprzedniego wyszukiwania.
+import threading
+# Importuje OrderedDict do przechowywania zdekodowanych kafelków w kolejności ostatniego użycia
+# oraz deque jako ograniczony bufor logów oczekujących na wyświetlenie.
+from collections import OrderedDict, deque
 # Importuje klasę datetime z modułu datetime, aby obsługiwać znaczniki czasu dla logów.
 from datetime import datetime
 # Importuje moduł messagebox z Tkinter, który służy do wyświetlania okien dialogowych z ostrzeżeniami lub błędami.
 from tkinter import messagebox
-# Importuje Image i ImageTk z biblioteki PIL (Python Imaging Library) do obsługi ładowania obrazów i ich konwersji na format zgodny z Tkinter.
-from PIL import Image, ImageTk
-# Importuje bibliotekę requests do wykonywania zapytań HTTP do API NASA Images.
-import requests
-# Importuje BytesIO z modułu io, aby obsługiwać dane binarne w pamięci (np. obrazy).
-from io import BytesIO
+# Importuje moduł filedialog z Tkinter do wyboru pliku eksportu statystyk czasu.
+from tkinter import filedialog
+# Importuje parser odpowiedzi wyszukiwania do zwartych elementów NasaItem.
+from nasa_model import SearchPage, parse_response
+# Importuje funkcję zwracającą współdzielony licznik czasu etapów (histogramy opóźnień).
+from nasa_timing import get_stage_timer
+# Moduły korzystające z PIL, requests i NumPy są importowane przez load_modules dopiero po pokazaniu okna.
+
+# Maksymalna liczba linii w panelu logów (starsze linie są usuwane).
+LOG_MAX_LINES = 1000
+# Plik, do którego kopiowane są logi (None - bez zapisu do pliku), jego maksymalny rozmiar i liczba kopii rotacji.
+LOG_FILE = os.environ.get("NASA_LOG_FILE")
+LOG_FILE_BYTES = 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+# Minimalny odstęp (w sekundach) między kolejnymi otwarciami połączenia z API podczas pisania zapytania.
+WARM_UP_INTERVAL = 30
+
+# Flaga ustawiana przez load_modules po zaimportowaniu wszystkich modułów (wcześniej ich nazwy globalne nie istnieją).
+_modules_loaded = False
+
+
+# Importuje moduły potrzebne do wyszukiwania i wyświetlania obrazów (PIL, requests, NumPy) i przypisuje ich nazwy globalnie.
+# Wywoływana raz, w wątku w tle po pokazaniu okna - import tych bibliotek zajmuje większość czasu uruchamiania.
+def load_modules():
+    global Image, ImageTk, requests, ImageLoader, load_scaled_image, get_image_cache, DuplicateFilter, PhotoImageStore
+    global get_http_client, is_throttled, get_tile_cache, trim_tiles, derive_rendition_url, get_rendition_resolver
+    global HOVER_PRIORITY, PreviewPrefetcher, API_URL, get_search_client, _modules_loaded
+    # Importuje Image i ImageTk z biblioteki PIL (Python Imaging Library) do powiększania miniatur i konwersji obrazów na format zgodny z Tkinter.
+    from PIL import Image, ImageTk
+    # Importuje bibliotekę requests, aby rozpoznawać typy błędów zapytań HTTP do API NASA Images.
+    import requests
+    # Importuje ImageLoader, który pobiera i dekoduje miniatury w puli wątków, oraz funkcję pobierającą przeskalowany obraz.
+    from nasa_loader import ImageLoader, load_scaled_image
+    # Importuje funkcję zwracającą trwały cache obrazów na dysku.
+    from nasa_cache import get_image_cache
+    # Importuje filtr powtórzonych zdjęć w wynikach wyszukiwania.
+    from nasa_dedup import DuplicateFilter
+    # Importuje magazyn obrazów Tkinter z budżetem pamięci.
+    from nasa_image_store import PhotoImageStore
+    # Importuje współdzielonego klienta HTTP i funkcję rozpoznającą odpowiedzi przeciążonego serwera (429/503).
+    from nasa_http import get_http_client, is_throttled
+    # Importuje funkcję zwracającą współdzielony cache piramid kafelków i funkcję ograniczającą liczbę zdekodowanych kafelków.
+    from nasa_tiles import get_tile_cache, trim_tiles
+    # Importuje resolver wersji obrazów (manifest elementu) i funkcję wyznaczającą adres wersji bez manifestu.
+    from nasa_renditions import derive_rendition_url, get_rendition_resolver
+    # Importuje prefetcher podglądów i priorytet elementów wskazanych kursorem.
+    from nasa_prefetch import HOVER_PRIORITY, PreviewPrefetcher
+    # Importuje adres API i funkcję zwracającą wspólnego klienta wyszukiwania z cache wyników.
+    from nasa_search import API_URL, get_search_client
+    # Oznacza moduły jako wczytane (dopiero po przypisaniu wszystkich nazw).
+    _modules_loaded = True
 
 # Klasa do centralnego zarządzania stylami
 # Definiuje klasę StyleConfig, która centralizuje zarządzanie stylami wizualnymi aplikacji.
@@ -66,6 +123,13 @@ class NasaAppBase:
         self.style = style_config
         # Przypisuje funkcję callback dla logów do atrybutu log_callback.
         self.log_callback = log_callback
+        # Przypisuje współdzielony licznik czasu etapów.
+        self.timer = get_stage_timer()
+
+    # Definiuje metodę stage, która zwraca kontekst mierzący czas etapu (pusty kontekst przy wyłączonych pomiarach).
+    def stage(self, name):
+        # Przekazuje nazwę etapu do licznika czasu.
+        return self.timer.stage(name)
 
     # Definiuje metodę log do zapisywania wiadomości w logach.
     def log(self, message):
@@ -76,8 +140,17 @@ class NasaAppBase:
 
     # Definiuje metodę do obsługi błędów żądań HTTP, z domyślnym kontekstem "Operacja".
     def handle_request_errors(self, exception, context="Operacja"):
+        # Sprawdza, czy moduły (requests, nasa_http) zostały już wczytane - błąd może wystąpić w trakcie uruchamiania
+        # (np. przy eksporcie logów) lub po nieudanym wczytaniu modułów.
+        if not _modules_loaded:
+            # Loguje błąd bez rozpoznawania typu wyjątku HTTP.
+            self.log(f"Błąd w {context}: {str(exception)}")
+        # Sprawdza, czy serwer ograniczył liczbę zapytań (limiter już zwolnił tempo i ponowił zapytanie).
+        elif is_throttled(exception):
+            # Loguje przeciążenie serwera.
+            self.log(f"Serwer ogranicza liczbę zapytań w {context} ({exception.response.status_code}) - spróbuj ponownie za chwilę.")
         # Sprawdza, czy wyjątek jest błędem HTTP.
-        if isinstance(exception, requests.exceptions.HTTPError):
+        elif isinstance(exception, requests.exceptions.HTTPError):
             # Loguje błąd HTTP z kodem statusu i powodem.
             self.log(f"Błąd HTTP w {context}: {exception.response.status_code} - {exception.response.reason}")
         # Sprawdza, czy wyjątek jest błędem połączenia.
@@ -98,17 +171,57 @@ class NasaAppBase:
             self.log(f"Niespodziewany błąd w {context}: {str(exception)}")
 
 # Definiuje klasę LogPanel, dziedziczącą po NasaAppBase, do wyświetlania logów.
+# Wiadomości (z dowolnego wątku) trafiają do ograniczonego bufora, a widget tekstowy jest aktualizowany partiami
+# najwyżej raz na klatkę; panel przechowuje co najwyżej max_lines linii.
 class LogPanel(NasaAppBase):
-    # Inicjalizuje panel logów, przyjmując widget nadrzędny (parent) i obiekt style_config.
-    def __init__(self, parent, style_config):
+    # Inicjalizuje panel logów, przyjmując widget nadrzędny (parent), obiekt style_config, maksymalną liczbę linii,
+    # opcjonalną ścieżkę rotowanego pliku logów oraz odstęp (w ms) między aktualizacjami widgetu.
+    def __init__(self, parent, style_config, max_lines = LOG_MAX_LINES, log_file = LOG_FILE, flush_interval = 16):
         # Wywołuje konstruktor klasy bazowej, przekazując style_config i metodę _log_to_text jako callback.
         super().__init__(style_config, self._log_to_text)
         # Przypisuje widget nadrzędny do atrybutu parent.
         self.parent = parent
         # Inicjalizuje atrybut text_widget jako None (później będzie to widget tekstowy).
         self.text_widget = None
+        # Przypisuje limit linii i odstęp aktualizacji widgetu.
+        self.max_lines = max_lines
+        self.flush_interval = flush_interval
+        # Tworzy bufor linii oczekujących na wyświetlenie (starsze linie ponad limit i tak zostałyby usunięte z widgetu).
+        self.buffer = deque(maxlen = max_lines)
+        # Tworzy blokadę chroniącą bufor zapisywany z wielu wątków.
+        self.lock = threading.Lock()
+        # Flaga informująca, czy aktualizacja widgetu jest już zaplanowana.
+        self._flush_scheduled = False
+        # Zapamiętuje wątek Tkinter (tylko z niego wolno planować wywołania przez after).
+        self._tk_thread = threading.get_ident()
+        # Tworzy logger zapisujący kopię logów do rotowanego pliku (jeśli podano ścieżkę).
+        self.file_logger = self._create_file_logger(log_file) if log_file else None
         # Wywołuje metodę setup_ui do konfiguracji interfejsu.
         self.setup_ui()
+        # Uruchamia okresowe odbieranie wiadomości zapisanych przez wątki robocze.
+        self.parent.after(100, self._poll)
+
+    # Definiuje metodę _create_file_logger, która tworzy logger z rotowanym plikiem logów.
+    def _create_file_logger(self, path):
+        # Importuje logging dopiero tutaj (zapis do pliku jest opcjonalny, a import wydłuża uruchamianie).
+        import logging
+        from logging.handlers import RotatingFileHandler
+        # Tworzy katalog pliku logów, jeśli jeszcze nie istnieje.
+        os.makedirs(os.path.dirname(path) or ".", exist_ok = True)
+        # Pobiera logger przypisany do ścieżki (kolejne panele z tą samą ścieżką nie dublują handlerów).
+        logger = logging.getLogger(f"nasa.log_panel.{os.path.abspath(path)}")
+        # Sprawdza, czy logger nie ma jeszcze handlera.
+        if not logger.handlers:
+            # Tworzy handler, który rotuje plik po przekroczeniu rozmiaru.
+            handler = RotatingFileHandler(path, maxBytes = LOG_FILE_BYTES, backupCount = LOG_FILE_BACKUPS, encoding = "utf-8")
+            # Zapisuje linie bez dodatkowego formatowania (znacznik czasu jest już w wiadomości).
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            # Nie przekazuje logów do loggera głównego.
+            logger.propagate = False
+        # Zwraca logger.
+        return logger
 
     # Definiuje metodę setup_ui do tworzenia elementów interfejsu panelu logów.
     def setup_ui(self):
@@ -127,14 +240,116 @@ class LogPanel(NasaAppBase):
         # Umieszcza widget tekstowy w interfejsie, wypełniając dostępną przestrzeń w obu kierunkach, z odstępami 10 pikseli.
         self.text_widget.pack(fill = tk.BOTH, expand = True, padx = 10, pady = 10)
 
-    # Definiuje metodę _log_to_text do zapisywania wiadomości w widgetcie tekstowym.
+        # Tworzy ramkę na przyciski pomiaru czasu etapów.
+        timing_frame = tk.Frame(self.parent, bg = self.style.bg_color)
+        # Umieszcza ramkę pod widgetem tekstowym.
+        timing_frame.pack(fill = tk.X, padx = 10, pady = (0, 10))
+        # Tworzy zmienną Tkinter odzwierciedlającą włączenie pomiarów.
+        self.timing_var = tk.BooleanVar(value = self.timer.enabled)
+        # Tworzy pole wyboru włączające i wyłączające pomiary czasu.
+        tk.Checkbutton(
+            timing_frame, text = "Pomiar czasu", variable = self.timing_var, command = self._toggle_timing,
+            font = self.style.title_font, bg = self.style.bg_color, fg = self.style.fg_color,
+            selectcolor = self.style.bg_color, activebackground = self.style.active_bg,
+            activeforeground = self.style.active_fg
+        ).pack(side = tk.LEFT)
+        # Tworzy przyciski wyświetlania i eksportu podsumowania czasów.
+        for text, command in [("Eksport", self._export_timing), ("Czasy", self.show_timing_summary)]:
+            # Tworzy przycisk z odpowiednią akcją i umieszcza go po prawej stronie.
+            tk.Button(
+                timing_frame, text = text, command = command, font = self.style.title_font,
+                bg = self.style.bg_color, fg = self.style.fg_color, activebackground = self.style.active_bg,
+                activeforeground = self.style.active_fg, borderwidth = self.style.border_width
+            ).pack(side = tk.RIGHT, padx = (5, 0))
+
+    # Definiuje metodę _toggle_timing, która włącza lub wyłącza pomiary czasu etapów.
+    def _toggle_timing(self):
+        # Ustawia flagę licznika zgodnie z polem wyboru.
+        self.timer.enabled = self.timing_var.get()
+        # Loguje zmianę stanu pomiarów.
+        self.log("Pomiar czasu etapów: " + ("włączony" if self.timer.enabled else "wyłączony"))
+
+    # Definiuje metodę show_timing_summary, która wypisuje podsumowanie czasów etapów w logach.
+    def show_timing_summary(self):
+        # Pobiera linie podsumowania.
+        lines = self.timer.summary_lines()
+        # Sprawdza, czy są jakiekolwiek pomiary.
+        if not lines:
+            # Loguje brak pomiarów.
+            self.log("Brak pomiarów czasu (włącz 'Pomiar czasu' i wykonaj wyszukiwanie).")
+            # Kończy metodę.
+            return
+        # Loguje każdą linię podsumowania.
+        for line in lines:
+            self.log(line)
+
+    # Definiuje metodę _export_timing, która zapisuje podsumowanie czasów do pliku JSON lub CSV.
+    def _export_timing(self):
+        # Wyświetla okno wyboru pliku.
+        path = filedialog.asksaveasfilename(
+            defaultextension = ".json", filetypes = [("JSON", "*.json"), ("CSV", "*.csv")]
+        )
+        # Kończy metodę, jeśli użytkownik anulował wybór.
+        if not path:
+            return
+        # Rozpoczyna blok obsługi wyjątków dla zapisu pliku.
+        try:
+            # Eksportuje podsumowanie do wybranego pliku.
+            self.timer.export(path)
+            # Loguje zapis pliku.
+            self.log(f"Zapisano statystyki czasu: {path}")
+        # Łapie błędy zapisu pliku.
+        except OSError as e:
+            # Obsługuje błąd, logując go z kontekstem.
+            self.handle_request_errors(e, "eksporcie statystyk czasu")
+
+    # Definiuje metodę _log_to_text do zapisywania wiadomości w buforze logów (wywoływana z dowolnego wątku).
     def _log_to_text(self, message):
         # Pobiera aktualny czas i formatuje go jako ciąg w formacie "DD-MM-YYYY HH:MM:SS".
         timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-        # Ustawia widget tekstowy w stan edytowalny, aby można było dodać tekst
+        # Formatuje linię logu z timestampem.
+        line = f"[{timestamp}] {message}"
+        # Zapisuje kopię linii do pliku logów.
+        if self.file_logger is not None:
+            self.file_logger.info(line)
+        # Dodaje linię do bufora.
+        with self.lock:
+            self.buffer.append(line)
+            # Sprawdza, czy trzeba zaplanować aktualizację (wątki robocze zostawiają to okresowemu odbieraniu).
+            schedule = not self._flush_scheduled and threading.get_ident() == self._tk_thread
+            if schedule:
+                self._flush_scheduled = True
+        # Planuje aktualizację widgetu w kolejnej klatce (wszystkie wiadomości do tego czasu trafią do jednej partii).
+        if schedule:
+            self.parent.after(self.flush_interval, self._flush)
+
+    # Definiuje metodę _poll, która okresowo wyświetla wiadomości zapisane przez wątki robocze.
+    def _poll(self):
+        # Wyświetla oczekujące linie, jeśli aktualizacja nie jest już zaplanowana.
+        if not self._flush_scheduled and self.buffer:
+            self._flush()
+        # Planuje kolejne sprawdzenie.
+        self.parent.after(100, self._poll)
+
+    # Definiuje metodę _flush, która wstawia oczekujące linie do widgetu tekstowego jedną operacją i usuwa najstarsze linie.
+    def _flush(self):
+        # Odbiera wszystkie oczekujące linie.
+        with self.lock:
+            lines = list(self.buffer)
+            self.buffer.clear()
+            self._flush_scheduled = False
+        # Kończy metodę, jeśli nie ma nowych linii.
+        if not lines:
+            return
+        # Ustawia widget tekstowy w stan edytowalny, aby można było dodać tekst.
         self.text_widget.configure(state = 'normal')
-        # Wstawia wiadomość z timestampem na koniec widgetu tekstowego, dodając nową linię.
-        self.text_widget.insert(tk.END, f"[{timestamp}] {message}\n")
+        # Wstawia wszystkie linie na koniec widgetu tekstowego.
+        self.text_widget.insert(tk.END, "\n".join(lines) + "\n")
+        # Oblicza liczbę linii ponad limit (widget kończy się pustą linią po ostatnim znaku nowej linii).
+        excess = int(self.text_widget.index("end-1c").split(".")[0]) - 1 - self.max_lines
+        # Usuwa najstarsze linie ponad limit.
+        if excess > 0:
+            self.text_widget.delete("1.0", f"{excess + 1}.0")
         # Przywraca widget tekstowy do stanu tylko do odczytu.
         self.text_widget.configure(state = 'disabled')
         # Przewija widget tekstowy, aby pokazać ostatnią dodaną linię.
@@ -142,16 +357,35 @@ class LogPanel(NasaAppBase):
 
 # Definiuje klasę SearchPanel, dziedziczącą po NasaAppBase, do obsługi wyszukiwania.
 class SearchPanel(NasaAppBase):
-    # Inicjalizuje panel wyszukiwania, przyjmując widget nadrzędny, obiekt style_config i funkcję callback dla wyszukiwania.
-    def __init__(self, parent, style_config, search_callback):
+    # Inicjalizuje panel wyszukiwania, przyjmując widget nadrzędny, obiekt style_config, funkcję callback dla wyszukiwania,
+    # ustawienia wyszukiwania na żywo (włączenie, opóźnienie w ms i minimalną długość zapytania)
+    # oraz opcjonalną funkcję wywoływaną przy każdej zmianie tekstu (np. do otwarcia połączenia z wyprzedzeniem).
+    def __init__(self, parent, style_config, search_callback, live_search = False, debounce_ms = 400, min_chars = 3,
+                 typing_callback = None):
         # Wywołuje konstruktor klasy bazowej, przekazując style_config.
         super().__init__(style_config)
         # Przypisuje widget nadrzędny do atrybutu parent.
         self.parent = parent
         # Przypisuje funkcję callback dla wyszukiwania do atrybutu search_callback.
         self.search_callback = search_callback
+        # Przypisuje funkcję wywoływaną podczas pisania.
+        self.typing_callback = typing_callback
         # Tworzy zmienną Tkinter (StringVar) do przechowywania tekstu wprowadzonego w polu wyszukiwania.
         self.search_var = tk.StringVar()
+        # Tworzy zmienną Tkinter włączającą wyszukiwanie w trakcie pisania.
+        self.live_var = tk.BooleanVar(value = live_search)
+        # Tworzy zmienną Tkinter włączającą wyszukiwanie w lokalnym indeksie metadanych (bez sieci).
+        self.local_var = tk.BooleanVar(value = False)
+        # Przypisuje opóźnienie (w ms) od ostatniego naciśnięcia klawisza do wyszukiwania.
+        self.debounce_ms = debounce_ms
+        # Przypisuje minimalną liczbę znaków, od której uruchamiane jest wyszukiwanie na żywo.
+        self.min_chars = min_chars
+        # Inicjalizuje identyfikator zaplanowanego (jeszcze niewykonanego) wyszukiwania na żywo.
+        self._debounce_id = None
+        # Inicjalizuje ostatnio wysłane zapytanie, aby nie powtarzać identycznych wyszukiwań.
+        self._last_query = None
+        # Rejestruje funkcję wywoływaną przy każdej zmianie tekstu w polu wyszukiwania.
+        self.search_var.trace_add("write", self._on_text_changed)
         # Wywołuje metodę setup_ui do konfiguracji interfejsu.
         self.setup_ui()
 
@@ -186,8 +420,22 @@ class SearchPanel(NasaAppBase):
             activeforeground = self.style.active_fg, borderwidth = self.style.border_width
         ).grid(row = 0, column = 2)
 
+        # Tworzy pole wyboru włączające wyszukiwanie w trakcie pisania i umieszcza je w siatce (wiersz 0, kolumna 3).
+        tk.Checkbutton(
+            inner_frame, text = "Na żywo", variable = self.live_var, font = self.style.button_font,
+            bg = self.style.bg_color, fg = self.style.fg_color, selectcolor = self.style.bg_color,
+            activebackground = self.style.active_bg, activeforeground = self.style.active_fg
+        ).grid(row = 0, column = 3, padx = (10, 0))
+
+        # Tworzy pole wyboru włączające wyszukiwanie w lokalnym indeksie i umieszcza je w siatce (wiersz 0, kolumna 4).
+        tk.Checkbutton(
+            inner_frame, text = "Lokalnie", variable = self.local_var, font = self.style.button_font,
+            bg = self.style.bg_color, fg = self.style.fg_color, selectcolor = self.style.bg_color,
+            activebackground = self.style.active_bg, activeforeground = self.style.active_fg
+        ).grid(row = 0, column = 4, padx = (10, 0))
+
         # Iteruje po krotkach definiujących wagi kolumn w siatce.
-        for col, weight in [(0, 0), (1, 1), (2, 0)]:
+        for col, weight in [(0, 0), (1, 1), (2, 0), (3, 0), (4, 0)]:
             # Ustawia wagi dla kolumn siatki (kolumna 1 rozciąga się, kolumny 0 i 2 nie)
             inner_frame.grid_columnconfigure(col, weight = weight)
 
@@ -203,39 +451,199 @@ class SearchPanel(NasaAppBase):
             messagebox.showwarning("Błąd", "Wprowadź zapytanie!")
             # Kończy metodę, jeśli pole jest puste.
             return
+        # Anuluje zaplanowane wyszukiwanie na żywo (przycisk je zastępuje).
+        self._cancel_debounce()
+        # Zapamiętuje wysłane zapytanie.
+        self._last_query = query
         # Wywołuje funkcję callback, przekazując zapytanie wyszukiwania.
         self.search_callback(query)
 
-# Definiuje klasę ImageGrid, dziedziczącą po NasaAppBase, do wyświetlania siatki obrazów.
+    # Definiuje metodę _on_text_changed, wywoływaną przy każdej zmianie tekstu (argumenty przekazuje trace_add).
+    def _on_text_changed(self, *args):
+        # Powiadamia o pisaniu (niezależnie od wyszukiwania na żywo).
+        if self.typing_callback is not None:
+            self.typing_callback()
+        # Kończy metodę, jeśli wyszukiwanie na żywo jest wyłączone.
+        if not self.live_var.get():
+            return
+        # Anuluje wyszukiwanie zaplanowane dla poprzedniego (krótszego) tekstu.
+        self._cancel_debounce()
+        # Planuje wyszukiwanie po upływie opóźnienia od ostatniego naciśnięcia klawisza.
+        self._debounce_id = self.parent.after(self.debounce_ms, self._on_live_search)
+
+    # Definiuje metodę _cancel_debounce, która anuluje zaplanowane wyszukiwanie na żywo.
+    def _cancel_debounce(self):
+        # Sprawdza, czy jakieś wyszukiwanie jest zaplanowane.
+        if self._debounce_id is not None:
+            # Anuluje zaplanowane wywołanie.
+            self.parent.after_cancel(self._debounce_id)
+            # Czyści identyfikator.
+            self._debounce_id = None
+
+    # Definiuje metodę _on_live_search, wywoływaną, gdy użytkownik przestał pisać.
+    def _on_live_search(self):
+        # Czyści identyfikator wykonanego wywołania.
+        self._debounce_id = None
+        # Pobiera tekst bez spacji na początku i końcu.
+        query = self.search_var.get().strip()
+        # Pomija zbyt krótkie zapytania i zapytania identyczne z ostatnim.
+        if len(query) < self.min_chars or query == self._last_query:
+            return
+        # Zapamiętuje wysłane zapytanie.
+        self._last_query = query
+        # Wywołuje funkcję callback (nowe wyszukiwanie zastępuje wyniki poprzedniego).
+        self.search_callback(query)
+
+# Definiuje klasę GridCell, która przechowuje widgety jednej komórki siatki (komórki są używane ponownie podczas przewijania).
+class GridCell:
+    # Inicjalizuje komórkę, przyjmując płótno (Canvas), obiekt style_config, obraz zastępczy i funkcję obsługi kółka myszy.
+    def __init__(self, canvas, style, placeholder, on_wheel):
+        # Tworzy ramkę dla obrazu i jego tytułu.
+        self.frame = tk.Frame(canvas, bg = style.bg_color)
+        # Tworzy przycisk z obrazem zastępczym, ustawia style i kursor (obraz i akcja są podmieniane przy przewijaniu).
+        self.button = tk.Button(
+            self.frame, image = placeholder,
+            bg = style.fg_color, activebackground = style.fg_color,
+            borderwidth = style.border_width, highlightthickness = style.highlight_thickness,
+            highlightbackground = style.fg_color, highlightcolor = style.fg_color,
+            cursor = "hand2"
+        )
+        # Umieszcza przycisk w ramce.
+        self.button.pack()
+        # Tworzy etykietę na tytuł obrazu, zawijaną do szerokości miniatury.
+        self.label = tk.Label(
+            self.frame, text = "", wraplength = 200,
+            font = style.title_font, bg = style.bg_color, fg = style.fg_color
+        )
+        # Umieszcza etykietę pod obrazem.
+        self.label.pack()
+        # Umieszcza ramkę na płótnie jako ukryte okno (pozycja jest ustawiana przy przypisaniu elementu).
+        self.window_id = canvas.create_window(0, 0, window = self.frame, anchor = "nw", state = "hidden")
+        # Inicjalizuje indeks elementu wyników przypisanego do komórki (None - komórka wolna).
+        self.index = None
+        # Inicjalizuje klucz obrazu pobranego z magazynu PhotoImageStore (None - komórka wyświetla obraz zastępczy).
+        self.photo_key = None
+        # Iteruje po widgetach komórki.
+        for widget in (self.frame, self.button, self.label):
+            # Przekazuje zdarzenia kółka myszy do siatki (Windows/macOS oraz Linux).
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                widget.bind(sequence, on_wheel)
+
+# Definiuje klasę ImageGrid, dziedziczącą po NasaAppBase, do wyświetlania przewijanej siatki obrazów.
+# Widgety są tworzone tylko dla widocznych komórek i ponownie wykorzystywane podczas przewijania.
 class ImageGrid(NasaAppBase):
-    # Inicjalizuje siatkę obrazów, przyjmując widget nadrzędny, obiekt style_config i funkcję callback dla logów.
-    def __init__(self, parent, style_config, log_callback):
+    # Inicjalizuje siatkę obrazów, przyjmując widget nadrzędny, obiekt style_config, funkcję callback dla logów, limit równoległych pobrań,
+    # budżet cache na dysku i budżet pamięci zdekodowanych obrazów w bajtach.
+    def __init__(self, parent, style_config, log_callback, max_workers = 4, cache_bytes = 200 * 1024 * 1024, memory_bytes = 64 * 1024 * 1024):
         # Wywołuje konstruktor klasy bazowej, przekazując style_config i log_callback.
         super().__init__(style_config, log_callback)
         # Przypisuje widget nadrzędny do atrybutu parent.
         self.parent = parent
-        # Tworzy ramkę dla obrazów z czarnym tłem.
-        self.images_frame = tk.Frame(self.parent, bg=self.style.bg_color)
-        # Umieszcza ramkę, wypełniając dostępną przestrzeń w obu kierunkach.
-        self.images_frame.pack(fill=tk.BOTH, expand=True)
-        # Inicjalizuje pustą listę do przechowywania obiektów ImageTk.PhotoImage.
-        self.images = []
+        # Ustawia szerokość i wysokość komórki siatki w pikselach (miniatura 200x200, ramka i tytuł).
+        self.cell_width = 220
+        self.cell_height = 250
+        # Inicjalizuje liczbę kolumn (przeliczaną przy zmianie szerokości okna).
+        self.columns = 3
+        # Tworzy przewijane płótno dla obrazów z czarnym tłem.
+        self.canvas = tk.Canvas(self.parent, bg = self.style.bg_color, highlightthickness = 0, yscrollincrement = 50)
+        # Tworzy pionowy pasek przewijania połączony z płótnem.
+        self.scrollbar = tk.Scrollbar(self.parent, orient = tk.VERTICAL, command = self._on_scrollbar)
+        # Łączy płótno z paskiem przewijania.
+        self.canvas.configure(yscrollcommand = self.scrollbar.set)
+        # Umieszcza pasek przewijania po prawej stronie.
+        self.scrollbar.pack(side = tk.RIGHT, fill = tk.Y)
+        # Umieszcza płótno, wypełniając dostępną przestrzeń w obu kierunkach.
+        self.canvas.pack(side = tk.LEFT, fill = tk.BOTH, expand = True)
+        # Przelicza układ przy zmianie rozmiaru płótna.
+        self.canvas.bind("<Configure>", lambda event: self._layout())
+        # Iteruje po zdarzeniach kółka myszy (Windows/macOS oraz Linux).
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            # Przewija siatkę kółkiem myszy.
+            self.canvas.bind(sequence, self._on_wheel)
+        # Tworzy pusty obraz zastępczy 200x200 dla komórek, których miniatura nie jest jeszcze gotowa.
+        self.placeholder = tk.PhotoImage(width = 200, height = 200)
+        # Inicjalizuje pulę komórek (jej rozmiar zależy od rozmiaru okna, a nie od liczby wyników).
+        self.cells = []
+        # Inicjalizuje listę elementów wyników (NasaItem: nasa_id, tytuł, URL miniatury, URL manifestu).
+        self.items = []
+        # Inicjalizuje adres kolejnej strony wyników (None - brak dalszych stron).
+        self.next_url = None
+        # Flaga informująca, czy trwa pobieranie kolejnej strony wyników.
+        self.loading_more = False
+        # Inicjalizuje filtr powtórzonych zdjęć bieżącego wyszukiwania (None - bez filtrowania).
+        self.dedup = None
+        # Tworzy magazyn obrazów Tkinter z budżetem pamięci (miniatury i podglądy; zwolnione obrazy są odtwarzane ze skompresowanych kopii).
+        self.images = PhotoImageStore(memory_bytes)
+        # Inicjalizuje słownik trwających pobrań miniatur (element -> future; elementy, a nie indeksy, bo powtórzenia są usuwane z listy).
+        self.requests = {}
+        # Inicjalizuje zbiór elementów, których miniatur nie udało się pobrać.
+        self.failed = set()
+        # Inicjalizuje zakres indeksów aktualnie widocznych komórek.
+        self.visible = range(0)
+        # Inicjalizuje numer generacji wyszukiwania (wyniki starszych generacji są odrzucane).
+        self.generation = 0
+        # Tworzy zdarzenie anulowania pobrań bieżącej generacji.
+        self.cancel_event = threading.Event()
+        # Inicjalizuje atrybut etykiety "Ładowanie..." bieżącej generacji.
+        self.loading_label = None
+        # Pobiera wspólnego klienta wyszukiwania, używanego do pobierania kolejnych stron wyników.
+        self.search_client = get_search_client()
+        # Pobiera wspólny resolver, który wybiera najmniejszą wersję obrazu wystarczającą do wyświetlenia.
+        self.resolver = get_rendition_resolver()
+        # Pobiera trwały cache miniatur 200x200.
+        self.thumb_cache = get_image_cache("thumbs", cache_bytes)
+        # Pobiera osobny trwały cache podglądów 1000x800.
+        self.preview_cache = get_image_cache("previews", cache_bytes)
+        # Tworzy loader, który pobiera i dekoduje miniatury równolegle, poza wątkiem Tkinter.
+        self.loader = ImageLoader(self.parent, max_workers = max_workers, cache = self.thumb_cache)
+        # Tworzy osobny loader podglądów, aby otwieranie zdjęcia nie czekało w kolejce za miniaturami.
+        self.preview_loader = ImageLoader(self.parent, max_workers = 2)
+        # Tworzy osobny loader przeglądarek pełnej rozdzielczości, aby pobieranie oryginału, budowa piramidy i wczytywanie kafelków
+        # nie blokowały wątków miniatur.
+        self.tile_loader = ImageLoader(self.parent, max_workers = 3)
+        # Tworzy prefetcher, który w wolnym czasie pobiera podglądy widocznych elementów (najpierw wskazanych kursorem).
+        self.prefetcher = PreviewPrefetcher(self.parent, self._prefetch_preview, self.images.put)
 
     # Definiuje metodę clear_images do czyszczenia siatki obrazów.
     def clear_images(self):
-        # Iteruje po wszystkich widgetach w ramce obrazów.
-        for widget in self.images_frame.winfo_children():
-            # Usuwa każdy widget z ramki.
-            widget.destroy()
-        # Czyści listę przechowywanych obrazów.
-        self.images.clear()
-
-    # Definiuje metodę display_images, która wyświetla obrazy na podstawie listy elementów (items) i głównego okna (root).
-    def display_images(self, items, root):
-        # Ustawia liczbę kolumn w siatce na 3.
-        col_count = 3
-        # Inicjalizuje zmienne do śledzenia wierszy, kolumn i liczby wyświetlanych obrazów.
-        row = col = shown = 0
+        # Zwiększa numer generacji, aby spóźnione wyniki poprzedniego wyszukiwania zostały odrzucone.
+        self.generation += 1
+        # Przerywa trwające pobrania i dekodowanie poprzedniej generacji.
+        self.cancel_event.set()
+        # Iteruje po zadaniach poprzedniej generacji.
+        for future in self.requests.values():
+            # Anuluje zadania, które jeszcze nie zostały uruchomione.
+            future.cancel()
+        # Czyści słownik zadań.
+        self.requests.clear()
+        # Tworzy nowe zdarzenie anulowania dla kolejnej generacji.
+        self.cancel_event = threading.Event()
+        # Czyści kolejkę i budżet pobierania z wyprzedzeniem.
+        self.prefetcher.reset()
+        # Sprawdza, czy etykieta "Ładowanie..." poprzedniego wyszukiwania nadal istnieje.
+        if self.loading_label is not None and self.loading_label.winfo_exists():
+            # Usuwa etykietę "Ładowanie...".
+            self.loading_label.destroy()
+        # Czyści listę elementów, stan stronicowania i miniatury poprzedniego wyszukiwania.
+        self.items.clear()
+        self.next_url = None
+        self.loading_more = False
+        self.dedup = None
+        self.failed.clear()
+        self.visible = range(0)
+        # Iteruje po komórkach puli (widgety nie są usuwane, tylko ukrywane).
+        for cell in self.cells:
+            # Zwalnia komórkę.
+            self._release_cell(cell)
+        # Przewija płótno na początek.
+        self.canvas.yview_moveto(0)
+        # Aktualizuje obszar przewijania.
+        self._update_scrollregion()
+
+    # Definiuje metodę display_images, która wyświetla obrazy na podstawie listy elementów NasaItem (items), głównego okna (root),
+    # opcjonalnego adresu kolejnej strony wyników (dociąganej podczas przewijania) i filtra powtórzeń wyszukiwania (dedup),
+    # który sprawdza kolejne miniatury po ich wczytaniu.
+    def display_images(self, items, root, next_url = None, dedup = None):
         # Tworzy etykietę z tekstem "Ładowanie..." i odpowiednimi stylami.
         loading_label = tk.Label(
             root, text = "Ładowanie...", font = self.style.loading_font,
@@ -243,151 +651,789 @@ class ImageGrid(NasaAppBase):
         )
         # Umieszcza etykietę w centrum okna.
         loading_label.place(relx = 0.5, rely = 0.5, anchor = "center")
-        # Aktualizuje główne okno, aby wyświetlić etykietę.
-        root.update()
-
-        # Definiuje wewnętrzną funkcję load_image do ładowania pojedynczego obrazu.
-        def load_image(item):
-            # Deklaruje zmienne row, col i shown jako nonlocal, aby móc je modyfikować.
-            nonlocal row, col, shown
-            # Pobiera listę linków z elementu, domyślnie pustą listę.
-            links = item.get("links", [])
-            # Pobiera listę danych z elementu, domyślnie pustą listę.
-            data = item.get("data", [])
-            # Sprawdza, czy istnieją linki i dane.
-            if not links or not data:
-                # Loguje pominięcie elementu, jeśli brak linków lub danych.
-                self.log("Pominięto element: Brak linków lub danych.")
-                # Zwraca True, aby kontynuować przetwarzanie.
-                return True
-
-            # Pobiera URL obrazu z pierwszego linku.
-            img_url = links[0].get("href")
-            # Pobiera tytuł z pierwszych danych, domyślnie "Brak tytułu".
-            title = data[0].get("title", "Brak tytułu")
-            # Sprawdza, czy istnieje URL obrazu.
-            if not img_url:
-                # Loguje pominięcie elementu, jeśli brak URL.
-                self.log("Pominięto element: Brak linku obrazu.")
-                # Zwraca True, aby kontynuować.
-                return True
-
-            # Loguje rozpoczęcie ładowania obrazu, obcinając tytuł do 50 znaków.
-            self.log(f"Ładowanie obrazu '{title[:50]}' ({img_url})")
-            # Rozpoczyna blok obsługi wyjątków dla ładowania obrazu.
-            try:
-                # Pobiera dane obrazu za pomocą żądania HTTP.
-                img_data = requests.get(img_url).content
-                # Otwiera obraz z danych binarnych w pamięci.
-                image = Image.open(BytesIO(img_data))
-                # Skaluje obraz do miniatury o maksymalnych wymiarach 200x200 pikseli.
-                image.thumbnail((200, 200))
-                # Konwertuje obraz na format zgodny z Tkinter.
-                photo = ImageTk.PhotoImage(image)
-                # Dodaje obraz do listy images.
-                self.images.append(photo)
-
-                # Tworzy ramkę dla obrazu i jego tytułu.
-                img_container = tk.Frame(self.images_frame, bg = self.style.bg_color)
-                # Umieszcza ramkę w siatce w odpowiednim wierszu i kolumnie.
-                img_container.grid(row = row, column = col, padx = 5, pady = 5)
-
-                # Tworzy przycisk z obrazem, który po kliknięciu otwiera pełne zdjęcie, ustawia style i kursor.
-                img_button = tk.Button(
-                    img_container, image = photo, command = lambda url = img_url: self._open_image_window(url),
-                    bg = self.style.fg_color, activebackground = self.style.fg_color,
-                    borderwidth = self.style.border_width, highlightthickness = self.style.highlight_thickness,
-                    highlightbackground = self.style.fg_color, highlightcolor = self.style.fg_color,
-                    cursor = "hand2"
-                )
-                # Umieszcza przycisk w ramce.
-                img_button.pack()
-
-                # Tworzy etykietę z tytułem obrazu (obciętym do 50 znaków, jeśli dłuższy), ustawia style.
-                title_label = tk.Label(
-                    img_container, text = title[:50] + "..." if len(title) > 50 else title,
-                    font = self.style.title_font, bg = self.style.bg_color, fg = self.style.fg_color
-                )
-                # Umieszcza etykietę pod obrazem.
-                title_label.pack()
-
-                # Aktualizuje ramkę obrazów, aby wyświetlić nowy obraz.
-                self.images_frame.update()
-                # Loguje zakończenie ładowania obrazu.
-                self.log(f"Załadowano obraz: '{title[:50]}'")
-                # Zwiększa licznik kolumn.
-                col += 1
-                # Sprawdza, czy osiągnięto maksymalną liczbę kolumn.
-                if col >= col_count:
-                    # Resetuje kolumnę do 0.
-                    col = 0
-                    # Zwiększa licznik wierszy.
-                    row += 1
-                # Zwiększa licznik wyświetlanych obrazów.
-                shown += 1
-                # Zwraca True, jeśli wyświetlono mniej niż 9 obrazów, w przeciwnym razie False.
-                return shown < 9
-            # Łapie wszelkie wyjątki podczas ładowania obrazu.
-            except Exception as e:
-                # Obsługuje błędy, logując je z kontekstem.
-                self.handle_request_errors(e, f"ładowaniu obrazu '{title[:50]}'")
-                # Zwraca True, aby kontynuować przetwarzanie.
-                return True
-
-        # Definiuje funkcję process_next_image do iteracyjnego przetwarzania obrazów.
-        def process_next_image(index=0):
-            # Sprawdza, czy przetworzono wszystkie elementy lub czy należy zakończyć.
-            if index >= len(items) or not load_image(items[index]):
-                # Sprawdza, czy etykieta "Ładowanie..." nadal istnieje.
-                if loading_label.winfo_exists():
-                    # Usuwa etykietę "Ładowanie...".
-                    loading_label.destroy()
-                    #Loguje zakończenie ładowania.
-                self.log("Zakończono ładowanie obrazów.")
-                # Kończy funkcję.
-                return
-            # Planuje wywołanie funkcji dla kolejnego obrazu po 10 ms.
-            root.after(10, process_next_image, index + 1)
-
+        # Zapamiętuje etykietę, aby nowe wyszukiwanie mogło ją usunąć.
+        self.loading_label = loading_label
+        # Przypisuje adres kolejnej strony wyników i filtr powtórzeń.
+        self.next_url = next_url
+        self.dedup = dedup
         # Loguje rozpoczęcie ładowania obrazów.
         self.log("Rozpoczęto ładowanie obrazów.")
-        # Planuje rozpoczęcie przetwarzania obrazów po 100 ms.
-        root.after(100, process_next_image)
+        # Dodaje elementy do siatki i wyświetla widoczne komórki.
+        self.add_items(items)
 
-    # Definiuje metodę _open_image_window do otwierania pełnego obrazu w nowym oknie.
-    def _open_image_window(self, img_url):
-        # Rozpoczyna blok obsługi wyjątków.
-        try:
-            # Pobiera dane pełnego obrazu.
-            img_data = requests.get(img_url).content
-            # Otwiera obraz z danych binarnych.
-            image = Image.open(BytesIO(img_data))
+    # Definiuje metodę add_items, która dołącza elementy wyników na końcu siatki.
+    def add_items(self, items):
+        # Inicjalizuje licznik pominiętych elementów.
+        skipped = 0
+        # Iteruje po elementach wyników.
+        for item in items:
+            # Sprawdza, czy element ma dane i URL obrazu.
+            if not item.href or (item.nasa_id is None and item.title is None):
+                # Zwiększa licznik pominiętych elementów.
+                skipped += 1
+                # Przechodzi do kolejnego elementu.
+                continue
+            # Ustawia domyślny tytuł, jeśli element go nie ma.
+            if item.title is None:
+                item.title = "Brak tytułu"
+            # Dodaje element do listy elementów siatki.
+            self.items.append(item)
+        # Loguje liczbę pominiętych elementów.
+        if skipped:
+            self.log(f"Pominięto {skipped} elementów: Brak linków lub danych.")
+        # Aktualizuje obszar przewijania i widoczne komórki.
+        self._update_scrollregion()
+        self._refresh_visible()
+
+    # Definiuje metodę _layout, która przelicza liczbę kolumn po zmianie szerokości płótna.
+    def _layout(self):
+        # Oblicza liczbę kolumn mieszczących się w szerokości płótna (co najmniej jedna).
+        self.columns = max(1, self.canvas.winfo_width() // self.cell_width)
+        # Aktualizuje obszar przewijania i widoczne komórki.
+        self._update_scrollregion()
+        self._refresh_visible()
+
+    # Definiuje metodę _update_scrollregion, która ustawia wirtualny rozmiar siatki (wszystkie wiersze, nie tylko widoczne).
+    def _update_scrollregion(self):
+        # Oblicza liczbę wierszy potrzebnych dla wszystkich elementów.
+        rows = -(-len(self.items) // self.columns)
+        # Ustawia obszar przewijania płótna.
+        self.canvas.configure(scrollregion = (0, 0, self.columns * self.cell_width, rows * self.cell_height))
+
+    # Definiuje metodę _on_scrollbar, wywoływaną przez pasek przewijania.
+    def _on_scrollbar(self, *args):
+        # Przewija płótno zgodnie z poleceniem paska.
+        self.canvas.yview(*args)
+        # Przypisuje komórki do nowo widocznych elementów.
+        self._refresh_visible()
+
+    # Definiuje metodę _on_wheel, która przewija siatkę kółkiem myszy.
+    def _on_wheel(self, event):
+        # Wyznacza kierunek przewijania (Linux: przyciski 4/5, Windows/macOS: znak delta).
+        direction = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        # Przewija płótno o jedną jednostkę.
+        self.canvas.yview_scroll(direction, "units")
+        # Przypisuje komórki do nowo widocznych elementów.
+        self._refresh_visible()
+
+    # Definiuje metodę _refresh_visible, która przypisuje komórki z puli do widocznych elementów i zleca pobieranie miniatur.
+    def _refresh_visible(self):
+        # Kończy metodę, jeśli siatka jest pusta.
+        if not self.items:
+            return
+        # Pobiera górną krawędź widocznego obszaru i wysokość płótna.
+        top = int(self.canvas.canvasy(0))
+        height = max(self.canvas.winfo_height(), self.cell_height)
+        # Oblicza zakres widocznych indeksów (pełne wiersze od pierwszego do ostatniego częściowo widocznego).
+        first = (top // self.cell_height) * self.columns
+        last = min(len(self.items), ((top + height) // self.cell_height + 1) * self.columns)
+        self.visible = range(first, last)
+        # Tworzy brakujące komórki (pula rośnie tylko do liczby komórek mieszczących się w oknie).
+        while len(self.cells) < len(self.visible):
+            cell = GridCell(self.canvas, self.style, self.placeholder, self._on_wheel)
+            # Po wskazaniu komórki kursorem pobiera jej podgląd z najwyższym priorytetem.
+            cell.button.bind("<Enter>", lambda event, cell = cell: self._on_hover(cell))
+            self.cells.append(cell)
+        # Zbiera komórki już przypisane do widocznych elementów oraz komórki do ponownego użycia.
+        bound = {cell.index: cell for cell in self.cells if cell.index in self.visible}
+        free = [cell for cell in self.cells if cell.index not in self.visible]
+        # Iteruje po widocznych indeksach.
+        for index in self.visible:
+            # Przypisuje element do jego dotychczasowej komórki lub do wolnej komórki z puli.
+            self._bind_cell(bound.get(index) or free.pop(), index)
+        # Ukrywa nieużywane komórki.
+        for cell in free:
+            self._release_cell(cell)
+        # Zleca pobranie miniatur widocznych elementów, a potem kolejnego ekranu (pobieranie z wyprzedzeniem).
+        screen = max(len(self.visible), self.columns)
+        # Zleca równoległe pobranie brakujących manifestów dla tych elementów (jedna partia na odświeżenie).
+        self.resolver.prefetch((item.nasa_id, item.manifest_url) for item in self.items[first:last + screen])
+        self._request_range(first, last)
+        self._request_range(last, min(len(self.items), last + screen))
+        # Anuluje oczekujące pobrania dla elementów daleko poza widokiem.
+        self._cancel_outside(first - screen, last + 2 * screen)
+        # Dociąga kolejną stronę wyników, gdy do końca listy został mniej niż ekran.
+        if self.next_url and not self.loading_more and last + screen >= len(self.items):
+            self._load_more()
+        # Przekazuje widoczne elementy bez podglądu w magazynie do pobierania z wyprzedzeniem.
+        self.prefetcher.set_visible({
+            (item.href, (1000, 800)): item
+            for item in self.items[first:last]
+            if (item.href, (1000, 800)) not in self.images
+        })
+        # Usuwa etykietę "Ładowanie...", jeśli widoczne miniatury są już gotowe.
+        self._update_loading_label()
+        # Wstrzymuje lub wznawia pobieranie z wyprzedzeniem.
+        self._update_prefetch()
+
+    # Definiuje metodę _bind_cell, która ustawia komórkę na pozycji elementu i wypełnia ją jego danymi.
+    def _bind_cell(self, cell, index):
+        # Oblicza wiersz i kolumnę elementu.
+        row, col = divmod(index, self.columns)
+        # Przesuwa komórkę na pozycję elementu i pokazuje ją.
+        self.canvas.coords(cell.window_id, col * self.cell_width + 5, row * self.cell_height + 5)
+        self.canvas.itemconfigure(cell.window_id, state = "normal")
+        # Kończy metodę, jeśli komórka już wyświetla ten element (z miniaturą lub bez gotowej miniatury).
+        if cell.index == index and (cell.photo_key is not None or self._thumb_key(index) not in self.images):
+            return
+        # Przypisuje indeks elementu do komórki.
+        cell.index = index
+        # Pobiera tytuł elementu.
+        item = self.items[index]
+        # Ustawia tytuł (obcięty do 50 znaków, jeśli dłuższy) i akcję otwierającą pełne zdjęcie.
+        cell.label.configure(text = item.title[:50] + "..." if len(item.title) > 50 else item.title)
+        cell.button.configure(command = lambda: self._open_image_window(item))
+        # Wyświetla miniaturę, jeśli jest gotowa, lub obraz zastępczy.
+        self._show_thumbnail(cell)
+
+    # Definiuje metodę _thumb_key, która zwraca klucz miniatury elementu w magazynie obrazów (URL i rozmiar).
+    def _thumb_key(self, index):
+        # Zwraca krotkę (URL obrazu, rozmiar miniatury).
+        return self.items[index].href, (200, 200)
+
+    # Definiuje metodę _show_thumbnail, która ustawia obraz przycisku komórki na podstawie miniatury z magazynu.
+    def _show_thumbnail(self, cell):
+        # Zwalnia obraz poprzednio wyświetlany przez komórkę.
+        self._release_photo(cell)
+        # Wyznacza klucz miniatury przypisanego elementu.
+        key = self._thumb_key(cell.index)
+        # Pobiera obraz z magazynu (odtwarzany ze skompresowanej kopii, jeśli został zwolniony).
+        with self.stage("load_image.photoimage"):
+            photo = self.images.acquire(key)
+        # Sprawdza, czy miniatura jest gotowa.
+        if photo is None:
+            # Ustawia obraz zastępczy.
+            cell.button.configure(image = self.placeholder)
+            # Kończy metodę.
+            return
+        # Zapamiętuje klucz obrazu wyświetlanego przez komórkę.
+        cell.photo_key = key
+        # Mierzy czas podmiany obrazu w widgecie.
+        with self.stage("load_image.widgets"):
+            # Ustawia obraz przycisku.
+            cell.button.configure(image = photo)
+
+    # Definiuje metodę _release_photo, która oddaje do magazynu obraz wyświetlany przez komórkę.
+    def _release_photo(self, cell):
+        # Sprawdza, czy komórka wyświetla obraz z magazynu.
+        if cell.photo_key is not None:
+            # Ustawia obraz zastępczy, zanim magazyn będzie mógł zwolnić obraz.
+            cell.button.configure(image = self.placeholder)
+            # Oznacza obraz jako nieużywany przez komórkę.
+            self.images.release(cell.photo_key)
+            cell.photo_key = None
+
+    # Definiuje metodę _release_cell, która ukrywa komórkę i zwalnia jej obraz.
+    def _release_cell(self, cell):
+        # Zwalnia obraz przypisanego elementu.
+        self._release_photo(cell)
+        # Oznacza komórkę jako wolną.
+        cell.index = None
+        # Ukrywa komórkę.
+        self.canvas.itemconfigure(cell.window_id, state = "hidden")
+
+    # Definiuje metodę _request_range, która zleca pobranie miniatur dla zakresu indeksów.
+    def _request_range(self, start, stop):
+        # Zapamiętuje generację bieżącego wyszukiwania.
+        generation = self.generation
+        # Iteruje po indeksach z zakresu.
+        for index in range(max(0, start), stop):
+            item = self.items[index]
+            # Pomija miniatury gotowe, pobierane lub zakończone błędem.
+            if self._thumb_key(index) in self.images or item in self.requests or item in self.failed:
+                continue
+            # Wybiera wersję obrazu dla miniatury 200x200 (tylko z manifestu w pamięci, bez odczytu z dysku i sieci w wątku Tkinter;
+            # domyślnie link podglądu).
+            url = self.resolver.resolve(item.nasa_id, item.manifest_url, item.href, (200, 200), fetch = False)
+            # Zleca pobranie i skalowanie obrazu do miniatury 200x200 (oraz skrót dla filtra powtórzeń) w wątku roboczym
+            # i zapamiętuje zadanie.
+            self.requests[item] = self.loader.run_in_background(
+                self._load_thumbnail, (url, item, self.dedup, self.cancel_event),
+                on_done = lambda result, item = item: self._on_thumbnail_loaded(generation, item, *result),
+                on_error = lambda e, item = item: self._on_thumbnail_failed(generation, item, e)
+            )
+
+    # Definiuje metodę _load_thumbnail, wywoływaną w wątku roboczym, która wczytuje miniaturę elementu i zwraca (obraz, skrót).
+    # Skrót (None bez filtra powtórzeń) jest liczony z tej samej miniatury, którą wyświetla siatka, więc filtr nie pobiera obrazów sam.
+    def _load_thumbnail(self, url, item, dedup, cancel_event):
+        # Pobiera i skaluje obraz (lub odczytuje go z cache miniatur); ustawienie cancel_event przerywa pobieranie.
+        image = self.loader.fetch_and_decode(url, (200, 200), cancel_event)
+        # Oblicza skrót tylko dla elementów, których skrót nie był znany przy dołączaniu strony.
+        if dedup is None or item.href not in dedup.unhashed:
+            return image, None
+        return image, dedup.hash_image(item.href, image)
+
+    # Definiuje metodę _cancel_outside, która anuluje oczekujące pobrania poza zakresem indeksów [low, high).
+    def _cancel_outside(self, low, high):
+        # Zbiera elementy z zakresu.
+        near = set(self.items[max(0, low):max(0, high)])
+        # Iteruje po kopii słownika trwających pobrań.
+        for item, future in list(self.requests.items()):
+            # Anuluje zadanie poza zakresem, jeśli jeszcze się nie rozpoczęło.
+            if item not in near and future.cancel():
+                # Usuwa anulowane zadanie (zostanie zlecone ponownie, gdy element znów będzie blisko widoku).
+                del self.requests[item]
+
+    # Definiuje metodę _on_thumbnail_loaded, wywoływaną w wątku Tkinter po pobraniu i zdekodowaniu miniatury (i obliczeniu jej skrótu).
+    def _on_thumbnail_loaded(self, generation, item, image, value = None):
+        # Odrzuca spóźniony wynik, jeśli w międzyczasie rozpoczęto nowe wyszukiwanie.
+        if generation != self.generation:
+            return
+        # Usuwa zakończone zadanie.
+        self.requests.pop(item, None)
+        # Usuwa z siatki powtórzenia rozpoznane przez filtr: ten element (powtórzenie zdjęcia wyżej w wynikach)
+        # lub przyjęte wcześniej elementy niżej w wynikach, które powtarzają ten element.
+        removed = self.dedup.add(item, value) if value is not None else []
+        for duplicate in removed:
+            self._remove_item(duplicate)
+        if item in removed:
+            return
+        # Zapisuje skompresowaną kopię miniatury w magazynie obrazów.
+        self.images.put((item.href, (200, 200)), image)
+        # Iteruje po komórkach puli.
+        for cell in self.cells:
+            # Wyświetla miniaturę w komórce przypisanej do tego elementu.
+            if cell.index is not None and self.items[cell.index] is item:
+                self._show_thumbnail(cell)
+        # Usuwa etykietę "Ładowanie...", jeśli widoczne miniatury są już gotowe.
+        self._update_loading_label()
+        # Wznawia pobieranie z wyprzedzeniem, jeśli to była ostatnia miniatura.
+        self._update_prefetch()
+
+    # Definiuje metodę _remove_item, która usuwa z siatki element rozpoznany jako powtórzenie i przesuwa kolejne elementy.
+    def _remove_item(self, item):
+        # Kończy metodę, jeśli elementu nie ma już w siatce.
+        if item not in self.items:
+            return
+        # Wyznacza pozycję elementu i usuwa go z listy.
+        index = self.items.index(item)
+        del self.items[index]
+        # Zwalnia komórki elementów za usuniętym (zostaną ponownie przypisane do przesuniętych elementów).
+        for cell in self.cells:
+            if cell.index is not None and cell.index >= index:
+                self._release_cell(cell)
+        # Aktualizuje obszar przewijania i widoczne komórki.
+        self._update_scrollregion()
+        self._refresh_visible()
+
+    # Definiuje metodę _on_thumbnail_failed, wywoływaną w wątku Tkinter po błędzie pobierania lub dekodowania.
+    def _on_thumbnail_failed(self, generation, item, exception):
+        # Odrzuca błąd (np. anulowanie), jeśli dotyczy poprzedniego wyszukiwania.
+        if generation != self.generation:
+            return
+        # Usuwa zakończone zadanie i zapamiętuje błąd, aby nie ponawiać pobierania przy każdym przewinięciu
+        # (po przeciążeniu serwera 429/503 miniatura zostanie pobrana ponownie przy kolejnym przewinięciu).
+        self.requests.pop(item, None)
+        if not is_throttled(exception):
+            self.failed.add(item)
+        # Obsługuje błędy, logując je z kontekstem.
+        self.handle_request_errors(exception, f"ładowaniu obrazu '{item.title[:50]}'")
+        # Usuwa etykietę "Ładowanie...", jeśli widoczne miniatury są już gotowe.
+        self._update_loading_label()
+        # Wznawia pobieranie z wyprzedzeniem, jeśli to była ostatnia miniatura.
+        self._update_prefetch()
+
+    # Definiuje metodę _update_prefetch, która wstrzymuje pobieranie z wyprzedzeniem, dopóki trwa pobieranie miniatur lub kolejnej strony.
+    def _update_prefetch(self):
+        # Sprawdza, czy trwają operacje pierwszoplanowe siatki.
+        if self.requests or self.loading_more:
+            # Wstrzymuje pobieranie z wyprzedzeniem.
+            self.prefetcher.pause("grid")
+        else:
+            # Wznawia pobieranie z wyprzedzeniem po chwili bezczynności.
+            self.prefetcher.resume("grid")
+
+    # Definiuje metodę _on_hover, wywoływaną po wskazaniu komórki kursorem.
+    def _on_hover(self, cell):
+        # Kończy metodę, jeśli komórka jest wolna.
+        if cell.index is None:
+            return
+        # Pobiera element i klucz jego podglądu w magazynie.
+        item = self.items[cell.index]
+        key = (item.href, (1000, 800))
+        # Zleca pobranie podglądu z najwyższym priorytetem, jeśli nie ma go jeszcze w magazynie.
+        if key not in self.images:
+            self.prefetcher.request(key, item, HOVER_PRIORITY)
+
+    # Definiuje metodę _prefetch_preview, która w wątku roboczym prefetchera pobiera i skaluje podgląd elementu (NasaItem).
+    def _prefetch_preview(self, item, cancel_event, progress):
+        # Wybiera najmniejszą wersję pokrywającą rozmiar podglądu (jak okno podglądu).
+        url = self.resolver.resolve(
+            item.nasa_id, item.manifest_url, derive_rendition_url(item.href, (1000, 800)), (1000, 800)
+        )
+        # Pobiera obraz lub odczytuje go z cache na dysku i skaluje do rozmiaru podglądu.
+        return load_scaled_image(url, (1000, 800), self.preview_cache, "prefetch", cancel_event, progress)
+
+    # Definiuje metodę _update_loading_label, która usuwa etykietę "Ładowanie...", gdy żadna widoczna miniatura nie jest już pobierana.
+    def _update_loading_label(self):
+        # Sprawdza, czy etykieta istnieje i czy wszystkie widoczne miniatury zostały obsłużone.
+        if self.loading_label is not None and not any(item in self.requests for item in self.items[self.visible.start:self.visible.stop]):
+            # Sprawdza, czy etykieta "Ładowanie..." nadal istnieje.
+            if self.loading_label.winfo_exists():
+                # Usuwa etykietę "Ładowanie...".
+                self.loading_label.destroy()
+            # Czyści atrybut etykiety.
+            self.loading_label = None
+            # Loguje zakończenie ładowania.
+            self.log("Zakończono ładowanie obrazów.")
+            # Loguje liczbę odrzuconych dotąd powtórzeń (ten sam nasa_id, adres lub niemal identyczne zdjęcie).
+            if self.dedup is not None and self.dedup.removed:
+                self.log(f"Pominięto {self.dedup.removed} powtórzonych zdjęć.")
+
+    # Definiuje metodę _load_more, która pobiera w tle kolejną stronę wyników.
+    def _load_more(self):
+        # Oznacza, że trwa pobieranie kolejnej strony.
+        self.loading_more = True
+        # Zapamiętuje generację bieżącego wyszukiwania.
+        generation = self.generation
+        # Zleca pobranie i filtrowanie strony do puli wątków.
+        self.loader.run_in_background(
+            self._fetch_more, (self.next_url, self.dedup),
+            on_done = lambda page: self._on_more_items(generation, page),
+            on_error = lambda e: self._on_more_items_failed(generation, e)
+        )
+
+    # Definiuje metodę _fetch_more, wywoływaną w tle, która pobiera, parsuje i filtruje kolejną stronę wyników.
+    # Filtr odrzuca tylko powtórzenia rozpoznawalne bez pobierania miniatur; pozostałe są sprawdzane po wczytaniu miniatur.
+    def _fetch_more(self, url, dedup):
+        # Pobiera i parsuje stronę.
+        page = parse_response(self.search_client.fetch_page(url))
+        # Odrzuca znane powtórzenia.
+        if dedup is not None:
+            with self.stage("grid.dedup"):
+                page.items = dedup.filter(page.items)
+        return page
+
+    # Definiuje metodę _on_more_items, wywoływaną w wątku Tkinter po pobraniu i sparsowaniu (w tle) kolejnej strony wyników.
+    def _on_more_items(self, generation, page):
+        # Odrzuca stronę, jeśli w międzyczasie rozpoczęto nowe wyszukiwanie.
+        if generation != self.generation:
+            return
+        # Kończy pobieranie strony i zapamiętuje adres następnej.
+        self.loading_more = False
+        self.next_url = page.next_url
+        # Loguje liczbę dołączonych wyników.
+        self.log(f"Dołączono {len(page.items)} kolejnych wyników.")
+        # Dodaje elementy do siatki.
+        self.add_items(page.items)
+
+    # Definiuje metodę _on_more_items_failed, wywoływaną w wątku Tkinter po błędzie pobierania kolejnej strony.
+    def _on_more_items_failed(self, generation, exception):
+        # Odrzuca błąd, jeśli dotyczy poprzedniego wyszukiwania.
+        if generation != self.generation:
+            return
+        # Kończy pobieranie strony i wyłącza dalsze stronicowanie.
+        self.loading_more = False
+        self.next_url = None
+        # Wznawia pobieranie z wyprzedzeniem.
+        self._update_prefetch()
+        # Obsługuje błędy, logując je z kontekstem.
+        self.handle_request_errors(exception, "pobieraniu kolejnej strony wyników")
+
+    # Definiuje metodę _open_image_window do otwierania podglądu obrazu w nowym oknie, przyjmując element NasaItem.
+    def _open_image_window(self, item):
+        # Definiuje funkcję wybierającą wersję obrazu dla rozmiaru wyświetlania (wywoływaną w wątku roboczym; None - oryginał).
+        def resolve_url(size):
+            # Bez manifestu używa adresu wyznaczonego z adresu miniatury.
+            return self.resolver.resolve(item.nasa_id, item.manifest_url, derive_rendition_url(item.href, size), size)
+
+        # Tworzy okno podglądu, które od razu pokazuje powiększoną miniaturę, a w tle pobiera najmniejszą wersję pokrywającą 1000x800.
+        PreviewWindow(
+            self.parent, self.style, self.log_callback, self.images, self.preview_loader, self.preview_cache,
+            item.href, resolve_url,
+            lambda: TiledImageViewer(self.parent, self.style, self.log_callback, self.tile_loader, resolve_url),
+            prefetcher = self.prefetcher
+        )
+
+# Definiuje klasę PreviewWindow, dziedziczącą po NasaAppBase, do wyświetlania podglądu zdjęcia.
+# Okno otwiera się natychmiast z powiększoną miniaturą z siatki, a podgląd w wyższej rozdzielczości jest pobierany w kawałkach
+# (z postępem) i podmieniany po zakończeniu.
+class PreviewWindow(NasaAppBase):
+    # Inicjalizuje okno podglądu, przyjmując okno nadrzędne, obiekt style_config, funkcję callback dla logów, magazyn obrazów,
+    # loader (pula wątków), cache podglądów na dysku, adres miniatury, funkcję wybierającą adres wersji do pobrania
+    # (wywoływaną w wątku roboczym z rozmiarem podglądu), akcję przycisku pełnej rozdzielczości, maksymalny rozmiar podglądu
+    # i opcjonalny prefetcher, wstrzymywany na czas pobierania podglądu.
+    def __init__(self, parent, style_config, log_callback, images, loader, cache, img_url, resolve_url, on_full_resolution,
+                 size = (1000, 800), prefetcher = None):
+        # Wywołuje konstruktor klasy bazowej, przekazując style_config i log_callback.
+        super().__init__(style_config, log_callback)
+        # Przypisuje magazyn obrazów i klucz podglądu w magazynie.
+        self.images = images
+        self.key = (img_url, size)
+        # Inicjalizuje klucz obrazu pobranego z magazynu (None - okno wyświetla powiększoną miniaturę).
+        self.photo_key = None
+        # Inicjalizuje powiększoną miniaturę wyświetlaną do czasu pobrania podglądu.
+        self.placeholder = None
+        # Inicjalizuje postęp pobierania (aktualizowany z wątku roboczego, odczytywany w wątku Tkinter).
+        self.received = 0
+        self.total = None
+        # Tworzy zdarzenie przerywające pobieranie po zamknięciu okna.
+        self.cancel_event = threading.Event()
+        # Przypisuje prefetcher (lub None).
+        self.prefetcher = prefetcher
+        # Mierzy czas tworzenia okna podglądu.
+        with self.stage("open_image.window"):
             # Tworzy nowe okno (Toplevel) do wyświetlenia obrazu.
-            win = tk.Toplevel(self.parent)
+            self.window = tk.Toplevel(parent)
             # Ustawia tytuł okna na "Podgląd zdjęcia".
-            win.title("Podgląd zdjęcia")
+            self.window.title("Podgląd zdjęcia")
             # Ustawia czarne tło dla okna.
-            win.configure(bg = self.style.bg_color)
-
-            # Pobiera wymiary obrazu.
-            img_width, img_height = image.size
-            # Sprawdza, czy obraz jest większy niż 1000x800 pikseli.
-            if img_width > 1000 or img_height > 800:
-                # Skaluje obraz do maksymalnych wymiarów 1000x800.
-                image.thumbnail((1000, 800))
-
-            # Konwertuje obraz na format Tkinter.
-            photo = ImageTk.PhotoImage(image)
-            # Tworzy etykietę z obrazem i czarnym tłem.
-            label = tk.Label(win, image = photo, bg = self.style.bg_color)
-            # Przypisuje obraz do atrybutu etykiety, aby uniknąć garbage collection.
-            label.image = photo
+            self.window.configure(bg = self.style.bg_color)
+            # Tworzy etykietę na obraz z czarnym tłem.
+            self.label = tk.Label(self.window, bg = self.style.bg_color)
             # Umieszcza etykietę w oknie.
-            label.pack()
-        # Łapie wszelkie wyjątki podczas otwierania obrazu.
-        except Exception as e:
-            # Obsługuje błędy, logując je z kontekstem.
-            self.handle_request_errors(e, "otwieraniu obrazu")
+            self.label.pack()
+            # Tworzy etykietę z postępem pobierania.
+            self.status_label = tk.Label(
+                self.window, text = "", font = self.style.title_font, fg = self.style.fg_color, bg = self.style.bg_color
+            )
+            # Umieszcza etykietę postępu pod obrazem.
+            self.status_label.pack()
+            # Tworzy przycisk otwierający oryginał w przeglądarce kafelków (pełna rozdzielczość z przybliżaniem).
+            tk.Button(
+                self.window, text = "Pełna rozdzielczość", font = self.style.title_font, command = on_full_resolution,
+                bg = self.style.bg_color, fg = self.style.fg_color, activebackground = self.style.active_bg,
+                activeforeground = self.style.active_fg, borderwidth = self.style.border_width
+            ).pack(pady = 5)
+            # Przerywa pobieranie i oddaje obraz do magazynu po zamknięciu okna.
+            self.window.bind("<Destroy>", self._on_destroy)
+        # Sprawdza, czy magazyn ma już kopię podglądu (np. okno było wcześniej otwarte).
+        if self.key in self.images:
+            # Wyświetla podgląd od razu.
+            self._show_preview()
+            # Kończy inicjalizację.
+            return
+        # Wyświetla powiększoną miniaturę z siatki.
+        self._show_placeholder((img_url, (200, 200)), size)
+        # Wstrzymuje pobieranie z wyprzedzeniem, aby podgląd dostał całe pasmo.
+        if self.prefetcher is not None:
+            self.prefetcher.pause(self)
+        # Zleca wybór wersji, jej pobranie i przeskalowanie podglądu w tle (z cache na dysku, jeśli jest).
+        loader.run_in_background(
+            self._load_preview, (resolve_url, size, cache),
+            on_done = self._on_preview_loaded, on_error = self._on_preview_failed
+        )
+        # Rozpoczyna cykliczne odświeżanie postępu.
+        self._update_progress()
+
+    # Definiuje metodę _show_placeholder, która wyświetla miniaturę z magazynu powiększoną do rozmiaru podglądu.
+    def _show_placeholder(self, thumb_key, size):
+        # Dekoduje miniaturę ze skompresowanej kopii w magazynie.
+        thumb = self.images.get_image(thumb_key)
+        # Kończy metodę, jeśli miniatury nie ma (np. została usunięta z magazynu).
+        if thumb is None:
+            return
+        # Oblicza rozmiar, w jakim podgląd zmieści się w oknie, zachowując proporcje.
+        scale = min(size[0] / thumb.width, size[1] / thumb.height)
+        # Mierzy czas powiększenia miniatury.
+        with self.stage("open_image.placeholder"):
+            # Powiększa miniaturę szybkim filtrem (obraz jest tymczasowy) i konwertuje ją na format Tkinter.
+            self.placeholder = ImageTk.PhotoImage(thumb.resize(
+                (max(1, round(thumb.width * scale)), max(1, round(thumb.height * scale))), Image.Resampling.BILINEAR
+            ))
+        # Ustawia powiększoną miniaturę w etykiecie.
+        self.label.configure(image = self.placeholder)
+
+    # Definiuje metodę _load_preview, która w wątku roboczym wybiera wersję obrazu, pobiera ją i skaluje do rozmiaru podglądu.
+    def _load_preview(self, resolve_url, size, cache):
+        # Wybiera najmniejszą wersję pokrywającą rozmiar podglądu (może pobrać manifest elementu).
+        url = resolve_url(size)
+        # Pobiera obraz (z postępem) lub odczytuje go z cache i skaluje.
+        return load_scaled_image(url, size, cache, "open_image", self.cancel_event, self._on_progress)
+
+    # Definiuje metodę _on_progress, wywoływaną w wątku roboczym po odebraniu kawałka danych.
+    def _on_progress(self, received, total):
+        # Zapamiętuje postęp (odczytywany przez _update_progress w wątku Tkinter).
+        self.received = received
+        self.total = total
+
+    # Definiuje metodę _update_progress, która co 100 ms wyświetla postęp pobierania.
+    def _update_progress(self):
+        # Kończy odświeżanie po zamknięciu okna lub wyświetleniu podglądu.
+        if self.cancel_event.is_set() or self.photo_key is not None:
+            return
+        # Wyświetla postęp w procentach, jeśli rozmiar całości jest znany, a w przeciwnym razie w kilobajtach.
+        if self.total:
+            self.status_label.configure(text = f"Pobieranie podglądu: {self.received * 100 // self.total}%")
+        else:
+            self.status_label.configure(text = f"Pobieranie podglądu: {self.received // 1024} KB")
+        # Planuje kolejne odświeżenie.
+        self.window.after(100, self._update_progress)
+
+    # Definiuje metodę _on_preview_loaded, wywoływaną w wątku Tkinter po pobraniu i przeskalowaniu podglądu.
+    def _on_preview_loaded(self, image):
+        # Kończy metodę, jeśli okno zostało zamknięte.
+        if self.cancel_event.is_set():
+            return
+        # Zapisuje skompresowaną kopię podglądu w magazynie (zdekodowany obraz PIL nie jest dalej przechowywany).
+        self.images.put(self.key, image)
+        # Podmienia powiększoną miniaturę na podgląd.
+        self._show_preview()
+        # Wznawia pobieranie z wyprzedzeniem.
+        self._resume_prefetch()
+
+    # Definiuje metodę _resume_prefetch, która wznawia pobieranie z wyprzedzeniem wstrzymane przez to okno.
+    def _resume_prefetch(self):
+        # Sprawdza, czy okno ma prefetcher.
+        if self.prefetcher is not None:
+            # Usuwa okno z powodów wstrzymania.
+            self.prefetcher.resume(self)
+
+    # Definiuje metodę _show_preview, która wyświetla podgląd z magazynu.
+    def _show_preview(self):
+        # Pobiera obraz Tkinter z magazynu (pozostaje w pamięci, dopóki okno jest otwarte).
+        photo = self.images.acquire(self.key)
+        # Zapamiętuje klucz obrazu, aby oddać go do magazynu po zamknięciu okna.
+        self.photo_key = self.key
+        # Ustawia podgląd w etykiecie i zwalnia powiększoną miniaturę.
+        self.label.configure(image = photo)
+        self.placeholder = None
+        # Ukrywa etykietę postępu.
+        self.status_label.pack_forget()
+
+    # Definiuje metodę _on_preview_failed, wywoływaną w wątku Tkinter po błędzie pobierania podglądu.
+    def _on_preview_failed(self, exception):
+        # Kończy metodę, jeśli okno zostało zamknięte (anulowanie pobierania nie jest błędem).
+        if self.cancel_event.is_set():
+            return
+        # Przerywa odświeżanie postępu, wznawia pobieranie z wyprzedzeniem i wyświetla komunikat o błędzie.
+        self.cancel_event.set()
+        self._resume_prefetch()
+        self.status_label.configure(text = "Nie udało się pobrać podglądu.")
+        # Obsługuje błędy, logując je z kontekstem.
+        self.handle_request_errors(exception, "otwieraniu obrazu")
+
+    # Definiuje metodę _on_destroy, wywoływaną po zamknięciu okna.
+    def _on_destroy(self, event):
+        # Reaguje tylko na zamknięcie okna, a nie jego widgetów potomnych.
+        if event.widget is self.window:
+            # Przerywa pobieranie podglądu i wznawia pobieranie z wyprzedzeniem.
+            self.cancel_event.set()
+            self._resume_prefetch()
+            # Oddaje podgląd do magazynu.
+            if self.photo_key is not None:
+                self.images.release(self.photo_key)
+
+# Definiuje klasę TiledImageViewer, dziedziczącą po NasaAppBase, do oglądania obrazu w pełnej rozdzielczości z przybliżaniem.
+# Obraz jest dzielony na piramidę kafelków zapisaną na dysku; dekodowane są tylko kafelki widoczne w oknie na bieżącym poziomie.
+class TiledImageViewer(NasaAppBase):
+    # Inicjalizuje przeglądarkę, przyjmując okno nadrzędne, obiekt style_config, funkcję callback dla logów,
+    # loader (pula wątków przeglądarek, oddzielna od puli miniatur), funkcję wybierającą adres wersji
+    # (wywoływaną w wątku roboczym; None - oryginał) i maksymalną liczbę zdekodowanych kafelków w pamięci.
+    def __init__(self, parent, style_config, log_callback, loader, resolve_url, max_tiles = 128):
+        # Wywołuje konstruktor klasy bazowej, przekazując style_config i log_callback.
+        super().__init__(style_config, log_callback)
+        # Przypisuje loader, funkcję wybierającą adres i limit kafelków.
+        self.loader = loader
+        self.resolve_url = resolve_url
+        self.max_tiles = max_tiles
+        # Tworzy nowe okno (Toplevel) o rozmiarze 1000x800.
+        self.window = tk.Toplevel(parent)
+        # Ustawia tytuł okna i czarne tło.
+        self.window.title("Pełna rozdzielczość")
+        self.window.configure(bg = self.style.bg_color)
+        self.window.geometry("1000x800")
+        # Tworzy płótno, na którym umieszczane są kafelki.
+        self.canvas = tk.Canvas(self.window, bg = self.style.bg_color, highlightthickness = 0)
+        # Umieszcza płótno, wypełniając całe okno.
+        self.canvas.pack(fill = tk.BOTH, expand = True)
+        # Tworzy etykietę informującą o budowie piramidy kafelków.
+        self.status_label = tk.Label(
+            self.window, text = "Przygotowywanie kafelków...", font = self.style.loading_font,
+            fg = self.style.fg_color, bg = self.style.bg_color
+        )
+        # Umieszcza etykietę w centrum okna.
+        self.status_label.place(relx = 0.5, rely = 0.5, anchor = "center")
+        # Inicjalizuje piramidę (None do czasu zbudowania) i bieżący poziom.
+        self.pyramid = None
+        self.level = 0
+        # Inicjalizuje cache zdekodowanych kafelków ((poziom, kolumna, wiersz) -> PhotoImage) w kolejności ostatniego użycia.
+        self.tiles = OrderedDict()
+        # Inicjalizuje słownik elementów płótna dla wyświetlanych kafelków (klucz -> identyfikator elementu).
+        self.tile_items = {}
+        # Inicjalizuje zbiór kafelków, które są właśnie wczytywane, i zbiór kafelków widocznych.
+        self.requested = set()
+        self.visible = set()
+        # Inicjalizuje zbiór kafelków, których nie udało się wczytać (nie są zlecane ponownie).
+        self.failed = set()
+        # Tworzy zdarzenie przerywające budowę piramidy po zamknięciu okna.
+        self.cancel_event = threading.Event()
+        # Przewija obraz przeciąganiem myszą.
+        self.canvas.bind("<ButtonPress-1>", lambda event: self.canvas.scan_mark(event.x, event.y))
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        # Iteruje po zdarzeniach kółka myszy (Windows/macOS oraz Linux).
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            # Przybliża i oddala obraz kółkiem myszy.
+            self.canvas.bind(sequence, self._on_wheel)
+        # Przelicza widoczne kafelki przy zmianie rozmiaru okna.
+        self.canvas.bind("<Configure>", lambda event: self._refresh())
+        # Przerywa budowę i zwalnia kafelki po zamknięciu okna.
+        self.window.bind("<Destroy>", self._on_destroy)
+        # Zleca wybór adresu oryginału, jego pobranie i budowę piramidy (lub odczyt gotowej z dysku) w tle.
+        self.loader.run_in_background(
+            lambda: get_tile_cache().build(self.resolve_url(None), self.cancel_event), (),
+            on_done = self._on_pyramid_ready, on_error = self._on_pyramid_failed
+        )
+
+    # Definiuje metodę _on_destroy, wywoływaną po zamknięciu okna.
+    def _on_destroy(self, event):
+        # Reaguje tylko na zamknięcie okna, a nie jego widgetów potomnych.
+        if event.widget is self.window:
+            # Przerywa budowę piramidy i zwalnia zdekodowane kafelki.
+            self.cancel_event.set()
+            self.tiles.clear()
+            # Zwalnia piramidę, aby mogła zostać usunięta z cache ponad budżet.
+            if self.pyramid is not None:
+                get_tile_cache().release(self.pyramid)
+
+    # Definiuje metodę _on_pyramid_ready, wywoływaną w wątku Tkinter po przygotowaniu piramidy.
+    def _on_pyramid_ready(self, pyramid):
+        # Zwalnia piramidę i kończy metodę, jeśli okno zostało w międzyczasie zamknięte.
+        if not self.window.winfo_exists():
+            get_tile_cache().release(pyramid)
+            return
+        # Usuwa etykietę statusu i zapamiętuje piramidę.
+        self.status_label.destroy()
+        self.pyramid = pyramid
+        # Wybiera najdokładniejszy poziom, który w całości mieści się w oknie (jak dotychczasowy podgląd).
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        level = next((index for index, (w, h) in enumerate(pyramid.levels) if w <= width and h <= height), len(pyramid.levels) - 1)
+        # Loguje wymiary oryginału, największego poziomu (mniejszego od oryginału dla bardzo dużych obrazów) i liczbę poziomów.
+        self.log(
+            f"Przygotowano kafelki obrazu {pyramid.size[0]}x{pyramid.size[1]} "
+            f"(największy poziom {pyramid.levels[0][0]}x{pyramid.levels[0][1]}, {len(pyramid.levels)} poziomów)."
+        )
+        # Wyświetla wybrany poziom.
+        self._set_level(level, width // 2, height // 2)
+
+    # Definiuje metodę _on_pyramid_failed, wywoływaną w wątku Tkinter po błędzie pobierania lub budowy piramidy.
+    def _on_pyramid_failed(self, exception):
+        # Kończy metodę, jeśli okno zostało zamknięte (anulowanie budowy nie jest błędem).
+        if not self.window.winfo_exists():
+            return
+        # Sprawdza, czy obraz przekracza limit pikseli piramidy kafelków.
+        if isinstance(exception, Image.DecompressionBombError):
+            # Wyświetla komunikat o zbyt dużym obrazie i loguje jego wymiary.
+            self.status_label.configure(text = "Obraz jest zbyt duży, aby go wyświetlić.")
+            self.log(f"Pominięto przygotowywanie kafelków: {exception}")
+            return
+        # Wyświetla komunikat o błędzie w oknie.
+        self.status_label.configure(text = "Nie udało się wczytać obrazu.")
+        # Obsługuje błędy, logując je z kontekstem.
+        self.handle_request_errors(exception, "przygotowywaniu kafelków")
+
+    # Definiuje metodę _on_drag, która przesuwa obraz podczas przeciągania.
+    def _on_drag(self, event):
+        # Przesuwa widok płótna o przesunięcie myszy.
+        self.canvas.scan_dragto(event.x, event.y, gain = 1)
+        # Wczytuje kafelki, które pojawiły się w oknie.
+        self._refresh()
+
+    # Definiuje metodę _on_wheel, która przybliża (poziom niżej) lub oddala (poziom wyżej) obraz wokół kursora.
+    def _on_wheel(self, event):
+        # Kończy metodę, jeśli piramida nie jest jeszcze gotowa.
+        if self.pyramid is None:
+            return
+        # Wyznacza kierunek (Linux: przyciski 4/5, Windows/macOS: znak delta).
+        step = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        # Ogranicza poziom do dostępnego zakresu.
+        level = min(max(self.level + step, 0), len(self.pyramid.levels) - 1)
+        # Zmienia poziom, jeśli jest inny niż bieżący.
+        if level != self.level:
+            self._set_level(level, event.x, event.y)
+
+    # Definiuje metodę _set_level, która przełącza poziom piramidy, zachowując punkt obrazu pod współrzędnymi okna (x, y).
+    def _set_level(self, level, x, y):
+        # Oblicza współrzędne punktu obrazu na nowym poziomie.
+        scale = self.pyramid.levels[level][0] / self.pyramid.levels[self.level][0]
+        focus_x = self.canvas.canvasx(x) * scale
+        focus_y = self.canvas.canvasy(y) * scale
+        # Przypisuje nowy poziom.
+        self.level = level
+        # Usuwa kafelki poprzedniego poziomu z płótna (zdekodowane zostają w cache do ewentualnego powrotu).
+        self.canvas.delete("tile")
+        self.tile_items.clear()
+        # Ustawia obszar przewijania na wymiary poziomu.
+        width, height = self.pyramid.levels[level]
+        self.canvas.configure(scrollregion = (0, 0, width, height))
+        # Przewija widok tak, aby wybrany punkt pozostał pod kursorem.
+        self.canvas.xview_moveto((focus_x - x) / width)
+        self.canvas.yview_moveto((focus_y - y) / height)
+        # Wczytuje widoczne kafelki.
+        self._refresh()
+
+    # Definiuje metodę _refresh, która wyświetla widoczne kafelki, zleca wczytanie brakujących i usuwa niewidoczne.
+    def _refresh(self):
+        # Kończy metodę, jeśli piramida nie jest jeszcze gotowa.
+        if self.pyramid is None:
+            return
+        # Pobiera rozmiar kafelka i siatkę kafelków bieżącego poziomu.
+        size = self.pyramid.tile_size
+        columns, rows = self.pyramid.tile_grid(self.level)
+        # Pobiera granice widocznego obszaru we współrzędnych poziomu.
+        left, top = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        right, bottom = left + self.canvas.winfo_width(), top + self.canvas.winfo_height()
+        # Wyznacza klucze widocznych kafelków.
+        self.visible = {
+            (self.level, col, row)
+            for row in range(max(0, int(top // size)), min(rows, int(bottom // size) + 1))
+            for col in range(max(0, int(left // size)), min(columns, int(right // size) + 1))
+        }
+        # Usuwa z płótna kafelki, które wyszły poza okno.
+        for key in list(self.tile_items):
+            if key not in self.visible:
+                self.canvas.delete(self.tile_items.pop(key))
+        # Iteruje po widocznych kafelkach.
+        for key in self.visible:
+            # Wyświetla kafelek, jeśli jest zdekodowany, w przeciwnym razie zleca jego wczytanie w tle.
+            if key in self.tiles:
+                self._show_tile(key)
+            elif key not in self.requested and key not in self.failed:
+                self.requested.add(key)
+                self.loader.run_in_background(
+                    self.pyramid.load_tile, key,
+                    on_done = lambda image, key = key: self._on_tile_loaded(key, image),
+                    on_error = lambda e, key = key: self._on_tile_failed(key, e)
+                )
+        # Usuwa najdawniej używane kafelki ponad limit (kafelki wyświetlane w oknie są zachowywane).
+        trim_tiles(self.tiles, self.max_tiles, keep = self.tile_items)
+
+    # Definiuje metodę _show_tile, która umieszcza zdekodowany kafelek na płótnie.
+    def _show_tile(self, key):
+        # Oznacza kafelek jako ostatnio używany.
+        self.tiles.move_to_end(key)
+        # Tworzy element płótna, jeśli kafelek nie jest jeszcze wyświetlany.
+        if key not in self.tile_items:
+            level, col, row = key
+            self.tile_items[key] = self.canvas.create_image(
+                col * self.pyramid.tile_size, row * self.pyramid.tile_size,
+                image = self.tiles[key], anchor = "nw", tags = "tile"
+            )
+
+    # Definiuje metodę _on_tile_loaded, wywoływaną w wątku Tkinter po zdekodowaniu kafelka.
+    def _on_tile_loaded(self, key, image):
+        # Usuwa kafelek ze zbioru wczytywanych.
+        self.requested.discard(key)
+        # Kończy metodę, jeśli okno zostało zamknięte.
+        if self.cancel_event.is_set():
+            return
+        # Konwertuje kafelek na format Tkinter i zapisuje go w cache.
+        self.tiles[key] = ImageTk.PhotoImage(image)
+        # Wyświetla kafelek, jeśli nadal jest widoczny.
+        if key in self.visible:
+            self._show_tile(key)
+
+    # Definiuje metodę _on_tile_failed, wywoływaną w wątku Tkinter po błędzie wczytywania kafelka.
+    def _on_tile_failed(self, key, exception):
+        # Usuwa kafelek ze zbioru wczytywanych i zapamiętuje błąd, aby nie zlecać go przy każdym przewinięciu.
+        self.requested.discard(key)
+        self.failed.add(key)
+        # Kończy metodę, jeśli okno zostało zamknięte.
+        if self.cancel_event.is_set():
+            return
+        # Loguje błąd.
+        level, col, row = key
+        self.handle_request_errors(exception, f"wczytywaniu kafelka {col}_{row} poziomu {level}")
 
 # Definiuje główną klasę aplikacji, dziedziczącą po NasaAppBase.
 class FetchNasaImagesApp(NasaAppBase):
@@ -401,14 +1447,28 @@ class FetchNasaImagesApp(NasaAppBase):
         self.root = root
         # Ustawia tytuł głównego okna na "NASA Image Search".
         self.root.title("NASA Image Search")
-        # Ustawia bazowy URL API NASA Images.
-        self.base_url = "https://images-api.nasa.gov/search"
+        # Klient wyszukiwania, pula wyszukiwań i siatka obrazów powstają po załadowaniu modułów w tle (_on_modules_loaded).
+        self.search_client = None
+        self.search_runner = None
+        self.image_grid = None
+        # Inicjalizuje zapytanie wysłane przed załadowaniem modułów (wykonywane zaraz po nim).
+        self.pending_query = None
+        # Przechowuje ewentualny błąd wczytywania modułów (zgłaszany w wątku Tkinter).
+        self.load_error = None
+        # Inicjalizuje chwilę ostatniego otwarcia połączenia z API z wyprzedzeniem (None - jeszcze nie otwierano).
+        self.warmed_at = None
+        # Inicjalizuje numer bieżącego wyszukiwania (wyniki starszych wyszukiwań są odrzucane).
+        self.search_seq = 0
+        # Inicjalizuje zadanie (future) bieżącego wyszukiwania.
+        self.search_future = None
         # Ustawia czarne tło dla głównego okna.
         self.root.configure(bg = self.style.bg_color)
-        # Tworzy instancję SearchPanel, przekazując główne okno, style i metodę search_images jako callback.
-        self.search_panel = SearchPanel(self.root, self.style, self.search_images)
+        # Tworzy instancję SearchPanel, przekazując główne okno, style, metodę search_images jako callback i funkcję wywoływaną podczas pisania.
+        self.search_panel = SearchPanel(self.root, self.style, self.search_images, typing_callback = self._on_typing)
         # Wywołuje metodę setup_ui do konfiguracji interfejsu.
         self.setup_ui()
+        # Po narysowaniu okna mierzy czas uruchamiania i zaczyna ładować moduły w tle.
+        self.root.after_idle(self._on_window_shown)
 
     # Definiuje metodę setup_ui do tworzenia głównego układu interfejsu.
     def setup_ui(self):
@@ -429,45 +1489,177 @@ class FetchNasaImagesApp(NasaAppBase):
 
         # Tworzy instancję LogPanel w prawej ramce.
         self.log_panel = LogPanel(right_frame, self.style)
+        # Przypisuje funkcję logowania panelu logów (aplikacja loguje bezpośrednio do panelu).
+        self.log_callback = self.log_panel.log
+        # Zapamiętuje lewą ramkę - siatka obrazów powstaje w niej po załadowaniu modułów.
+        self.left_frame = left_frame
+
+    # Definiuje metodę _on_window_shown, wywoływaną po pierwszym narysowaniu okna, która uruchamia ładowanie modułów w tle.
+    def _on_window_shown(self):
+        # Zapisuje czas od rozpoczęcia importu modułu do pokazania okna z polem wyszukiwania.
+        self.window_ms = (time.perf_counter() - STARTED) * 1000
+        self.timer.record("startup.window", self.window_ms)
+        # Importuje moduły w wątku w tle, aby okno reagowało na pisanie.
+        self.loader_thread = threading.Thread(target = self._load_modules, name = "nasa-startup", daemon = True)
+        self.loader_thread.start()
+        # Sprawdza cyklicznie, czy ładowanie się zakończyło.
+        self.root.after(20, self._poll_modules)
+
+    # Definiuje metodę _load_modules, wykonywaną w wątku w tle, która importuje moduły i zapamiętuje ewentualny błąd.
+    def _load_modules(self):
+        try:
+            load_modules()
+        except Exception as e:
+            self.load_error = e
+
+    # Definiuje metodę _poll_modules, która czeka (bez blokowania okna) na zakończenie ładowania modułów.
+    def _poll_modules(self):
+        # Planuje kolejne sprawdzenie, jeśli wątek nadal działa.
+        if self.loader_thread.is_alive():
+            self.root.after(20, self._poll_modules)
+            return
+        # Pokazuje błąd importu (np. brak biblioteki) - wyszukiwanie pozostaje niedostępne.
+        if self.load_error is not None:
+            self._on_modules_failed()
+            return
+        self._on_modules_loaded()
+
+    # Definiuje metodę _on_modules_failed, wywoływaną w wątku Tkinter, która pokazuje błąd wczytywania modułów w oknie.
+    def _on_modules_failed(self):
+        # Loguje błąd w panelu logów.
+        message = f"Nie udało się wczytać modułów aplikacji: {self.load_error}"
+        self.log(message)
+        # Tworzy etykietę z komunikatem w miejscu siatki obrazów.
+        tk.Label(
+            self.left_frame, text = "Wyszukiwanie jest niedostępne.\nSzczegóły w panelu logów.", font = self.style.loading_font,
+            fg = self.style.fg_color, bg = self.style.bg_color
+        ).place(relx = 0.5, rely = 0.5, anchor = "center")
+        # Wyświetla okno dialogowe z błędem.
+        messagebox.showerror("Błąd", message)
+        # Porzuca zapytanie wysłane w trakcie ładowania.
+        self.pending_query = None
+
+    # Definiuje metodę _on_modules_loaded, wywoływaną w wątku Tkinter, która kończy budowę interfejsu po załadowaniu modułów.
+    def _on_modules_loaded(self):
+        # Pobiera wspólnego klienta wyszukiwania API NASA Images (z cache wyników i współdzieleniem trwających zapytań).
+        self.search_client = get_search_client()
+        # Tworzy pulę wątków wykonującą wyszukiwania w tle, aby okno nie zamarzało podczas zapytania.
+        self.search_runner = ImageLoader(self.root, max_workers = 2)
         # Tworzy instancję ImageGrid w lewej ramce, przekazując funkcję logowania.
-        self.image_grid = ImageGrid(left_frame, self.style, self.log_panel.log)
+        self.image_grid = ImageGrid(self.left_frame, self.style, self.log_panel.log)
+        # Zapisuje czas od rozpoczęcia importu modułu do gotowości wyszukiwania.
+        ready_ms = (time.perf_counter() - STARTED) * 1000
+        self.timer.record("startup.ready", ready_ms)
+        # Loguje oba czasy uruchamiania.
+        self.log(f"Uruchomiono: okno po {self.window_ms:.0f} ms, wyszukiwanie gotowe po {ready_ms:.0f} ms.")
+        # Wykonuje zapytanie wysłane w trakcie ładowania.
+        if self.pending_query is not None:
+            query, self.pending_query = self.pending_query, None
+            self.search_images(query)
+        # Otwiera połączenie z API, jeśli użytkownik zaczął pisać w trakcie ładowania.
+        elif self.search_panel.search_var.get():
+            self._on_typing()
+
+    # Definiuje metodę _on_typing, wywoływaną przy zmianie tekstu zapytania, która otwiera połączenie z API z wyprzedzeniem.
+    def _on_typing(self):
+        # Pomija otwieranie połączenia przed załadowaniem modułów i przy wyszukiwaniu lokalnym.
+        if self.search_runner is None or self.search_panel.local_var.get():
+            return
+        # Pomija otwieranie, jeśli połączenie otwarto niedawno (pula utrzymuje je otwarte).
+        now = time.monotonic()
+        if self.warmed_at is not None and now - self.warmed_at < WARM_UP_INTERVAL:
+            return
+        self.warmed_at = now
+        # Otwiera połączenie w tle (wynik i błędy są pomijane - zapytanie i tak otworzy połączenie samo).
+        self.search_runner.run_in_background(
+            get_http_client().warm_up, (API_URL,), on_done = lambda seconds: None, on_error = lambda e: None
+        )
 
     # Definiuje metodę search_images do wyszukiwania obrazów na podstawie zapytania.
     def search_images(self, query):
+        # Kończy metodę, jeśli moduły nie zostały wczytane (błąd jest już widoczny w oknie).
+        if self.load_error is not None:
+            self.log(f"Wyszukiwanie jest niedostępne: {self.load_error}")
+            return
+        # Odkłada zapytanie wysłane przed załadowaniem modułów (wykona je _on_modules_loaded).
+        if self.image_grid is None:
+            self.pending_query = query
+            self.log("Trwa uruchamianie - wyszukiwanie rozpocznie się za chwilę.")
+            return
+        # Zwiększa numer wyszukiwania, aby wyniki poprzednich zapytań zostały odrzucone.
+        self.search_seq += 1
+        # Zapamiętuje numer tego wyszukiwania.
+        seq = self.search_seq
+        # Sprawdza, czy poprzednie wyszukiwanie jeszcze czeka w kolejce.
+        if self.search_future is not None:
+            # Anuluje je, jeśli jeszcze się nie rozpoczęło (zostało zastąpione nowym zapytaniem).
+            self.search_future.cancel()
         # Czyści siatkę obrazów.
         self.image_grid.clear_images()
+        # Odczytuje, czy wyszukiwanie ma korzystać z lokalnego indeksu metadanych.
+        local = self.search_panel.local_var.get()
         # Loguje rozpoczęcie wyszukiwania z podanym zapytaniem.
-        self.log(f"Wyszukiwanie: {query}")
+        self.log(f"Wyszukiwanie{' lokalne' if local else ''}: {query}")
 
-        # Rozpoczyna blok obsługi wyjątków dla wyszukiwania.
+        # Definiuje funkcję wykonującą zapytanie w wątku w tle i zwracającą sparsowaną stronę wyników.
+        def request():
+            # Wyszukuje w lokalnym indeksie; bez pasujących elementów wykonuje zwykłe zapytanie do API.
+            if local:
+                with self.stage("search_images.local"):
+                    data = self.search_client.search_local(query, remote_fallback = True, media_type = 'image')
+            else:
+                # Mierzy czas zapytania do API (lub odczytu z cache).
+                with self.stage("search_images.request"):
+                    # Wyszukuje obrazy (typ mediów: obraz); powtórzone zapytanie jest zwracane z cache.
+                    data = self.search_client.search(query, media_type = 'image')
+            # Parsuje odpowiedź do zwartych elementów jeszcze w wątku w tle.
+            with self.stage("search_images.parse"):
+                page = parse_response(data)
+            # Odrzuca powtórzenia znane bez pobierania miniatur (pozostałe siatka sprawdza po wczytaniu miniatur).
+            dedup = DuplicateFilter()
+            with self.stage("search_images.dedup"):
+                page.items = dedup.filter(page.items)
+            return page, dedup
+
+        # Zleca zapytanie do puli wątków; wynik zostanie obsłużony w wątku Tkinter.
+        self.search_future = self.search_runner.run_in_background(
+            request, (),
+            on_done = lambda result: self._on_search_results(seq, *result),
+            on_error = lambda e: self._on_search_failed(seq, e)
+        )
+
+    # Definiuje metodę _on_search_results, wywoływaną w wątku Tkinter po otrzymaniu sparsowanej strony wyników i filtra powtórzeń wyszukiwania.
+    def _on_search_results(self, seq, page, dedup = None):
+        # Odrzuca wyniki, jeśli w międzyczasie rozpoczęto nowsze wyszukiwanie.
+        if seq != self.search_seq:
+            # Kończy metodę bez wyświetlania wyników.
+            return
+        # Rozpoczyna blok obsługi wyjątków dla wyświetlania wyników.
         try:
-            # Tworzy słownik parametrów żądania (zapytanie i typ mediów: obraz).
-            params = {'q': query, 'media_type': 'image'}
-            # Wykonuje żądanie GET do API NASA z parametrami.
-            response = requests.get(self.base_url, params = params)
-            # Zgłasza wyjątek, jeśli żądanie zwróci błąd HTTP.
-            response.raise_for_status()
-
-            # Parsuje odpowiedź JSON na słownik Pythona.
-            data = response.json()
-            # Pobiera listę elementów z odpowiedzi, domyślnie pustą listę.
-            items = data.get("collection", {}).get("items", [])
             # Sprawdza, czy lista elementów jest pusta.
-            if not items:
+            if not page.items:
                 # Loguje brak wyników.
                 self.log("Brak wyników dla danego wyszukiwania.")
                 # Kończy metodę, jeśli brak wyników.
                 return
 
-            # Loguje liczbę znalezionych wyników i informację o limicie 9 obrazów.
-            self.log(f"Znaleziono {len(items)} wyników. Wyświetlam maksymalnie 9 obrazów.")
-            # Wyświetla obrazy w siatce, przekazując elementy i główne okno.
-            self.image_grid.display_images(items, self.root)
+            # Loguje łączną liczbę wyników i informację o dociąganiu kolejnych stron (wyniki lokalnego indeksu ich nie mają).
+            more = " Kolejne strony są dociągane podczas przewijania." if page.next_url else ""
+            self.log(f"Znaleziono {page.total_hits} wyników.{more}")
+            # Wyświetla obrazy w siatce, przekazując elementy, główne okno, adres kolejnej strony wyników i stan filtra powtórzeń.
+            self.image_grid.display_images(page.items, self.root, page.next_url, dedup)
         # Łapie wszelkie wyjątki podczas wyszukiwania.
         except Exception as e:
             # Obsługuje błędy, logując je z kontekstem.
             self.handle_request_errors(e, "wyszukiwaniu")
 
+    # Definiuje metodę _on_search_failed, wywoływaną w wątku Tkinter po błędzie wyszukiwania.
+    def _on_search_failed(self, seq, exception):
+        # Loguje błąd tylko dla bieżącego wyszukiwania.
+        if seq == self.search_seq:
+            # Obsługuje błędy, logując je z kontekstem.
+            self.handle_request_errors(exception, "wyszukiwaniu")
+
 # Definiuje główną funkcję main do uruchamiania aplikacji.
 def main():
     # Tworzy główne okno Tkinter.